@@ -2,19 +2,38 @@
 DD Tools - Flask Web Application
 """
 
-from flask import Flask, render_template, request, send_file, flash, redirect, url_for, session
+from flask import Flask, render_template, request, send_file, flash, redirect, url_for, session, stream_with_context, g, template_rendered, jsonify
 from werkzeug.utils import secure_filename
 from flask_limiter import Limiter
 from flask_limiter.util import get_remote_address
 from flask_login import LoginManager, login_user, logout_user, login_required, current_user
-from datetime import timedelta
+from datetime import datetime, timedelta
 from dotenv import load_dotenv
+from functools import lru_cache, wraps
+from jinja2 import FileSystemBytecodeCache
+from markupsafe import Markup
 import os
 import io
+import hmac
+import shutil
+import tempfile
+import time
 
-from libs import encoding_converter, bytes_converter, text_encoder, jwt_decoder, hash_generator, cron_parser, formatter, utilities, diff_tool, csv_json, uuid_generator, yaml_json, generator
+from libs import lazy_modules, page_cache
 from libs.auth import get_user, verify_credentials
 
+# Moduly nástrojů se importují až při prvním použití — rychlejší start a recyklace workerů
+(encoding_converter, bytes_converter, text_encoder, jwt_decoder, hash_generator, cron_parser, formatter, utilities,
+ diff_tool, csv_json, uuid_generator, yaml_json, generator, streaming, validator) = lazy_modules(
+    'encoding_converter', 'bytes_converter', 'text_encoder', 'jwt_decoder', 'hash_generator', 'cron_parser',
+    'formatter', 'utilities', 'diff_tool', 'csv_json', 'uuid_generator', 'yaml_json', 'generator', 'streaming',
+    'validator')
+
+# Infrastruktura (cache výsledků, sandbox, fronta úloh, metriky, profily, komprese) se načte až v hooku nebo
+# route, která ji potřebuje — multiprocessing, sqlite3 ani zlib start workeru nezdržují
+(result_cache, shared_store, sandbox, jobs, metrics, profiler, compression) = lazy_modules(
+    'result_cache', 'shared_store', 'sandbox', 'jobs', 'metrics', 'profiler', 'compression')
+
 load_dotenv()
 
 app = Flask(__name__)
@@ -27,13 +46,6 @@ login_manager.login_view = 'login_page'
 def load_user(user_id):
     return get_user(user_id)
 
-limiter = Limiter(
-    get_remote_address,
-    app=app,
-    default_limits=["60 per minute"],
-    storage_uri="memory://",
-)
-
 if not app.secret_key:
     raise ValueError("SECRET_KEY environment variable is not set!")
 
@@ -41,6 +53,26 @@ if not app.secret_key:
 UPLOAD_FOLDER = '/tmp/dd-tools-uploads'
 os.makedirs(UPLOAD_FOLDER, exist_ok=True)
 app.config['MAX_CONTENT_LENGTH'] = 5 * 1024 * 1024  # 5 MB
+BULK_UPLOAD_MAX_LENGTH = 100 * 1024 * 1024  # 100 MB — jen pro proudově zpracované soubory
+
+# Zkompilované šablony přežijí restart workeru
+JINJA_CACHE_FOLDER = os.path.join(UPLOAD_FOLDER, 'jinja-cache')
+os.makedirs(JINJA_CACHE_FOLDER, exist_ok=True)
+app.jinja_env.bytecode_cache = FileSystemBytecodeCache(JINJA_CACHE_FOLDER)
+
+# Čítače limitů sdílí všechny gunicorn workery (SQLite WAL; schéma sqlite:// registruje libs/shared_store)
+SHARED_STORE_PATH = os.path.join(UPLOAD_FOLDER, 'shared.db')
+RATELIMIT_STORAGE_URI = os.getenv('RATELIMIT_STORAGE_URI', f'sqlite://{SHARED_STORE_PATH}')
+if RATELIMIT_STORAGE_URI.startswith('sqlite://'):
+    # Jediná výjimka z líného načítání: Limiter otevírá úložiště už při inicializaci
+    import libs.shared_store  # noqa: F401
+
+limiter = Limiter(
+    get_remote_address,
+    app=app,
+    default_limits=["60 per minute"],
+    storage_uri=RATELIMIT_STORAGE_URI,
+)
 
 # Registrace nástrojů pro menu
 TOOL_GROUPS = [
@@ -48,37 +80,50 @@ TOOL_GROUPS = [
         'id': 'generators',
         'name': 'Generátory',
         'tools': [
-            {'id': 'uuid',      'name': 'UUID',           'description': 'Generátor UUID v1 a v4',                  'route': 'uuid_page'},
+            {'id': 'uuid',      'name': 'UUID',           'description': 'Generátor UUID v1, v3, v4, v5 a v7',      'route': 'uuid_page', 'cache': False,
+             'actions': ('inspect',)},
             {'id': 'hash',      'name': 'Hash',            'description': 'MD5, SHA-1, SHA-256, SHA-512',            'route': 'hash_generator_page'},
-            {'id': 'generator', 'name': 'Generátor dat',   'description': 'Čísla účtů dle ČNB, rodná čísla',        'route': 'generator_page'},
+            {'id': 'generator', 'name': 'Generátor dat',   'description': 'Čísla účtů dle ČNB, rodná čísla',        'route': 'generator_page', 'cache': False,
+             'actions': ('generate_accounts', 'generate_birth_numbers')},
         ]
     },
     {
         'id': 'conversion',
         'name': 'Konverze',
         'tools': [
-            {'id': 'encoder',   'name': 'Encoder',         'description': 'Base64, URL encode, Hex a další převody', 'route': 'text_encoder_page'},
+            {'id': 'encoder',   'name': 'Encoder',         'description': 'Base64, URL encode, Hex a další převody', 'route': 'text_encoder_page',
+             'actions': ('encode', 'decode')},
             {'id': 'encoding',  'name': 'Kódování',        'description': 'Převod textových souborů mezi kódováními','route': 'encoding_converter_page'},
-            {'id': 'bytes',     'name': 'Bytes',           'description': 'Převod Unicode escape sekvencí',          'route': 'bytes_converter_page'},
-            {'id': 'csv_json',  'name': 'CSV ↔ JSON',      'description': 'Konverze mezi CSV a JSON',               'route': 'csv_json_page'},
-            {'id': 'yaml_json', 'name': 'YAML ↔ JSON',     'description': 'Konverze mezi YAML a JSON',              'route': 'yaml_json_page'},
+            {'id': 'bytes',     'name': 'Bytes',           'description': 'Převod Unicode escape sekvencí',          'route': 'bytes_converter_page',
+             'actions': ('to_number', 'to_escapes', 'batch')},
+            {'id': 'csv_json',  'name': 'CSV ↔ JSON',      'description': 'Konverze mezi CSV a JSON',               'route': 'csv_json_page',
+             'actions': ('csv_to_json', 'json_to_csv')},
+            {'id': 'yaml_json', 'name': 'YAML ↔ JSON',     'description': 'Konverze mezi YAML a JSON',              'route': 'yaml_json_page', 'limits': (10, 512),
+             'actions': ('yaml_to_json', 'json_to_yaml')},
+            {'id': 'jobs',      'name': 'Úlohy',           'description': 'Velké převody souborů na pozadí',        'route': 'jobs_page', 'cache': False},
         ]
     },
     {
         'id': 'parsers',
         'name': 'Parsery',
         'tools': [
-            {'id': 'jwt',       'name': 'JWT Decoder',     'description': 'Dekódování JWT tokenů',                  'route': 'jwt_decoder_page'},
-            {'id': 'formatter', 'name': 'Formatter',       'description': 'Formátování JSON a XML',                 'route': 'formatter_page'},
-            {'id': 'cron',      'name': 'Cron',            'description': 'Parser a generátor cron výrazů',         'route': 'cron_page'},
-            {'id': 'diff',      'name': 'Diff',            'description': 'Porovnání dvou textů',                   'route': 'diff_page'},
+            {'id': 'jwt',       'name': 'JWT Decoder',     'description': 'Dekódování a ověření JWT tokenů',        'route': 'jwt_decoder_page', 'cache': False,
+             'actions': ('bulk',)},
+            {'id': 'formatter', 'name': 'Formatter',       'description': 'Formátování JSON a XML',                 'route': 'formatter_page',
+             'actions': ('pretty', 'minify', 'sort', 'xml_format')},
+            {'id': 'cron',      'name': 'Cron',            'description': 'Parser a generátor cron výrazů',         'route': 'cron_page', 'limits': (5, 256),
+             'actions': ('parse', 'build')},
+            {'id': 'diff',      'name': 'Diff',            'description': 'Porovnání dvou textů',                   'route': 'diff_page', 'limits': (15, 512)},
+            {'id': 'validator', 'name': 'Validátor',       'description': 'Kontrola čísel účtů, IBAN a rodných čísel','route': 'validator_page'},
         ]
     },
     {
         'id': 'reference',
         'name': 'Referenční',
         'tools': [
-            {'id': 'utilities', 'name': 'Utilities',       'description': 'Unix timestamp, JSON unescape a další',  'route': 'utilities_page'},
+            {'id': 'utilities', 'name': 'Utilities',       'description': 'Unix timestamp, JSON unescape a další',  'route': 'utilities_page', 'cache': False,
+             'actions': ('ts_to_dt', 'dt_to_ts', 'ts_bulk', 'dt_bulk', 'json_unescape', 'unicode_unescape',
+                         'html_encode', 'html_decode', 'epoch_days')},
             {'id': 'sql_joins', 'name': 'SQL JOINy',       'description': 'Přehled typů SQL JOIN s příklady',       'route': 'sql_joins_page'},
         ]
     },
@@ -86,6 +131,131 @@ TOOL_GROUPS = [
 
 # Zpětná kompatibilita — flat list
 TOOLS = [tool for group in TOOL_GROUPS for tool in group['tools']]
+TOOLS_BY_ID = {tool['id']: tool for tool in TOOLS}
+
+# Instance infrastruktury vznikají až při prvním použití, jedna na worker
+
+@lru_cache(maxsize=None)
+def _results():
+    """Cache výsledků deterministických nástrojů ('cache': False v registru = necachovat)."""
+    return result_cache.ResultCache(
+        max_bytes=int(os.getenv('RESULT_CACHE_MB', '64')) * 1024 * 1024,
+        disk_dir=os.path.join(UPLOAD_FOLDER, 'result-cache'),
+        disk_max_bytes=int(os.getenv('RESULT_CACHE_DISK_MB', '256')) * 1024 * 1024,
+    )
+
+
+@lru_cache(maxsize=None)
+def _sandboxed():
+    """
+    Izolace drahých nástrojů ('limits': (sekundy, MB) v registru); ostatní běží přímo ve workeru.
+    SANDBOX_POOL_SIZE=0 izolaci vypne — pak vrací None.
+    """
+    size = int(os.getenv('SANDBOX_POOL_SIZE', str(sandbox.POOL_SIZE)))
+    if size <= 0:
+        return None
+    return sandbox.Sandbox(size=size, preload=[f'libs.{name}' for name in ('yaml_json', 'cron_parser', 'diff_tool')])
+
+
+def _guarded(tool_id, fn):
+    """Vrátí fn hlídanou limity nástroje z registru, nebo fn beze změny."""
+    limits = TOOLS_BY_ID[tool_id].get('limits')
+    if limits is None:
+        return fn
+    sandboxed = _sandboxed()
+    return fn if sandboxed is None else sandboxed.guard(fn, *limits)
+
+
+def _cached(tool_id, fn, *args, **kwargs):
+    """Zavolá funkci nástroje přes cache výsledků, pokud ji registr nástroje nevylučuje."""
+    fn = _guarded(tool_id, fn)
+    if not TOOLS_BY_ID[tool_id].get('cache', True):
+        return fn(*args, **kwargs)
+    return _results().call(tool_id, fn, *args, **kwargs)
+
+
+@lru_cache(maxsize=None)
+def _job_queue():
+    """Fronta velkých převodů na pozadí (libs/jobs; runner python -m libs.jobs spouští worker podle potřeby)."""
+    return jobs.JobQueue(SHARED_STORE_PATH, os.path.join(UPLOAD_FOLDER, 'jobs'))
+
+
+MAX_SESSION_JOBS = 20
+
+
+# Metriky a profily sdílené mezi workery (libs/metrics → /metrics, libs/profiler → /profiles)
+
+@lru_cache(maxsize=None)
+def _shared():
+    return shared_store.SharedStore(SHARED_STORE_PATH)
+
+
+@lru_cache(maxsize=None)
+def _profiles():
+    return profiler.ProfileStore(_shared())
+
+
+def _result_cache_counts():
+    # Cache ani sandbox, které ještě nevznikly, nemají co hlásit — čtení metrik je nezakládá
+    if not _results.cache_info().currsize:
+        return {}
+    return _results().tool_stats()
+
+
+def _sandbox_kills():
+    sandboxed = _sandboxed() if _sandboxed.cache_info().currsize else None
+    return sandboxed.stats() if sandboxed is not None else {}
+
+
+@lru_cache(maxsize=None)
+def _tool_metrics():
+    tool_metrics = metrics.Metrics(_shared())
+    tool_metrics.track('dd_result_cache_requests_total', _result_cache_counts, labels=('tool', 'result'))
+    tool_metrics.track('dd_sandbox_kills_total', _sandbox_kills)
+    return tool_metrics
+
+
+_ENDPOINT_TOOLS = {tool['route']: tool['id'] for tool in TOOLS}
+_TOOL_ACTIONS = {tool['route']: frozenset(tool.get('actions', ())) for tool in TOOLS}
+_KNOWN_ACTIONS = frozenset().union(*_TOOL_ACTIONS.values())  # pomocné endpointy (…/bulk) sdílí akce nástrojů
+_UNMETERED_ENDPOINTS = {None, 'static', 'robots_txt', 'metrics_page', 'job_status'}
+_UNPROFILED_ENDPOINTS = {None, 'static', 'robots_txt', 'metrics_page', 'profiles_page', 'profile_view',
+                         'profile_collapsed'}
+
+# Předrenderované GET stránky bez výsledku (prázdné formuláře, úvod, přehledy)
+pages = page_cache.PageCache()
+
+
+def cached_page(view):
+    """
+    Dekorátor GET stránek: tělo se renderuje jednou na (cestu, uživatele) a vrací se s ETagem
+    (If-None-Match → 304). POST, query parametry a čekající flash zprávy jdou vždy přímo do view.
+    """
+    @wraps(view)
+    def wrapper(*args, **kwargs):
+        if request.method != 'GET' or request.args or session.get('_flashes'):
+            return view(*args, **kwargs)
+        key = (request.path, current_user.get_id())
+        entry = pages.get(key)
+        if entry is None:
+            response = app.make_response(view(*args, **kwargs))
+            if response.status_code != 200 or response.is_streamed:
+                return response
+            entry = pages.put(key, response.get_data())
+        body, etag = entry
+        response = app.response_class(body, mimetype='text/html')
+        response.set_etag(etag)
+        response.cache_control.no_cache = True
+        return response.make_conditional(request)
+    return wrapper
+
+
+@lru_cache(maxsize=None)
+def _navigation(endpoint, script_root):
+    """Menu ze TOOL_GROUPS se mění jen podle aktivní stránky — renderuje se jednou na endpoint."""
+    html = app.jinja_env.get_template('_nav.html').render(
+        tool_groups=TOOL_GROUPS, endpoint=endpoint, url_for=url_for)
+    return Markup(html.strip())
 
 
 @app.route('/robots.txt')
@@ -99,6 +269,221 @@ def set_session_timeout():
     session.permanent = True
 
 
+@app.before_request
+def start_request_timer():
+    g.request_start = time.perf_counter()
+
+
+@template_rendered.connect_via(app)
+def _note_result_error(sender, template, context, **extra):
+    """Výsledek nástroje s klíčem 'error' (result, json_result…) se v metrikách počítá jako chyba."""
+    if any(isinstance(value, dict) and value.get('error') for value in context.values()):
+        g.tool_error = True
+
+
+def _request_action():
+    """
+    Akce z formuláře, jen pokud ho už view načetlo — metriky ani profiler nesmí spouštět parsování velkého těla.
+    Hodnotu posílá klient, proto se bere jen ze 'actions' nástroje v registru; cokoli jiného je 'other'.
+    """
+    form = request.__dict__.get('form') or {}
+    action = form.get('action') or form.get('direction')
+    if not action:
+        return request.method.lower()
+    return action if action in _TOOL_ACTIONS.get(request.endpoint, _KNOWN_ACTIONS) else 'other'
+
+
+@app.after_request
+def record_metrics(response):
+    start = g.pop('request_start', None)
+    if start is None or request.endpoint in _UNMETERED_ENDPOINTS:
+        return response
+    error = (response.status_code >= 400 or g.get('tool_error', False)
+             or any(category == 'error' for category, _ in session.get('_flashes', ())))
+    tool, action = _ENDPOINT_TOOLS.get(request.endpoint, request.endpoint), _request_action()
+    input_bytes = request.content_length or 0
+
+    def observe():
+        _tool_metrics().observe(tool, action, time.perf_counter() - start, input_bytes, error)
+
+    # Streamovaná odpověď se měří až do odeslání posledního bloku
+    if response.is_streamed:
+        response.call_on_close(observe)
+    else:
+        observe()
+    return response
+
+
+@app.before_request
+def start_profiler():
+    """Profilování na vyžádání: ?profile=1, hlavička X-Profile nebo přepínač na /profiles; jinak bez režie."""
+    if not (request.args.get('profile') or request.headers.get('X-Profile') or session.get('profile')):
+        return
+    if request.endpoint in _UNPROFILED_ENDPOINTS or not current_user.is_authenticated:
+        return
+    g.profiler = profiler.SamplingProfiler()
+    g.profiler.start()
+
+
+@app.after_request
+def finish_profile(response):
+    sampler = g.pop('profiler', None)
+    if sampler is None:
+        return response
+    meta = {
+        'time': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+        'method': request.method,
+        'path': request.path,
+        'action': _request_action() if request.method == 'POST' else '',
+        'status': response.status_code,
+        'interval': sampler.interval,
+    }
+
+    def save():
+        samples = sampler.stop()
+        _profiles().add(dict(meta, duration_ms=sampler.duration * 1000, samples=sum(samples.values())),
+                     profiler.collapse(samples))
+
+    # Streamovaná odpověď se profiluje až do odeslání posledního bloku
+    if response.is_streamed:
+        response.call_on_close(save)
+    else:
+        save()
+    return response
+
+
+@app.after_request
+def compress_response(response):
+    """
+    Komprese textových odpovědí podle Accept-Encoding: hotové stránky najednou, streamované
+    exporty a soubory po blocích. ETag se mění na slabý — komprimované tělo není bajtově totožné.
+    """
+    if not compression.compressible(response.mimetype) or 'Content-Encoding' in response.headers:
+        return response
+    response.vary.add('Accept-Encoding')
+    encoding = compression.negotiate(request.headers.get('Accept-Encoding', ''))
+    if encoding is None or response.status_code != 200 or request.method == 'HEAD':
+        return response
+
+    if response.is_streamed or response.direct_passthrough:
+        response.response = compression.compress_chunks(response.response, encoding)
+        response.direct_passthrough = False
+        response.headers.pop('Content-Length', None)
+        response.headers.pop('Accept-Ranges', None)
+    else:
+        data = response.get_data()
+        if len(data) < compression.MIN_SIZE:
+            return response
+        response.set_data(compression.compress(data, encoding))
+    response.headers['Content-Encoding'] = encoding
+    etag, weak = response.get_etag()
+    if etag and not weak:
+        response.set_etag(etag, weak=True)
+    return response
+
+
+@app.route('/profiles', methods=['GET', 'POST'])
+@login_required
+def profiles_page():
+    """Seznam posledních profilů a přepínač profilování vlastních požadavků"""
+    if request.method == 'POST':
+        session['profile'] = not session.get('profile')
+        return redirect(url_for('profiles_page'))
+    return _render_profiles()
+
+
+@app.route('/profiles/<int:seq>')
+@login_required
+def profile_view(seq):
+    """Flame graf (icicle) jednoho profilu"""
+    record = _profiles().get(seq)
+    if record is None:
+        flash('Profil už není k dispozici (přepsán novějším nebo vypršel).', 'error')
+        return redirect(url_for('profiles_page'))
+    total, rows = profiler.flame_rows(record['collapsed'])
+    return _render_profiles(selected=record, total=total, rows=rows)
+
+
+@app.route('/profiles/<int:seq>.txt')
+@login_required
+def profile_collapsed(seq):
+    """Profil ve formátu collapsed stacks ke stažení"""
+    record = _profiles().get(seq)
+    if record is None:
+        return app.response_class('Profil už není k dispozici\n', status=404, mimetype='text/plain')
+    return app.response_class(record['collapsed'] + '\n', mimetype='text/plain',
+                              headers={'Content-Disposition': f'attachment; filename=profil_{seq}.txt'})
+
+
+def _render_profiles(selected=None, total=0, rows=None):
+    return render_template('profiles.html', tools=TOOLS, profiles=_profiles().recent(), selected=selected,
+                           total=total, rows=rows or [], interval=selected['interval'] if selected else 0,
+                           profiling=session.get('profile', False), ring_size=profiler.RING_SIZE)
+
+
+@app.route('/jobs', methods=['GET', 'POST'])
+def jobs_page():
+    """Zadání velkých převodů na pozadí a přehled vlastních úloh (ID úloh drží session)"""
+    if request.method == 'POST':
+        request.max_content_length = BULK_UPLOAD_MAX_LENGTH
+        files = [f for f in (request.files.get('file'), request.files.get('file2')) if f and f.filename]
+        if not files:
+            flash('Nebyl vybrán žádný soubor', 'error')
+            return redirect(url_for('jobs_page'))
+
+        params = {key: request.form.get(key) for key in ('source_encoding', 'target_encoding', 'error_mode', 'delimiter')
+                  if request.form.get(key)}
+        job_id, error = _job_queue().submit(request.form.get('kind', ''), params,
+                                         secure_filename(files[0].filename) or 'soubor', [f.stream for f in files])
+        if error:
+            flash(error, 'error')
+        else:
+            session['jobs'] = [job_id, *session.get('jobs', [])][:MAX_SESSION_JOBS]
+            flash('Úloha je ve frontě — průběh se aktualizuje sám.', 'success')
+        return redirect(url_for('jobs_page'))
+
+    return render_template('jobs.html', tools=TOOLS,
+                           jobs=_job_queue().get_many(session.get('jobs', [])),
+                           kinds=jobs.KINDS,
+                           progress_kinds=jobs.PROGRESS_KINDS,
+                           encodings=encoding_converter.get_encodings(),
+                           error_modes=encoding_converter.get_error_modes())
+
+
+@app.route('/jobs/<job_id>')
+@limiter.exempt
+def job_status(job_id):
+    """Stav úlohy pro průběžné dotazování ze stránky /jobs"""
+    job = _job_queue().get(job_id)
+    if job is None:
+        return jsonify({'status': 'missing'}), 404
+    if job['status'] == 'queued':
+        _job_queue().ensure_runner()  # runner mohl mezitím skončit (nečinnost, paměť)
+    return jsonify({key: job[key] for key in ('status', 'progress', 'error', 'output_name', 'output_size')})
+
+
+@app.route('/jobs/<job_id>/download')
+def job_download(job_id):
+    """Stažení výstupu hotové úlohy"""
+    job = _job_queue().get(job_id)
+    if job is None or job['status'] != 'done':
+        flash('Výstup úlohy není k dispozici (nedokončená nebo prošlá úloha).', 'error')
+        return redirect(url_for('jobs_page'))
+    return send_file(_job_queue().output_path(job_id), as_attachment=True, download_name=job['output_name'])
+
+
+@app.route('/metrics')
+@limiter.exempt
+def metrics_page():
+    """Metriky ve formátu Prometheus — pro přihlášeného uživatele nebo s hlavičkou Authorization: Bearer METRICS_TOKEN"""
+    token = os.getenv('METRICS_TOKEN', '')
+    supplied = request.headers.get('Authorization', '').encode()
+    if not (current_user.is_authenticated or (token and hmac.compare_digest(supplied, f'Bearer {token}'.encode()))):
+        return app.response_class('Unauthorized\n', status=401, mimetype='text/plain',
+                                  headers={'WWW-Authenticate': 'Bearer'})
+    return app.response_class(_tool_metrics().render(), mimetype='text/plain; version=0.0.4; charset=utf-8')
+
+
 @app.route('/login', methods=['GET', 'POST'])
 def login_page():
     if current_user.is_authenticated:
@@ -131,12 +516,14 @@ def logout():
 
 
 @app.route('/')
+@cached_page
 def index():
     """Úvodní stránka"""
     return render_template('index.html', tools=TOOLS)
 
 
 @app.route('/encoding', methods=['GET', 'POST'])
+@cached_page
 def encoding_converter_page():
     """Stránka pro převod kódování"""
     encodings = encoding_converter.get_encodings()
@@ -217,12 +604,20 @@ def encoding_convert():
 
 
 @app.route('/bytes', methods=['GET', 'POST'])
+@cached_page
 def bytes_converter_page():
     """Stránka pro převod bajtů"""
     result = None
     form_data = {}
 
-    if request.method == 'POST':
+    if request.method == 'POST' and request.form.get('direction') == 'batch':
+        form_data = {'direction': 'batch', 'batch_input': request.form.get('batch_input', ''), **_bytes_batch_args()}
+        convert = (bytes_converter.batch_numbers_to_escapes if form_data['mode'] == 'to_escapes'
+                   else bytes_converter.batch_escapes_to_numbers)
+        rows, error = convert(form_data['batch_input'], form_data['width'], form_data['signed'],
+                              form_data['byteorder'], form_data['divisor'])
+        result = {'direction': 'batch', 'rows': rows, 'error': error}
+    elif request.method == 'POST':
         direction = request.form.get('direction')
         divisor = float(request.form.get('divisor', 1) or 1)
         form_data = {'direction': direction, 'divisor': divisor}
@@ -238,10 +633,37 @@ def bytes_converter_page():
             output, error = bytes_converter.number_to_escapes(number, divisor)
             result = {'direction': direction, 'output': output, 'error': error}
 
-    return render_template('bytes_converter.html', tools=TOOLS, result=result, form_data=form_data)
+    return render_template('bytes_converter.html', tools=TOOLS, result=result, form_data=form_data,
+                           widths=bytes_converter.WIDTHS, bulk_formats=streaming.FORMATS)
+
+
+def _bytes_batch_args():
+    """Společné parametry hromadného převodu bajtů z formuláře."""
+    return {
+        'mode': request.form.get('mode', 'to_number'),
+        'width': request.form.get('width', 'auto'),
+        'signed': request.form.get('signed') == 'on',
+        'byteorder': request.form.get('byteorder', 'big'),
+        'divisor': request.form.get('batch_divisor', '1'),
+    }
+
+
+@app.route('/bytes/batch', methods=['POST'])
+def bytes_batch():
+    """Hromadný převod escape sekvencí ↔ čísla ke stažení"""
+    args = _bytes_batch_args()
+    convert = (bytes_converter.batch_numbers_to_escapes if args['mode'] == 'to_escapes'
+               else bytes_converter.batch_escapes_to_numbers)
+    rows, error = convert(request.form.get('batch_input', ''), args['width'], args['signed'],
+                          args['byteorder'], args['divisor'])
+    if error:
+        flash(error, 'error')
+        return redirect(url_for('bytes_converter_page'))
+    return _stream_download(rows, request.form.get('bulk_format', 'csv'), 'bajty')
 
 
 @app.route('/encoder', methods=['GET', 'POST'])
+@cached_page
 def text_encoder_page():
     """Stránka pro enkódování textu"""
     result = None
@@ -254,9 +676,9 @@ def text_encoder_page():
         form_data = {'algorithm': algorithm, 'action': action, 'input': text}
 
         if action == 'encode':
-            output, error = text_encoder.encode(text, algorithm)
+            output, error = _cached('encoder', text_encoder.encode, text, algorithm)
         else:
-            output, error = text_encoder.decode(text, algorithm)
+            output, error = _cached('encoder', text_encoder.decode, text, algorithm)
 
         result = {'output': output, 'error': error}
 
@@ -266,24 +688,83 @@ def text_encoder_page():
 
 
 @app.route('/jwt', methods=['GET', 'POST'])
+@cached_page
 def jwt_decoder_page():
     """Stránka pro dekódování JWT tokenů"""
     result = None
+    bulk_result = None
     form_data = {}
 
     if request.method == 'POST':
-        token = request.form.get('token', '')
-        form_data = {'token': token}
-        decoded, error = jwt_decoder.decode(token)
-        if error:
-            result = {'error': error}
+        if request.form.get('action') == 'bulk':
+            form_data = {k: request.form.get(k, '') for k in ('tokens', 'secret', 'jwks')}
+            keys, error = _jwt_keys()
+            rows = None
+            if not error:
+                rows, error = jwt_decoder.decode_bulk_text(form_data['tokens'], keys)
+            bulk_result = {'rows': rows, 'error': error}
         else:
-            result = decoded
+            token = request.form.get('token', '')
+            form_data = {'token': token}
+            decoded, error = jwt_decoder.decode(token)
+            if error:
+                result = {'error': error}
+            else:
+                result = decoded
+
+    return render_template('jwt_decoder.html', tools=TOOLS, result=result, bulk_result=bulk_result,
+                           form_data=form_data, bulk_formats=streaming.FORMATS)
+
+
+@app.route('/jwt/stats', methods=['POST'])
+def jwt_stats():
+    """Statistiky claimů (iss/aud/scope, životnost, expirace) z nahraného logu nebo vloženého textu"""
+    request.max_content_length = BULK_UPLOAD_MAX_LENGTH
+
+    form_data = {k: request.form.get(k, '') for k in ('tokens', 'secret', 'jwks')}
+    file = request.files.get('file')
+    if file and file.filename:
+        stats, error = jwt_decoder.analyze_file(file.stream)
+    else:
+        stats, error = jwt_decoder.analyze_text(form_data['tokens'])
+
+    return render_template('jwt_decoder.html', tools=TOOLS, result=None, bulk_result=None,
+                           stats_result={'stats': stats, 'error': error},
+                           form_data=form_data, bulk_formats=streaming.FORMATS)
 
-    return render_template('jwt_decoder.html', tools=TOOLS, result=result, form_data=form_data)
+
+def _jwt_keys():
+    """Klíče pro ověření JWT z formuláře — secret a JWKS (vložený, nebo nahraný soubor má přednost)."""
+    jwks = request.form.get('jwks', '')
+    jwks_file = request.files.get('jwks_file')
+    if jwks_file and jwks_file.filename:
+        jwks = jwks_file.read(jwt_decoder.MAX_JWKS_INPUT + 1).decode('utf-8', errors='replace')
+    return jwt_decoder.load_keys(request.form.get('secret', ''), jwks)
+
+
+@app.route('/jwt/bulk', methods=['POST'])
+def jwt_bulk():
+    """Hromadné dekódování tokenů z nahraného logu — výsledek se streamuje jako CSV/NDJSON"""
+    request.max_content_length = BULK_UPLOAD_MAX_LENGTH
+
+    file = request.files.get('file')
+    if not file or file.filename == '':
+        flash('Nebyl vybrán žádný soubor', 'error')
+        return redirect(url_for('jwt_decoder_page'))
+
+    keys, error = _jwt_keys()
+    if not error:
+        rows, error = jwt_decoder.decode_bulk_file(_detach_upload(file), keys)
+    if error:
+        flash(error, 'error')
+        return redirect(url_for('jwt_decoder_page'))
+
+    name, _ = os.path.splitext(secure_filename(file.filename))
+    return _stream_download(rows, request.form.get('bulk_format', 'csv'), f'{name or "jwt"}_tokeny')
 
 
 @app.route('/hash', methods=['GET', 'POST'])
+@cached_page
 def hash_generator_page():
     """Stránka pro generování hashů"""
     result = None
@@ -292,12 +773,13 @@ def hash_generator_page():
     if request.method == 'POST':
         text = request.form.get('text', '')
         form_data = {'text': text}
-        result = hash_generator.compute_all(text)
+        result = _cached('hash', hash_generator.compute_all, text)
 
     return render_template('hash_generator.html', tools=TOOLS, result=result, form_data=form_data)
 
 
 @app.route('/cron', methods=['GET', 'POST'])
+@cached_page
 def cron_page():
     """Stránka pro cron parser a generátor"""
     parse_result = None
@@ -312,11 +794,11 @@ def cron_page():
             expression = request.form.get('expression', '').strip()
             parse_form = {'expression': expression}
 
-            description, error = cron_parser.describe(expression)
+            description, error = _cached('cron', cron_parser.describe, expression)
             if error:
                 parse_result = {'error': error}
             else:
-                runs, err2 = cron_parser.next_runs(expression)
+                runs, err2 = _guarded('cron', cron_parser.next_runs)(expression)
                 parse_result = {
                     'description': description,
                     'next_runs': runs or [],
@@ -333,7 +815,7 @@ def cron_page():
             }
             build_form = fields
             expression = cron_parser.build(**fields)
-            description, error = cron_parser.describe(expression)
+            description, error = _cached('cron', cron_parser.describe, expression)
             build_result = {
                 'expression': expression,
                 'description': description,
@@ -349,6 +831,7 @@ def cron_page():
 
 
 @app.route('/formatter', methods=['GET', 'POST'])
+@cached_page
 def formatter_page():
     """Stránka pro formátování JSON a XML"""
     json_result = None
@@ -361,19 +844,23 @@ def formatter_page():
 
         if action in ('pretty', 'minify', 'sort'):
             text = request.form.get('json_input', '')
-            json_form = {'input': text}
+            json_form = _echo_form({'input': text})
             if action == 'pretty':
-                output, error = formatter.format_json(text)
+                output, error = _cached('formatter', formatter.format_json, text)
             elif action == 'minify':
-                output, error = formatter.minify_json(text)
+                output, error = _cached('formatter', formatter.minify_json, text)
             elif action == 'sort':
-                output, error = formatter.format_json(text, sort_keys=True)
+                output, error = _cached('formatter', formatter.format_json, text, sort_keys=True)
+            if json_form['download'] and not error:
+                return _text_download(output, 'formatovany', 'json')
             json_result = {'output': output, 'error': error}
 
         elif action == 'xml_format':
             text = request.form.get('xml_input', '')
-            xml_form = {'input': text}
-            output, error = formatter.format_xml(text)
+            xml_form = _echo_form({'input': text})
+            output, error = _cached('formatter', formatter.format_xml, text)
+            if xml_form['download'] and not error:
+                return _text_download(output, 'formatovany', 'xml')
             xml_result = {'output': output, 'error': error}
 
     return render_template('formatter.html', tools=TOOLS,
@@ -382,9 +869,12 @@ def formatter_page():
 
 
 @app.route('/utilities', methods=['GET', 'POST'])
+@cached_page
 def utilities_page():
     """Stránka pro utility"""
     ts_result = None
+    ts_bulk_result = None
+    dt_bulk_result = None
     json_unescape_result = None
     unicode_unescape_result = None
     html_entity_result = None
@@ -409,6 +899,18 @@ def utilities_page():
             output, error = utilities.datetime_to_timestamp(dt_str, unit=unit, timezone_name=timezone_name)
             ts_result = {'output': output, 'error': error, 'direction': 'to_ts'}
 
+        elif action == 'ts_bulk':
+            form_data = {'action': action, **_ts_bulk_form_args(), 'timestamps': request.form.get('timestamps', '')}
+            output, error = utilities.convert_timestamps_text(form_data['timestamps'], form_data['unit'],
+                                                              form_data['timezone'])
+            ts_bulk_result = {'output': output, 'error': error}
+
+        elif action == 'dt_bulk':
+            form_data = {'action': action, **_dt_bulk_form_args(), 'datetimes': request.form.get('datetimes', '')}
+            output, error = utilities.parse_datetimes_text(form_data['datetimes'], form_data['format'],
+                                                           form_data['unit'], form_data['timezone'])
+            dt_bulk_result = {'output': output, 'error': error}
+
         elif action == 'json_unescape':
             text = request.form.get('json_escaped', '')
             form_data = {'action': action, 'json_escaped': text}
@@ -441,6 +943,13 @@ def utilities_page():
 
     return render_template('utilities.html', tools=TOOLS,
                            ts_result=ts_result,
+                           ts_bulk_result=ts_bulk_result,
+                           dt_bulk_result=dt_bulk_result,
+                           ts_units=utilities.TS_UNITS,
+                           dt_formats=utilities.DT_FORMATS,
+                           log_outputs=utilities.LOG_OUTPUTS,
+                           escape_ops=utilities.ESCAPE_OPS,
+                           bulk_formats=streaming.FORMATS,
                            json_unescape_result=json_unescape_result,
                            unicode_unescape_result=unicode_unescape_result,
                            epoch_days_result=epoch_days_result,
@@ -448,7 +957,116 @@ def utilities_page():
                            form_data=form_data)
 
 
+def _ts_bulk_form_args():
+    """Jednotka a zóna pro hromadný převod timestampů z formuláře"""
+    return {'unit': request.form.get('unit', 'auto'), 'timezone': request.form.get('timezone', 'UTC').strip()}
+
+
+@app.route('/utilities/timestamps', methods=['POST'])
+def utilities_timestamps_bulk():
+    """Hromadný převod timestampů (nahraný soubor nebo vložený sloupec) jako streamovaný CSV/NDJSON"""
+    request.max_content_length = BULK_UPLOAD_MAX_LENGTH
+    args = _ts_bulk_form_args()
+
+    file = request.files.get('file')
+    if file and file.filename:
+        rows, error = utilities.convert_timestamps_file(_detach_upload(file), args['unit'], args['timezone'])
+        name, _ = os.path.splitext(secure_filename(file.filename))
+    else:
+        rows, error = utilities.convert_timestamps(request.form.get('timestamps', '').splitlines(),
+                                                   args['unit'], args['timezone'])
+        name = ''
+    if error:
+        flash(error, 'error')
+        return redirect(url_for('utilities_page'))
+
+    return _stream_download(rows, request.form.get('bulk_format', 'csv'), f'{name or "timestampy"}_prevedeno')
+
+
+def _dt_bulk_form_args():
+    """Formát, jednotka a zóna pro hromadné parsování data a času z formuláře"""
+    return {'format': request.form.get('format', '').strip(), 'unit': request.form.get('unit', 's'),
+            'timezone': request.form.get('timezone', 'UTC').strip()}
+
+
+@app.route('/utilities/datetimes', methods=['POST'])
+def utilities_datetimes_bulk():
+    """Hromadný převod data a času na timestampy jako streamovaný CSV/NDJSON"""
+    request.max_content_length = BULK_UPLOAD_MAX_LENGTH
+    args = _dt_bulk_form_args()
+
+    file = request.files.get('file')
+    if file and file.filename:
+        rows, error = utilities.parse_datetimes_file(_detach_upload(file), args['format'], args['unit'],
+                                                     args['timezone'])
+        name, _ = os.path.splitext(secure_filename(file.filename))
+    else:
+        rows, error = utilities.parse_datetimes(request.form.get('datetimes', '').splitlines(), args['format'],
+                                                args['unit'], args['timezone'])
+        name = ''
+    if error:
+        flash(error, 'error')
+        return redirect(url_for('utilities_page'))
+
+    return _stream_download(rows, request.form.get('bulk_format', 'csv'), f'{name or "datumy"}_timestampy')
+
+
+@app.route('/utilities/escape', methods=['POST'])
+def utilities_escape_file():
+    """Proudový escape/unescape nahraného souboru (JSON, \\uXXXX, HTML entity)"""
+    request.max_content_length = BULK_UPLOAD_MAX_LENGTH
+
+    file = request.files.get('file')
+    if not file or file.filename == '':
+        flash('Nebyl vybrán žádný soubor', 'error')
+        return redirect(url_for('utilities_page'))
+
+    op = request.form.get('op', '')
+    chunks, error = utilities.escape_stream(_detach_upload(file), op)
+    if error:
+        flash(error, 'error')
+        return redirect(url_for('utilities_page'))
+
+    name, ext = os.path.splitext(secure_filename(file.filename))
+    return app.response_class(
+        stream_with_context(streaming.stream_lines(chunks)),
+        mimetype='text/plain; charset=utf-8',
+        headers={'Content-Disposition': f'attachment; filename={name or "vystup"}_{op}{ext or ".txt"}'},
+    )
+
+
+@app.route('/utilities/log', methods=['POST'])
+def utilities_log_normalize():
+    """Přepis časů v nahraném logu do jednoho formátu (volitelně seřazeno) — výsledek se streamuje zpět"""
+    request.max_content_length = BULK_UPLOAD_MAX_LENGTH
+
+    file = request.files.get('file')
+    if not file or file.filename == '':
+        flash('Nebyl vybrán žádný soubor', 'error')
+        return redirect(url_for('utilities_page'))
+
+    lines, error = utilities.normalize_log(
+        _detach_upload(file),
+        output=request.form.get('output', 'utc'),
+        timezone_name=request.form.get('timezone', 'UTC').strip(),
+        sort=request.form.get('sort') == 'on',
+        epochs=request.form.get('epochs') == 'on',
+        tmp_dir=UPLOAD_FOLDER,
+    )
+    if error:
+        flash(error, 'error')
+        return redirect(url_for('utilities_page'))
+
+    name, ext = os.path.splitext(secure_filename(file.filename))
+    return app.response_class(
+        stream_with_context(streaming.stream_lines(lines)),
+        mimetype='text/plain; charset=utf-8',
+        headers={'Content-Disposition': f'attachment; filename={name or "log"}_normalizovano{ext or ".log"}'},
+    )
+
+
 @app.route('/diff', methods=['GET', 'POST'])
+@cached_page
 def diff_page():
     """Stránka pro porovnání textů"""
     result = None
@@ -457,10 +1075,12 @@ def diff_page():
     if request.method == 'POST':
         text1 = request.form.get('text1', '')
         text2 = request.form.get('text2', '')
-        form_data = {'text1': text1, 'text2': text2}
-        lines, identical = diff_tool.compare(text1, text2)
+        form_data = _echo_form({'text1': text1, 'text2': text2})
+        lines, identical = _cached('diff', diff_tool.compare, text1, text2)
         if isinstance(identical, str):
             result = {'error': identical}
+        elif form_data['download'] and lines:
+            return _text_download(diff_tool.to_text(lines), 'rozdily', 'diff')
         else:
             result = {'lines': lines, 'identical': identical}
 
@@ -468,6 +1088,7 @@ def diff_page():
 
 
 @app.route('/csv-json', methods=['GET', 'POST'])
+@cached_page
 def csv_json_page():
     """Stránka pro konverzi CSV ↔ JSON"""
     result = None
@@ -481,37 +1102,90 @@ def csv_json_page():
 
         if action == 'csv_to_json':
             text = request.form.get('csv_input', '')
-            form_data = {'action': action, 'csv_input': text}
-            output, error = csv_json.csv_to_json(text, delimiter)
+            form_data = _echo_form({'action': action, 'csv_input': text})
+            output, error = _cached('csv_json', csv_json.csv_to_json, text, delimiter)
+            if form_data['download'] and not error:
+                return _text_download(output, 'prevod', 'json')
             result = {'action': action, 'output': output, 'error': error}
 
         elif action == 'json_to_csv':
             text = request.form.get('json_input', '')
-            form_data = {'action': action, 'json_input': text}
-            output, error = csv_json.json_to_csv(text, delimiter)
+            form_data = _echo_form({'action': action, 'json_input': text})
+            output, error = _cached('csv_json', csv_json.json_to_csv, text, delimiter)
+            if form_data['download'] and not error:
+                return _text_download(output, 'prevod', 'csv')
             result = {'action': action, 'output': output, 'error': error}
 
     return render_template('csv_json.html', tools=TOOLS, result=result, form_data=form_data)
 
 
+def _uuid_form_args():
+    """Načte parametry generování UUID z formuláře (slouží zároveň jako form_data)."""
+    return {
+        'version': request.form.get('version', '4'),
+        'count': request.form.get('count', '1'),
+        'seed': request.form.get('seed', '').strip(),
+        'namespace': request.form.get('namespace', 'dns').strip(),
+        'names': request.form.get('names', ''),
+    }
+
+
 @app.route('/uuid', methods=['GET', 'POST'])
+@cached_page
 def uuid_page():
     """Stránka pro generování UUID"""
     result = None
+    inspect_result = None
     form_data = {}
 
     if request.method == 'POST':
-        version = request.form.get('version', '4')
-        count = request.form.get('count', '1')
-        form_data = {'version': version, 'count': count}
-        uuids, error = uuid_generator.generate(version, count)
-        result = {'uuids': uuids, 'error': error}
+        if request.form.get('action') == 'inspect':
+            ids = request.form.get('ids', '')
+            form_data = {'ids': ids}
+            rows, error = uuid_generator.inspect_text(ids)
+            inspect_result = {'rows': rows, 'error': error}
+        else:
+            form_data = _uuid_form_args()
+            uuids, error = uuid_generator.generate(**form_data)
+            result = {'uuids': uuids, 'error': error}
+
+    return render_template('uuid.html', tools=TOOLS, result=result, inspect_result=inspect_result,
+                           form_data=form_data, versions=uuid_generator.VERSIONS,
+                           namespaces=uuid_generator.NAMESPACES, bulk_formats=streaming.FORMATS,
+                           bulk_max_count=uuid_generator.BULK_MAX_COUNT)
+
+
+@app.route('/uuid/bulk', methods=['POST'])
+def uuid_bulk():
+    """Hromadné generování UUID jako streamovaný CSV/NDJSON soubor"""
+    rows, error = uuid_generator.bulk_generate(**_uuid_form_args())
+    if error:
+        flash(error, 'error')
+        return redirect(url_for('uuid_page'))
+    return _stream_download(rows, request.form.get('bulk_format', 'csv'), 'uuid')
+
 
-    return render_template('uuid.html', tools=TOOLS, result=result,
-                           form_data=form_data, versions=uuid_generator.VERSIONS)
+@app.route('/uuid/inspect', methods=['POST'])
+def uuid_inspect_bulk():
+    """Dekódování nahraného souboru UUID/ULID (jedno na řádek) — výsledek se streamuje zpět"""
+    request.max_content_length = BULK_UPLOAD_MAX_LENGTH
+
+    file = request.files.get('file')
+    if not file or file.filename == '':
+        flash('Nebyl vybrán žádný soubor', 'error')
+        return redirect(url_for('uuid_page'))
+
+    rows, error = uuid_generator.inspect_file(_detach_upload(file))
+    if error:
+        flash(error, 'error')
+        return redirect(url_for('uuid_page'))
+
+    name, _ = os.path.splitext(secure_filename(file.filename))
+    return _stream_download(rows, request.form.get('bulk_format', 'csv'), f'{name or "uuid"}_dekodovano')
 
 
 @app.route('/yaml-json', methods=['GET', 'POST'])
+@cached_page
 def yaml_json_page():
     """Stránka pro konverzi YAML ↔ JSON"""
     result = None
@@ -522,20 +1196,138 @@ def yaml_json_page():
 
         if action == 'yaml_to_json':
             text = request.form.get('yaml_input', '')
-            form_data = {'action': action, 'yaml_input': text}
-            output, error = yaml_json.yaml_to_json(text)
+            form_data = _echo_form({'action': action, 'yaml_input': text})
+            output, error = _cached('yaml_json', yaml_json.yaml_to_json, text)
+            if form_data['download'] and not error:
+                return _text_download(output, 'prevod', 'json')
             result = {'action': action, 'output': output, 'error': error}
 
         elif action == 'json_to_yaml':
             text = request.form.get('json_input', '')
-            form_data = {'action': action, 'json_input': text}
-            output, error = yaml_json.json_to_yaml(text)
+            form_data = _echo_form({'action': action, 'json_input': text})
+            output, error = _cached('yaml_json', yaml_json.json_to_yaml, text)
+            if form_data['download'] and not error:
+                return _text_download(output, 'prevod', 'yaml')
             result = {'action': action, 'output': output, 'error': error}
 
     return render_template('yaml_json.html', tools=TOOLS, result=result, form_data=form_data)
 
 
+def _account_form_args():
+    """Načte parametry generování čísel účtů z formuláře → (args pro lib, form_data)."""
+    try:
+        count = int(request.form.get('acc_count', 10))
+    except ValueError:
+        count = 0
+    with_prefix = bool(request.form.get('acc_with_prefix'))
+    without_prefix = bool(request.form.get('acc_without_prefix'))
+    bank_code = request.form.get('bank_code', '').strip()
+    iban_format = request.form.get('iban_format', 'plain')
+    seed = request.form.get('acc_seed', '').strip()
+    form_data = {
+        'action': 'generate_accounts',
+        'acc_count': count,
+        'acc_with_prefix': with_prefix,
+        'acc_without_prefix': without_prefix,
+        'bank_code': bank_code,
+        'iban_format': iban_format,
+        'acc_seed': seed,
+    }
+    args = {
+        'count': count,
+        'with_prefix': with_prefix,
+        'without_prefix': without_prefix,
+        'bank_code': bank_code,
+        'iban_format': iban_format,
+        'seed': seed,
+    }
+    return args, form_data
+
+
+def _birth_number_form_args():
+    """Načte parametry generování rodných čísel z formuláře → (args pro lib, form_data, error)."""
+    try:
+        count = int(request.form.get('bn_count', 10))
+    except ValueError:
+        count = 0
+    gender = request.form.get('bn_gender', 'both')
+    variants = request.form.getlist('bn_variants')
+    date_mode = request.form.get('bn_date_mode', 'range')
+    form_data = {
+        'action': 'generate_birth_numbers',
+        'bn_count': count,
+        'bn_gender': gender,
+        'bn_variants': variants,
+        'bn_date_mode': date_mode,
+        'bn_age_min': request.form.get('bn_age_min', '20'),
+        'bn_age_max': request.form.get('bn_age_max', '40'),
+        'bn_date': request.form.get('bn_date', ''),
+        'bn_seed': request.form.get('bn_seed', '').strip(),
+    }
+    args = {'count': count, 'gender': gender, 'variants': variants, 'seed': form_data['bn_seed']}
+
+    if date_mode == 'range':
+        try:
+            args['age_min'] = int(request.form.get('bn_age_min', 20))
+            args['age_max'] = int(request.form.get('bn_age_max', 40))
+        except ValueError:
+            return None, form_data, 'Věkový rozsah musí být celé číslo.'
+        args['date_mode'] = 'range'
+    else:
+        date_str = request.form.get('bn_date', '').strip()
+        try:
+            args['specific_date'] = datetime.strptime(date_str, '%Y/%m/%d').date()
+        except ValueError:
+            return None, form_data, 'Neplatný formát data. Použij YYYY/MM/DD, např. 1990/06/15.'
+        args['date_mode'] = 'specific'
+    return args, form_data, None
+
+
+def _detach_upload(file):
+    """
+    Zkopíruje nahraný soubor do vlastního dočasného souboru v UPLOAD_FOLDER.
+    Flask zavře request.files při ukončení view, streamovaná odpověď ale čte dál;
+    dočasný soubor zmizí po zavření (po doběhnutí odpovědi).
+    """
+    tmp = tempfile.TemporaryFile(dir=UPLOAD_FOLDER)
+    shutil.copyfileobj(file.stream, tmp)
+    tmp.seek(0)
+    return tmp
+
+
+def _echo_form(form_data):
+    """
+    Doplní form_data o volby výstupu (_output_options.html). S no_echo se vstupní texty
+    do stránky nevracejí — odpověď je u velkých vstupů zhruba poloviční.
+    """
+    options = {'download': bool(request.form.get('download')), 'no_echo': bool(request.form.get('no_echo'))}
+    if options['no_echo']:
+        form_data = {key: ('' if key != 'action' else value) for key, value in form_data.items()}
+    return {**form_data, **options}
+
+
+def _text_download(text, basename, extension):
+    """Výsledek textového nástroje jako streamovaný soubor ke stažení (bez vykreslení stránky)."""
+    return app.response_class(
+        streaming.stream_text(text),
+        mimetype=streaming.TEXT_MIMETYPES[extension],
+        headers={'Content-Disposition': f'attachment; filename={basename}.{extension}'},
+    )
+
+
+def _stream_download(rows, fmt, basename, delimiter=','):
+    """Streamuje iterátor řádků jako CSV/NDJSON soubor ke stažení."""
+    if fmt not in streaming.MIMETYPES:
+        fmt = 'csv'
+    return app.response_class(
+        stream_with_context(streaming.stream_rows(rows, fmt, delimiter)),
+        mimetype=streaming.MIMETYPES[fmt],
+        headers={'Content-Disposition': f'attachment; filename={streaming.download_name(basename, fmt)}'},
+    )
+
+
 @app.route('/generator', methods=['GET', 'POST'])
+@cached_page
 def generator_page():
     """Stránka pro generování testovacích dat"""
     acc_result = None
@@ -546,82 +1338,95 @@ def generator_page():
         action = request.form.get('action')
 
         if action == 'generate_accounts':
-            try:
-                count = int(request.form.get('acc_count', 10))
-            except ValueError:
-                count = 0
-            with_prefix = bool(request.form.get('acc_with_prefix'))
-            without_prefix = bool(request.form.get('acc_without_prefix'))
-            bank_code = request.form.get('bank_code', '').strip()
-            iban_format = request.form.get('iban_format', 'plain')
-            form_data = {
-                'action': action,
-                'acc_count': count,
-                'acc_with_prefix': with_prefix,
-                'acc_without_prefix': without_prefix,
-                'bank_code': bank_code,
-                'iban_format': iban_format,
-            }
-            output, error = generator.generate_account_numbers(
-                count, with_prefix, without_prefix,
-                bank_code=bank_code, iban_format=iban_format
-            )
+            args, form_data = _account_form_args()
+            output, error = generator.generate_account_numbers(**args)
             acc_result = {'output': output, 'error': error}
 
         elif action == 'generate_birth_numbers':
-            try:
-                count = int(request.form.get('bn_count', 10))
-            except ValueError:
-                count = 0
-            gender = request.form.get('bn_gender', 'both')
-            variants = request.form.getlist('bn_variants')
-            date_mode = request.form.get('bn_date_mode', 'range')
-            form_data = {
-                'action': action,
-                'bn_count': count,
-                'bn_gender': gender,
-                'bn_variants': variants,
-                'bn_date_mode': date_mode,
-                'bn_age_min': request.form.get('bn_age_min', '20'),
-                'bn_age_max': request.form.get('bn_age_max', '40'),
-                'bn_date': request.form.get('bn_date', ''),
-            }
-
-            if date_mode == 'range':
-                try:
-                    age_min = int(request.form.get('bn_age_min', 20))
-                    age_max = int(request.form.get('bn_age_max', 40))
-                except ValueError:
-                    bn_result = {'output': None, 'error': 'Věkový rozsah musí být celé číslo.'}
-                    return render_template('generator.html', tools=TOOLS,
-                                           acc_result=acc_result, bn_result=bn_result,
-                                           form_data=form_data)
-                output, error = generator.generate_birth_numbers(
-                    count, gender, variants, 'range',
-                    age_min=age_min, age_max=age_max
-                )
+            args, form_data, error = _birth_number_form_args()
+            if error:
+                bn_result = {'output': None, 'error': error}
             else:
-                from datetime import datetime
-                date_str = request.form.get('bn_date', '').strip()
-                try:
-                    specific_date = datetime.strptime(date_str, '%Y/%m/%d').date()
-                except ValueError:
-                    bn_result = {'output': None, 'error': 'Neplatný formát data. Použij YYYY/MM/DD, např. 1990/06/15.'}
-                    return render_template('generator.html', tools=TOOLS,
-                                           acc_result=acc_result, bn_result=bn_result,
-                                           form_data=form_data)
-                output, error = generator.generate_birth_numbers(
-                    count, gender, variants, 'specific',
-                    specific_date=specific_date
-                )
-            bn_result = {'output': output, 'error': error}
+                output, error = generator.generate_birth_numbers(**args)
+                bn_result = {'output': output, 'error': error}
 
     return render_template('generator.html', tools=TOOLS,
                            acc_result=acc_result, bn_result=bn_result,
-                           form_data=form_data)
+                           form_data=form_data, bulk_formats=streaming.FORMATS,
+                           bulk_max_count=generator.BULK_MAX_COUNT)
+
+
+@app.route('/generator/bulk', methods=['POST'])
+def generator_bulk():
+    """Hromadné generování testovacích dat jako streamovaný CSV/NDJSON soubor"""
+    action = request.form.get('action')
+    fmt = request.form.get('bulk_format', 'csv')
+
+    if action == 'generate_accounts':
+        args, _ = _account_form_args()
+        rows, error = generator.bulk_account_numbers(**args)
+        basename = 'ucty'
+    elif action == 'generate_birth_numbers':
+        args, _, error = _birth_number_form_args()
+        if not error:
+            rows, error = generator.bulk_birth_numbers(**args)
+        basename = 'rodna_cisla'
+    else:
+        error = 'Neznámá akce.'
+
+    if error:
+        flash(error, 'error')
+        return redirect(url_for('generator_page'))
+
+    return _stream_download(rows, fmt, basename)
+
+
+@app.route('/validator', methods=['GET', 'POST'])
+@cached_page
+def validator_page():
+    """Stránka pro validaci čísel účtů, IBAN a rodných čísel"""
+    result = None
+    form_data = {}
+
+    if request.method == 'POST':
+        kind = request.form.get('kind', 'account')
+        values = request.form.get('values', '')
+        form_data = {'kind': kind, 'values': values}
+        rows, error = validator.validate_text(values, kind)
+        result = {'rows': rows, 'error': error}
+
+    return render_template('validator.html', tools=TOOLS, result=result, form_data=form_data,
+                           kinds=validator.KINDS, bulk_formats=streaming.FORMATS)
+
+
+@app.route('/validator/bulk', methods=['POST'])
+def validator_bulk():
+    """Validace sloupce nahraného CSV — výsledek se streamuje zpět"""
+    request.max_content_length = BULK_UPLOAD_MAX_LENGTH
+
+    file = request.files.get('file')
+    if not file or file.filename == '':
+        flash('Nebyl vybrán žádný soubor', 'error')
+        return redirect(url_for('validator_page'))
+
+    delimiter = request.form.get('delimiter', ',')
+    if len(delimiter) != 1:
+        delimiter = ','
+    upload = _detach_upload(file)
+    rows, error = validator.validate_csv(upload, request.form.get('kind', 'account'),
+                                         request.form.get('column', '1'), delimiter)
+    if error:
+        upload.close()
+        flash(error, 'error')
+        return redirect(url_for('validator_page'))
+
+    name, _ = os.path.splitext(secure_filename(file.filename))
+    return _stream_download(rows, request.form.get('bulk_format', 'csv'), f'{name or "data"}_validace',
+                            delimiter)
 
 
 @app.route('/sql-joins')
+@cached_page
 def sql_joins_page():
     return render_template('sql_joins.html', tools=TOOLS)
 
@@ -632,6 +1437,7 @@ def inject_globals():
         'app_name': 'DD Tools',
         'tool_groups': TOOL_GROUPS,
         'tools': TOOLS,
+        'navigation': lambda: _navigation(request.endpoint, request.script_root),
     }
 
 
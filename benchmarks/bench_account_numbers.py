@@ -0,0 +1,47 @@
+#!/usr/bin/env python3
+"""
+Benchmark generování čísel účtů: původní smyčka po číslicích vs. dávkový generátor.
+Spusť z kořene projektu: python benchmarks/bench_account_numbers.py
+"""
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from libs import generator  # noqa: E402
+
+SIZES = [1_000, 100_000, 1_000_000]
+
+
+def legacy_account_part(min_len, max_len):
+    """Původní implementace: randint po číslicích + retry smyčka."""
+    for _ in range(500):
+        length = random.randint(min_len, max_len)
+        digits = [random.randint(1, 9)] + [random.randint(0, 9) for _ in range(length - 2)]
+        padded = [0] * (9 - len(digits)) + digits
+        current_sum = sum(d * w for d, w in zip(padded, generator._ACCOUNT_WEIGHTS[:9]))
+        last = (-current_sum) % 11
+        if last <= 9:
+            digits.append(last)
+            return ''.join(str(d) for d in digits)
+    return None
+
+
+def timed(fn):
+    start = time.perf_counter()
+    fn()
+    return time.perf_counter() - start
+
+
+def main():
+    print(f'{"počet":>10} {"smyčka [s]":>12} {"dávka [s]":>12} {"zrychlení":>10}')
+    for n in SIZES:
+        legacy = timed(lambda: [legacy_account_part(6, 10) for _ in range(n)])
+        batched = timed(lambda: generator._generate_account_parts(n, 6, 10, generator.make_rng()))
+        print(f'{n:>10} {legacy:>12.3f} {batched:>12.3f} {legacy / batched:>9.1f}x')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,60 @@
+#!/usr/bin/env python3
+"""
+Mikrobenchmark MOD-97: původní IBAN (převod znak po znaku + int celého řetězce
++ format_iban) vs. výpočet po číselných polích se sloučeným formátováním.
+Spusť z kořene projektu: python benchmarks/bench_iban.py
+"""
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from libs import generator  # noqa: E402
+
+ROUNDS = 200_000
+ACCOUNT, PREFIX, BANK = '2000145399', '19', '0800'
+
+
+def legacy_generate_iban(account_number, prefix, bank_code, grouped):
+    """Původní implementace generate_iban + format_iban."""
+    basic = str(bank_code).zfill(4) + str(prefix).zfill(6) + str(account_number).zfill(10)
+    rearranged = basic + 'CZ00'
+    numeric_str = ''.join(str(ord(ch) - ord('A') + 10) if ch.isalpha() else ch for ch in rearranged)
+    iban = f'CZ{98 - (int(numeric_str) % 97):02d}{basic}'
+    if grouped:
+        return ' '.join(iban[i:i+4] for i in range(0, len(iban), 4))
+    return iban
+
+
+def legacy_iban_valid(iban):
+    iban = iban.replace(' ', '')
+    rearranged = iban[4:] + iban[:4]
+    return int(''.join(str(ord(ch) - ord('A') + 10) if ch.isalpha() else ch for ch in rearranged)) % 97 == 1
+
+
+def bench(label, legacy, current):
+    old = timeit.timeit(legacy, number=ROUNDS)
+    new = timeit.timeit(current, number=ROUNDS)
+    print(f'{label:<28} {old / ROUNDS * 1e6:>9.2f} µs {new / ROUNDS * 1e6:>9.2f} µs {old / new:>8.1f}x')
+
+
+def main():
+    assert legacy_generate_iban(ACCOUNT, PREFIX, BANK, True) == generator.generate_iban(ACCOUNT, PREFIX, BANK, True)
+    iban = generator.generate_iban(ACCOUNT, PREFIX, BANK)
+
+    print(f'{"":<28} {"původní":>12} {"nový":>12} {"zrychlení":>9}')
+    bench('generování (bez mezer)',
+          lambda: legacy_generate_iban(ACCOUNT, PREFIX, BANK, False),
+          lambda: generator.generate_iban(ACCOUNT, PREFIX, BANK))
+    bench('generování (skupiny po 4)',
+          lambda: legacy_generate_iban(ACCOUNT, PREFIX, BANK, True),
+          lambda: generator.generate_iban(ACCOUNT, PREFIX, BANK, True))
+    bench('kontrola MOD-97 (CZ)',
+          lambda: legacy_iban_valid(iban),
+          lambda: int(iban[2:4]) == generator.cz_iban_check_digits(int(iban[4:8]), int(iban[8:14]),
+                                                                   int(iban[14:24])))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,54 @@
+#!/usr/bin/env python3
+"""
+Režie metrik: Metrics.observe na požadavek (včetně amortizovaného flush do SQLite)
+a samotný flush dávky řad.
+Spusť z kořene projektu: python benchmarks/bench_metrics.py
+"""
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from libs.metrics import Metrics  # noqa: E402
+from libs.shared_store import SharedStore  # noqa: E402
+
+ROUNDS = 200_000
+TOOLS = ['formatter', 'yaml_json', 'csv_json', 'diff', 'hash', 'encoder', 'cron', 'bytes']
+ACTIONS = ['pretty', 'minify', 'get', 'post']
+
+
+def main():
+    with tempfile.TemporaryDirectory() as tmp:
+        store = SharedStore(os.path.join(tmp, 'metrics.db'))
+
+        # Bez flush — čistá cena zápisu do lokálních čítačů
+        m = Metrics(store, flush_interval=float('inf'))
+        labels = [(TOOLS[i % len(TOOLS)], ACTIONS[i % len(ACTIONS)], (i % 997) / 10_000) for i in range(ROUNDS)]
+        start = time.perf_counter()
+        for tool, action, seconds in labels:
+            m.observe(tool, action, seconds, 1234, False)
+        local = (time.perf_counter() - start) / ROUNDS
+
+        series = len(m._pending)
+        start = time.perf_counter()
+        m.flush()
+        flush = time.perf_counter() - start
+
+        # Flush při každém 1000. požadavku — horní odhad amortizované ceny sdíleného zápisu
+        m = Metrics(store, flush_interval=float('inf'))
+        start = time.perf_counter()
+        for i, (tool, action, seconds) in enumerate(labels):
+            m.observe(tool, action, seconds, 1234, False)
+            if i % 1000 == 999:
+                m.flush()
+        amortized = (time.perf_counter() - start) / ROUNDS
+
+    print(f'{"observe (lokálně)":<36} {local * 1e6:>8.2f} µs')
+    print(f'{"flush (" + str(series) + " čítačů)":<36} {flush * 1e3:>8.2f} ms')
+    print(f'{"observe + flush každých 1000":<36} {amortized * 1e6:>8.2f} µs')
+
+
+if __name__ == '__main__':
+    main()
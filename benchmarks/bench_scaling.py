@@ -0,0 +1,567 @@
+#!/usr/bin/env python3
+"""
+Škálovací benchmark veřejných funkcí libs/: čas a špičková paměť pro vstupy
+1 KB / 100 KB / 1 MB / 10 MB (oříznuto limitem dané funkce), odhad exponentu
+škálování (čas ~ velikost^k) a porovnání s uloženými baseline.
+
+Spusť z kořene projektu:
+    python benchmarks/bench_scaling.py                 # měření + kontrola proti baselines.json
+    python benchmarks/bench_scaling.py --update        # přepíše baseline
+    python benchmarks/bench_scaling.py --only diff --max-size 1MB
+
+Každý běh funkce se střídá s pevnou kalibrační zátěží a porovnává se medián
+poměru čas funkce / čas kalibrace — výkyvy rychlosti stroje (sdílené CPU, takt)
+se tak vykrátí. Zároveň se ukládá šum bodu (relativní medián absolutních odchylek
+poměrů). Skončí kódem 1, pokud je poměr nad baseline × max(--tolerance,
+1 + NOISE_FACTOR × šum) (+ TIMER_SLACK) i po opakovaném měření, nebo se exponent zhoršil o víc než
+EXPONENT_TOLERANCE. Baseline jsou závislé na stroji — po výměně stroje je
+přegeneruj s --update.
+
+Funkce, které se záměrně neměří, jsou v EXCLUDED i s důvodem.
+"""
+import argparse
+import base64
+import hashlib
+import hmac
+import html
+import io
+import json
+import math
+import os
+import random
+import statistics
+import sys
+import time
+import tracemalloc
+from collections import deque
+from datetime import datetime, timedelta, timezone
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from libs import (bytes_converter, compression, cron_parser, csv_json, diff_tool, encoding_converter,  # noqa: E402
+                  formatter, generator, hash_generator, jwt_decoder, result_cache, streaming, text_encoder,
+                  utilities, uuid_generator, validator, yaml_json)
+
+KB, MB = 1024, 1024 * 1024
+SIZES = [1 * KB, 100 * KB, 1 * MB, 10 * MB]
+BASELINE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'baselines.json')
+
+# Opakování jednoho měření: aspoň MIN_REPEATS běhů a MIN_TIME sekund; výsledek je medián
+# poměrů k CALIBRATION_ITEMS kalibrační zátěže změřené hned po každém běhu
+MIN_REPEATS = 7
+MIN_TIME = 0.5
+MAX_REPEATS = 100
+CALIBRATION_ITEMS = 1000
+
+# Regrese = poměr nad baseline × max(--tolerance, 1 + NOISE_FACTOR × šum) + TIMER_SLACK
+# (převedený na poměr ke kalibraci); šum je větší z relativních MAD baseline a aktuálního
+# běhu, TIMER_SLACK kryje jitter časovače u bodů pod milisekundu
+DEFAULT_TOLERANCE = 1.5
+NOISE_FACTOR = 5
+TIMER_SLACK = 50e-6
+
+# Exponent se počítá jen z bodů od této velikosti — u 1 KB převažuje konstantní režie
+FIT_FROM = 100 * KB
+EXPONENT_TOLERANCE = 0.3
+SUPERLINEAR = 1.3
+
+
+# ── generátory vstupů ────────────────────────────────────────────────────────
+
+def _fill(size, make_item, sep='\n', head='', tail=''):
+    """Skládá položky make_item(i), dokud se text vejde do size znaků."""
+    parts, total, i = [], len(head) + len(tail), 0
+    while True:
+        item = make_item(i)
+        if total + len(item) + len(sep) > size and parts:
+            break
+        parts.append(item)
+        total += len(item) + len(sep)
+        i += 1
+    return head + sep.join(parts) + tail
+
+
+def _record(i, rnd=random.Random(42)):
+    return {
+        'id': i,
+        'name': f'Uživatel {i}',
+        'email': f'user{i}@example.com',
+        'active': i % 3 != 0,
+        'score': round(rnd.random() * 1000, 2),
+        'tags': ['alfa', 'beta', 'gama'][: i % 3 + 1],
+        'address': {'city': 'Praha', 'zip': f'{11000 + i % 900}'},
+    }
+
+
+def json_doc(size):
+    return _fill(size, lambda i: json.dumps(_record(i), ensure_ascii=False), sep=',', head='[', tail=']')
+
+
+def flat_json_doc(size):
+    def item(i):
+        r = _record(i)
+        return json.dumps({k: v for k, v in r.items() if not isinstance(v, (dict, list))}, ensure_ascii=False)
+    return _fill(size, item, sep=',', head='[', tail=']')
+
+
+def xml_doc(size):
+    return _fill(size, lambda i: f'<item id="{i}"><name>Uživatel {i}</name><email>user{i}@example.com</email>'
+                                 f'<score>{i * 7 % 1000}</score></item>', sep='', head='<items>', tail='</items>')
+
+
+def csv_doc(size):
+    return _fill(size, lambda i: f'{i},Uživatel {i},user{i}@example.com,{i % 3 != 0},{i * 7 % 1000}',
+                 head='id,name,email,active,score\n')
+
+
+def yaml_doc(size):
+    return _fill(size, lambda i: f'- id: {i}\n  name: Uživatel {i}\n  email: user{i}@example.com\n'
+                                 f'  tags: [alfa, beta]\n  address:\n    city: Praha', sep='\n')
+
+
+def text_doc(size, rnd=None):
+    rnd = rnd or random.Random(7)
+    words = ['příliš', 'žluťoučký', 'kůň', 'úpěl', 'ďábelské', 'ódy', 'lorem', 'ipsum', 'dolor', 'sit', 'amet']
+    return _fill(size, lambda i: f'{i:06d} ' + ' '.join(rnd.choice(words) for _ in range(8)))
+
+
+def diff_pair(size):
+    a = text_doc(size)
+    lines = a.split('\n')
+    rnd = random.Random(3)
+    for i in range(0, len(lines), 20):
+        lines[i] = lines[i][::-1] if rnd.random() < 0.5 else lines[i] + ' změna'
+    b = '\n'.join(lines)
+    return a, b[:size]
+
+
+def ts_values(size):
+    base = 1_700_000_000
+    return _fill(size, lambda i: str(base + i * 37) if i % 2 else str((base + i * 37) * 1000)).split('\n')
+
+
+def dt_values(size):
+    start = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    return _fill(size, lambda i: (start + timedelta(seconds=i * 61)).strftime('%Y-%m-%d %H:%M:%S')).split('\n')
+
+
+def log_bytes(size):
+    start = datetime(2024, 3, 1, 8, 0, tzinfo=timezone.utc)
+    return _fill(size, lambda i: f'{(start + timedelta(seconds=i * 3)).isoformat()} INFO worker-{i % 4} '
+                                 f'request id={i} took {i % 97} ms').encode()
+
+
+def escaped_json(size):
+    return _fill(size, lambda i: f'{{\\"id\\": {i}, \\"text\\": \\"P\\u0159\\u00edli\\u0161 \\u017elu\\u0165ou\\u010dk\\u00fd\\"}}',
+                 sep='\\n')
+
+
+def html_text(size):
+    return _fill(size, lambda i: f'<p class="x">Řádek {i} & "uvozovky" <b>tučně</b></p>')
+
+
+def html_entities(size):
+    """Text s HTML entitami, který už po escapování má nejvýš size znaků."""
+    return _fill(size, lambda i: html.escape(f'<p class="x">Řádek {i} & "uvozovky" <b>tučně</b></p>'))
+
+
+def escapes_lines(size):
+    return _fill(size, lambda i: ''.join(f'\\u00{b:02x}' for b in (i * 2654435761 % 2 ** 32).to_bytes(4, 'big')))
+
+
+def number_lines(size):
+    return _fill(size, lambda i: f'{i * 37 % 100000}.{i % 100:02d}')
+
+
+def _take(rows, key, size, width):
+    """Hodnoty sloupce key z iterátoru generátoru — tolik, kolik se vejde do size znaků po width."""
+    return [row[key] for _, row in zip(range(max(1, size // width)), rows)]
+
+
+def accounts(size):
+    return _take(generator.bulk_account_numbers(size // 18 + 1, True, False, seed=1)[0], 'account', size, 18)
+
+
+def ibans(size):
+    return _take(generator.bulk_account_numbers(size // 25 + 1, False, True, '0800', seed=1)[0], 'iban', size, 25)
+
+
+def birth_numbers(size):
+    rows = generator.bulk_birth_numbers(size // 12 + 1, 'both', ['new_normal'], 'range', 18, 80, seed=1)[0]
+    return _take(rows, 'birth_number', size, 12)
+
+
+def uuids(size):
+    return _take(uuid_generator.bulk_generate('7', size // 37 + 1, seed=1)[0], 'uuid', size, 37)
+
+
+def accounts_csv(size):
+    return ('id,ucet\n' + ''.join(f'{i},{a}\n' for i, a in enumerate(accounts(size)))).encode()
+
+
+def _b64url(data):
+    return base64.urlsafe_b64encode(data).rstrip(b'=').decode()
+
+
+JWT_SECRET = 'bench-secret'
+
+
+def jwt_token(i):
+    header = _b64url(b'{"alg":"HS256","typ":"JWT"}')
+    payload = _b64url(json.dumps({'sub': f'user{i}', 'iss': 'bench', 'aud': 'dd-tools',
+                                  'iat': 1_700_000_000 + i, 'exp': 1_700_003_600 + i}).encode())
+    signature = hmac.new(JWT_SECRET.encode(), f'{header}.{payload}'.encode(), hashlib.sha256).digest()
+    return f'{header}.{payload}.{_b64url(signature)}'
+
+
+def jwt_log(size):
+    return _fill(size, lambda i: f'2024-03-01T08:00:{i % 60:02d}Z INFO auth ok token={jwt_token(i)}')
+
+
+def jwks(size):
+    return _fill(size, lambda i: json.dumps({'kty': 'oct', 'kid': f'k{i}', 'k': _b64url(f'tajemstvi-{i}'.encode())}),
+                 sep=',', head='{"keys": [', tail=']}')
+
+
+# ── případy ──────────────────────────────────────────────────────────────────
+
+def _consume(rows):
+    deque(rows, maxlen=0)
+
+
+def _checked(result):
+    """Ověří, že funkce vstup opravdu zpracovala (nevrátila chybu o limitu apod.)."""
+    if isinstance(result, tuple) and len(result) == 2 and isinstance(result[1], str):
+        raise RuntimeError(result[1])
+    if isinstance(result, dict) and result.get('error'):
+        raise RuntimeError(result['error'])
+    return result
+
+
+def _rows(result):
+    _consume(_checked(result)[0])
+
+
+def _each(fn):
+    """Funkce pro jednu hodnotu se měří na dávce hodnot (velikost = souhrnná délka vstupů)."""
+    def call(values):
+        for value in values:
+            _checked(fn(*value) if isinstance(value, tuple) else fn(value))
+    return call
+
+
+_JWT_KEYS = jwt_decoder.load_keys(JWT_SECRET)[0]
+
+# Veřejné funkce a třídy libs/, které tabulka CASES záměrně neměří
+EXCLUDED = {
+    'generator.make_rng':                        'jen vytvoří instanci Random — nezávisí na vstupu',
+    'generator.account_check_digit':             'měří se uvnitř generate_iban / bulk_account_numbers / validate_account',
+    'generator.iban_mod97':                      'měří se uvnitř validate_iban (ne-CZ IBAN)',
+    'generator.cz_iban_check_digits':            'měří se uvnitř generate_iban a validate_iban',
+    'generator.format_iban':                     'vloží mezery do jednoho IBAN',
+    'encoding.get_encodings':                    'vrací konstantní seznam',
+    'encoding.get_error_modes':                  'vrací konstantní seznam',
+    'encoding.generate_output_filename':         'úprava jednoho názvu souboru',
+    'encoding.check_params':                     'porovná tři parametry se seznamy',
+    'csv_json.check_delimiter':                  'kontrola jednoho znaku',
+    'utilities.sniff_format':                    'čte jen DT_SNIFF_SIZE vzorků — měří se v parse_datetimes',
+    'utilities.convert_timestamps_text':         'tenká obálka convert_timestamps nad splitlines (max 10 000 řádků)',
+    'utilities.parse_datetimes_text':            'tenká obálka parse_datetimes nad splitlines (max 10 000 řádků)',
+    'streaming.download_name':                   'skládá jeden název souboru',
+    'uuid.generate':                             'max 50 kusů — škálování měří bulk_generate',
+    'jwt.analyze_text':                          'tenká obálka analyze_file nad splitlines',
+    'compression.available':                     'vrací seznam dostupných kódování',
+    'compression.compressible':                  'porovnává jeden mimetype',
+    'compression.negotiate':                     'parsuje jednu hlavičku Accept-Encoding',
+    'result_cache.ResultCache':                  'LRU nad hotovými výsledky — cena je make_key + kopie bajtů',
+    'auth.get_user':                             'vyhledání v konstantním slovníku uživatelů',
+    'auth.verify_credentials':                   'jedno ověření hesla — záměrně pomalé, nezávisí na vstupu',
+    'jobs.execute':                              'spouští handlery nad csv_json / encoding / diff / hash, ty se měří přímo',
+    'jobs.run':                                  'smyčka workeru nad jobs.execute',
+    'profiler.collapse':                         'jen pro opt-in profilování; vzorky omezuje RING_SIZE profilů',
+    'profiler.flame_rows':                       'jen pro opt-in profilování; vzorky omezuje RING_SIZE profilů',
+    'metrics.Metrics':                           'režie na požadavek — měří benchmarks/bench_metrics.py',
+    'page_cache.PageCache':                      'slovník hotových stránek — nezávisí na vstupu nástroje',
+    'sandbox.Sandbox':                           'režie pipe a procesu, ne zpracování vstupu — limity hlídá sandbox sám',
+    'shared_store.SharedStore':                  'SQLite čítače a ring buffer — měří benchmarks/bench_metrics.py',
+}
+
+
+CASES = [
+    # (jméno, maximální velikost vstupu, příprava vstupu, volání)
+    ('formatter.format_json',            formatter.MAX_INPUT,          json_doc,      lambda d: _checked(formatter.format_json(d))),
+    ('formatter.format_json(sort_keys)', formatter.MAX_INPUT,          json_doc,      lambda d: _checked(formatter.format_json(d, sort_keys=True))),
+    ('formatter.minify_json',            formatter.MAX_INPUT,          json_doc,      lambda d: _checked(formatter.minify_json(d))),
+    ('formatter.format_xml',             formatter.MAX_INPUT,          xml_doc,       lambda d: _checked(formatter.format_xml(d))),
+    ('csv_json.csv_to_json',             csv_json.MAX_INPUT,           csv_doc,       lambda d: _checked(csv_json.csv_to_json(d))),
+    ('csv_json.json_to_csv',             csv_json.MAX_INPUT,           flat_json_doc, lambda d: _checked(csv_json.json_to_csv(d))),
+    ('yaml_json.yaml_to_json',           yaml_json.MAX_INPUT,          yaml_doc,      lambda d: _checked(yaml_json.yaml_to_json(d))),
+    ('yaml_json.json_to_yaml',           yaml_json.MAX_INPUT,          json_doc,      lambda d: _checked(yaml_json.json_to_yaml(d))),
+    ('diff_tool.compare',                diff_tool.MAX_INPUT,          diff_pair,     lambda d: _checked(diff_tool.compare(*d))),
+    ('hash_generator.compute_all',       hash_generator.MAX_INPUT,     text_doc,      lambda d: _checked(hash_generator.compute_all(d))),
+    ('text_encoder.encode(base64)',      text_encoder.MAX_INPUT,       text_doc,      lambda d: _checked(text_encoder.encode(d, 'base64'))),
+    ('text_encoder.encode(url)',         text_encoder.MAX_INPUT,       text_doc,      lambda d: _checked(text_encoder.encode(d, 'url'))),
+    ('text_encoder.decode(hex)',         text_encoder.MAX_INPUT,       lambda s: text_encoder.encode(text_doc(s // 4), 'hex')[0],
+                                                                                      lambda d: _checked(text_encoder.decode(d, 'hex'))),
+    # Velikost = přibližný objem výstupu (~20 B na spuštění / číslo)
+    ('cron_parser.next_runs',            1 * MB,                       lambda s: s // 20,
+                                                                                      lambda n: _checked(cron_parser.next_runs('* * * * *', n))),
+    ('cron_parser.describe',             cron_parser.MAX_INPUT,        lambda s: '*/5 9-17 1,15 1-6 1-5',
+                                                                                      lambda e: _checked(cron_parser.describe(e))),
+    ('generator.bulk_account_numbers',   10 * MB,                      lambda s: s // 20,
+                                                                                      lambda n: _rows(generator.bulk_account_numbers(n, True, False, '0800'))),
+    ('generator.bulk_birth_numbers',     10 * MB,                      lambda s: s // 12,
+                                                                                      lambda n: _rows(generator.bulk_birth_numbers(n, 'both', ['new_normal'], 'range', 18, 80))),
+    ('utilities.convert_timestamps',     10 * MB,                      ts_values,     lambda v: _rows(utilities.convert_timestamps(v, 'auto', 'Europe/Prague'))),
+    ('utilities.parse_datetimes',        10 * MB,                      dt_values,     lambda v: _rows(utilities.parse_datetimes(v, '', 'ms', 'Europe/Prague'))),
+    ('utilities.normalize_log',          10 * MB,                      log_bytes,     lambda b: _consume(_checked(utilities.normalize_log(io.BytesIO(b), 'utc'))[0])),
+    ('utilities.normalize_log(sort)',    10 * MB,                      log_bytes,     lambda b: _consume(_checked(utilities.normalize_log(io.BytesIO(b), 'utc', sort=True))[0])),
+    ('utilities.escape_stream(json)',    10 * MB,                      lambda s: escaped_json(s).encode(),
+                                                                                      lambda b: _consume(_checked(utilities.escape_stream(io.BytesIO(b), 'json_unescape'))[0])),
+    ('utilities.escape_stream(html)',    10 * MB,                      lambda s: html_text(s).encode(),
+                                                                                      lambda b: _consume(_checked(utilities.escape_stream(io.BytesIO(b), 'html_encode'))[0])),
+    ('utilities.unescape_json_string',   utilities.MAX_INPUT,          escaped_json,  lambda d: _checked(utilities.unescape_json_string(d))),
+    ('utilities.encode_html_entities',   utilities.MAX_INPUT,          html_text,     lambda d: _checked(utilities.encode_html_entities(d))),
+    ('bytes.batch_escapes_to_numbers',   100 * KB,                     escapes_lines, lambda d: _checked(bytes_converter.batch_escapes_to_numbers(d, '4', True, 'big', '100'))),
+    ('bytes.batch_numbers_to_escapes',   64 * KB,                      number_lines,  lambda d: _checked(bytes_converter.batch_numbers_to_escapes(d, '4', True, 'big', '100'))),
+    ('encoding.convert_content',         10 * MB,                      lambda s: text_doc(s).encode('windows-1250'),
+                                                                                      lambda b: _checked(encoding_converter.convert_content(b, 'windows-1250', 'utf-8'))),
+    ('encoding.convert_text',            10 * MB,                      text_doc,      lambda d: _checked(encoding_converter.convert_text(d, 'utf-8', 'utf-8'))),
+    ('diff_tool.to_text',                diff_tool.MAX_INPUT,          lambda s: diff_tool.compare(*diff_pair(s))[0],
+                                                                                      diff_tool.to_text),
+    ('hash_generator.compute_stream',    10 * MB,                      lambda s: text_doc(s).encode(),
+                                                                                      lambda b: hash_generator.compute_stream(io.BytesIO(b))),
+    ('cron_parser.build',                100 * KB,                     lambda s: [(f'*/{i % 59 + 1}', '9-17', '*', '1-6', '1-5') for i in range(s // 24)],
+                                                                                      _each(cron_parser.build)),
+    # Velikost = přibližný objem výstupu (~20 B na účet, ~12 B na rodné číslo)
+    ('generator.generate_account_numbers', generator.MAX_COUNT_ACCOUNTS * 20, lambda s: s // 20,
+                                                                                      lambda n: _checked(generator.generate_account_numbers(n, True, True, '0800'))),
+    ('generator.generate_birth_numbers', generator.MAX_COUNT_BIRTH_NUMBERS * 12, lambda s: s // 12,
+                                                                                      lambda n: _checked(generator.generate_birth_numbers(n, 'both', ['old', 'new_normal'], 'range', 18, 80))),
+    ('generator.generate_iban',          10 * MB,                      lambda s: [(2_000_145_399 + i, 19, '0800') for i in range(s // 24)],
+                                                                                      _each(generator.generate_iban)),
+    ('bytes.escapes_to_number',          1 * MB,                       lambda s: _fill(s, lambda i: ''.join(f'\\u00{b:02x}' for b in i.to_bytes(8, 'big'))).split('\n'),
+                                                                                      _each(bytes_converter.escapes_to_number)),
+    ('bytes.number_to_escapes',          1 * MB,                       lambda s: number_lines(s).split('\n'),
+                                                                                      _each(bytes_converter.number_to_escapes)),
+    ('utilities.timestamp_to_datetime',  1 * MB,                       lambda s: [(v, 'ms' if len(v) > 11 else 's') for v in ts_values(s)],
+                                                                                      _each(utilities.timestamp_to_datetime)),
+    ('utilities.datetime_to_timestamp',  1 * MB,                       dt_values,     _each(lambda d: utilities.datetime_to_timestamp(d, 's', 'Europe/Prague'))),
+    ('utilities.days_since_epoch',       1 * MB,                       lambda s: [v.replace('-', '/')[:10] for v in dt_values(s)],
+                                                                                      _each(utilities.days_since_epoch)),
+    ('utilities.convert_timestamps_file', 10 * MB,                     lambda s: '\n'.join(ts_values(s)).encode(),
+                                                                                      lambda b: _rows(utilities.convert_timestamps_file(io.BytesIO(b)))),
+    ('utilities.parse_datetimes_file',   10 * MB,                      lambda s: '\n'.join(dt_values(s)).encode(),
+                                                                                      lambda b: _rows(utilities.parse_datetimes_file(io.BytesIO(b)))),
+    ('utilities.unescape_unicode',       utilities.MAX_INPUT,          escaped_json,  lambda d: _checked(utilities.unescape_unicode(d))),
+    ('utilities.decode_html_entities',   utilities.MAX_INPUT,          html_entities, lambda d: _checked(utilities.decode_html_entities(d))),
+    ('validator.validate_account',       1 * MB,                       accounts,      _each(validator.validate_account)),
+    ('validator.validate_iban',          1 * MB,                       ibans,         _each(validator.validate_iban)),
+    ('validator.validate_birth_number',  1 * MB,                       birth_numbers, _each(validator.validate_birth_number)),
+    ('validator.validate_many',          10 * MB,                      accounts,      lambda v: validator.validate_many(v, 'account')),
+    ('validator.validate_text',          validator.MAX_LINES * 13,     lambda s: '\n'.join(accounts(s)),
+                                                                                      lambda d: _checked(validator.validate_text(d, 'account'))),
+    ('validator.validate_csv',           10 * MB,                      accounts_csv,  lambda b: _rows(validator.validate_csv(io.BytesIO(b), 'account', 'ucet'))),
+    ('uuid.bulk_generate(v4)',           10 * MB,                      lambda s: s // 37,
+                                                                                      lambda n: _rows(uuid_generator.bulk_generate('4', n, seed=1))),
+    ('uuid.bulk_generate(v7)',           10 * MB,                      lambda s: s // 37,
+                                                                                      lambda n: _rows(uuid_generator.bulk_generate('7', n))),
+    ('uuid.inspect_id',                  1 * MB,                       uuids,         _each(uuid_generator.inspect_id)),
+    ('uuid.inspect_text',                uuid_generator.MAX_INSPECT_LINES * 36, lambda s: '\n'.join(uuids(s)),
+                                                                                      lambda d: _checked(uuid_generator.inspect_text(d))),
+    ('uuid.inspect_file',                10 * MB,                      lambda s: '\n'.join(uuids(s)).encode(),
+                                                                                      lambda b: _consume(_checked(uuid_generator.inspect_file(io.BytesIO(b)))[0])),
+    ('jwt.parse_token',                  1 * MB,                       lambda s: [jwt_token(i) for i in range(s // 190)],
+                                                                                      _each(jwt_decoder.parse_token)),
+    ('jwt.decode',                       1 * MB,                       lambda s: [jwt_token(i) for i in range(s // 190)],
+                                                                                      _each(jwt_decoder.decode)),
+    ('jwt.load_keys',                    jwt_decoder.MAX_JWKS_INPUT,   jwks,          lambda j: _checked(jwt_decoder.load_keys('', j))),
+    # Tokeny se cachují podle obsahu — jwt_log má každý token jiný, měří se tedy skutečné ověření
+    ('jwt.decode_bulk_text',             jwt_decoder.MAX_BULK_TOKENS * 150, jwt_log,  lambda d: _checked(jwt_decoder.decode_bulk_text(d, _JWT_KEYS))),
+    ('jwt.decode_bulk_file',             10 * MB,                      lambda s: jwt_log(s).encode(),
+                                                                                      lambda b: _rows(jwt_decoder.decode_bulk_file(io.BytesIO(b), _JWT_KEYS))),
+    ('jwt.analyze_file',                 10 * MB,                      lambda s: jwt_log(s).encode(),
+                                                                                      lambda b: _checked(jwt_decoder.analyze_file(io.BytesIO(b)))),
+    ('streaming.stream_rows(csv)',       10 * MB,                      lambda s: [{'ucet': a, 'platne': True} for a in accounts(s)],
+                                                                                      lambda r: _consume(streaming.stream_rows(r, 'csv'))),
+    ('streaming.stream_rows(ndjson)',    10 * MB,                      lambda s: [{'ucet': a, 'platne': True} for a in accounts(s)],
+                                                                                      lambda r: _consume(streaming.stream_rows(r, 'ndjson'))),
+    ('streaming.stream_lines',           10 * MB,                      lambda s: text_doc(s).splitlines(keepends=True),
+                                                                                      lambda lines: _consume(streaming.stream_lines(lines))),
+    ('streaming.stream_text',            10 * MB,                      text_doc,      lambda d: _consume(streaming.stream_text(d))),
+    ('compression.compress(gzip)',       10 * MB,                      lambda s: json_doc(s).encode(),
+                                                                                      lambda b: compression.compress(b, 'gzip')),
+    ('compression.compress_chunks(gzip)', 10 * MB,                     lambda s: list(streaming.stream_text(text_doc(s))),
+                                                                                      lambda lines: _consume(compression.compress_chunks(iter(lines), 'gzip'))),
+    ('result_cache.make_key',            10 * MB,                      text_doc,      lambda d: result_cache.make_key('formatter', formatter.format_json, (d,), {})),
+]
+
+
+# ── měření ───────────────────────────────────────────────────────────────────
+
+def _calibrate():
+    """Pevná zátěž interpretu (slovník, json, třídění) — měřítko aktuální rychlosti stroje."""
+    d = {}
+    for i in range(CALIBRATION_ITEMS):
+        d[str(i)] = json.dumps([i, str(i) * 3])
+    return sorted(d.values())
+
+
+def _warm_allocator():
+    """
+    Alokuje a uvolní velký blok. glibc po uvolnění velkého bloku zvedne práh pro
+    mmap, takže další alokace o velikosti MB už se berou z haldy — bez toho by
+    rychlost funkcí s velkými výstupy záležela na tom, co běželo před nimi
+    (celý běh vs. --only).
+    """
+    block = bytearray(SIZES[-1] * 3)
+    del block
+
+
+def measure(call, data):
+    """
+    Vrátí (medián času v s, medián poměru ke kalibraci, relativní šum poměru,
+    medián času kalibrace v s, špičková alokace v B) pro call(data).
+    """
+    call(data)  # rozehřátí + kontrola chyb
+    times, calibration = [], []
+    while len(times) < MIN_REPEATS or (sum(times) < MIN_TIME and len(times) < MAX_REPEATS):
+        start = time.perf_counter()
+        call(data)
+        times.append(time.perf_counter() - start)
+        start = time.perf_counter()
+        _calibrate()
+        calibration.append(time.perf_counter() - start)
+    ratios = [t / c for t, c in zip(times, calibration)]
+    relative = statistics.median(ratios)
+    noise = statistics.median(abs(r - relative) for r in ratios) / relative if relative else 0.0
+    tracemalloc.start()
+    call(data)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return statistics.median(times), relative, noise, statistics.median(calibration), peak
+
+
+def allowed_ratio(tolerance, noise, reference_noise):
+    """Povolený poměr medián / baseline pro bod s daným šumem."""
+    return max(tolerance, 1 + NOISE_FACTOR * max(noise, reference_noise))
+
+
+def fit_exponent(points):
+    """Sklon log(čas) ~ log(velikost) metodou nejmenších čtverců; None pro < 2 body."""
+    points = [(s, t) for s, t in points if s >= FIT_FROM] or points
+    if len(points) < 2:
+        return None
+    xs = [math.log(s) for s, _ in points]
+    ys = [math.log(max(t, 1e-9)) for _, t in points]
+    mx, my = sum(xs) / len(xs), sum(ys) / len(ys)
+    var = sum((x - mx) ** 2 for x in xs)
+    return sum((x - mx) * (y - my) for x, y in zip(xs, ys)) / var if var else None
+
+
+def case_sizes(max_input, limit):
+    """Velikosti ze SIZES oříznuté limitem funkce (limit se přidá jako poslední bod)."""
+    sizes = [s for s in SIZES if s <= min(max_input, limit)]
+    if max_input < limit and max_input not in sizes and max_input > (sizes[-1] if sizes else 0):
+        sizes.append(max_input)
+    return sizes
+
+
+def _parse_size(text):
+    text = text.strip().upper()
+    for suffix, mult in (('MB', MB), ('KB', KB), ('B', 1)):
+        if text.endswith(suffix):
+            return int(float(text[:-len(suffix)]) * mult)
+    return int(text)
+
+
+def _fmt_size(size):
+    return f'{size // MB} MB' if size >= MB and size % MB == 0 else f'{size // KB} KB' if size >= KB else f'{size} B'
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--update', action='store_true', help='uložit výsledky jako nové baseline')
+    parser.add_argument('--only', default='', help='jen případy obsahující tento text')
+    parser.add_argument('--max-size', default='10MB', help='největší měřená velikost (např. 1MB)')
+    parser.add_argument('--tolerance', type=float, default=DEFAULT_TOLERANCE,
+                        help='nejmenší povolený násobek času proti baseline (u hlučných bodů se zvětší podle šumu)')
+    args = parser.parse_args()
+
+    limit = _parse_size(args.max_size)
+    baselines = {}
+    if os.path.exists(BASELINE_PATH):
+        with open(BASELINE_PATH, encoding='utf-8') as f:
+            baselines = json.load(f)
+
+    _warm_allocator()
+    results, failures = {}, []
+    print(f'{"funkce":<36} {"vstup":>8} {"čas [ms]":>10} {"šum":>6} {"MB/s":>8} {"paměť [MB]":>11} {"baseline":>10}')
+    for name, max_input, prepare, call in CASES:
+        if args.only not in name:
+            continue
+        base = baselines.get(name, {})
+        points, entry = [], {'seconds': {}, 'relative': {}, 'noise': {}, 'peak_bytes': {}}
+        for size in case_sizes(max_input, limit):
+            data = prepare(size)
+            reference = base.get('relative', {}).get(str(size))
+            base_noise = base.get('noise', {}).get(str(size), 0.0)
+            try:
+                seconds, relative, noise, calibration, peak = measure(call, data)
+                allowed = allowed_ratio(args.tolerance, noise, base_noise)
+                if reference and relative > reference * allowed + TIMER_SLACK / calibration:
+                    # Překročení se potvrdí druhým měřením — jednorázový výkyv
+                    # stroje se nezopakuje, skutečná regrese ano
+                    retry = measure(call, data)
+                    if retry[1] < relative:
+                        seconds, relative, noise, calibration, peak = retry
+                        allowed = allowed_ratio(args.tolerance, noise, base_noise)
+            except Exception as e:
+                print(f'{name:<36} {_fmt_size(size):>8}  CHYBA: {e}')
+                failures.append(f'{name} @ {_fmt_size(size)}: {e}')
+                break
+            points.append((size, relative))
+            entry['seconds'][str(size)] = seconds
+            entry['relative'][str(size)] = relative
+            entry['noise'][str(size)] = noise
+            entry['peak_bytes'][str(size)] = peak
+            mark = ''
+            if reference:
+                ratio = relative / reference
+                mark = f'{ratio:>9.2f}x'
+                if relative > reference * allowed + TIMER_SLACK / calibration:
+                    mark += ' !'
+                    failures.append(f'{name} @ {_fmt_size(size)}: {ratio:.2f}× baseline (povoleno {allowed:.2f}×)')
+            print(f'{name:<36} {_fmt_size(size):>8} {seconds * 1000:>10.2f} {noise:>6.1%} '
+                  f'{size / MB / seconds:>8.1f} {peak / MB:>11.2f} {mark:>10}')
+
+        exponent = fit_exponent(points)
+        entry['exponent'] = exponent
+        results[name] = entry
+        if exponent is not None:
+            note = '  ← superlineární' if exponent > SUPERLINEAR else ''
+            reference = base.get('exponent')
+            if reference is not None and exponent > reference + EXPONENT_TOLERANCE:
+                note += f'  ← exponent vzrostl z {reference:.2f}'
+                failures.append(f'{name}: exponent {exponent:.2f} (baseline {reference:.2f})')
+            print(f'{"":<36} {"k =":>8} {exponent:>10.2f}{note}')
+
+    if args.update:
+        baselines.update(results)
+        with open(BASELINE_PATH, 'w', encoding='utf-8') as f:
+            json.dump(baselines, f, indent=2, ensure_ascii=False, sort_keys=True)
+            f.write('\n')
+        print(f'\nBaseline uloženy do {os.path.relpath(BASELINE_PATH, ROOT)}')
+        return 0
+
+    if failures:
+        print('\nRegrese:')
+        for failure in failures:
+            print(f'  - {failure}')
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+Benchmark studeného startu: import app (moduly nástrojů líně) vs. import app + všech
+modulů nástrojů (dřívější chování), plus přehled nejdražších importů z -X importtime
+a kontrola, které moduly libs/* se načtou už při importu app.
+Spusť z kořene projektu: python benchmarks/bench_startup.py
+"""
+import os
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+ROUNDS = 15
+TOP = 15
+
+TOOL_MODULES = ['encoding_converter', 'bytes_converter', 'text_encoder', 'jwt_decoder', 'hash_generator',
+                'cron_parser', 'formatter', 'utilities', 'diff_tool', 'csv_json', 'uuid_generator', 'yaml_json',
+                'generator', 'streaming', 'validator']
+
+# Moduly libs/*, které import app smí načíst hned; cache výsledků, sandbox, fronta úloh, metriky,
+# profiler i komprese se načítají až v hooku nebo route, která je potřebuje.
+#   auth        — user_loader přihlášení
+#   page_cache  — dekorátor cached_page u route
+#   shared_store — jen s výchozím úložištěm limiteru sqlite://, Flask-Limiter ho otevírá už při inicializaci
+# difflib a zlib při startu načítá werkzeug/flask, ne libs/*.
+EAGER_LIBS = {'libs.auth', 'libs.page_cache'}
+STORAGES = [
+    ('memory://', EAGER_LIBS),
+    ('sqlite:///tmp/dd-tools-uploads/shared.db', EAGER_LIBS | {'libs.shared_store'}),  # výchozí v app.py
+]
+
+LAZY = 'import app'
+EAGER = 'import app, importlib; [importlib.import_module("libs." + m) for m in %r]' % TOOL_MODULES
+
+
+def _env(**overrides):
+    env = dict(os.environ)
+    env.setdefault('SECRET_KEY', 'benchmark')
+    env.setdefault('RATELIMIT_STORAGE_URI', 'memory://')
+    env.update(overrides)
+    return env
+
+
+def _run(code):
+    timer = 'import time; t = time.perf_counter(); %s; print(time.perf_counter() - t)'
+    out = subprocess.run([sys.executable, '-c', timer % code], cwd=ROOT, env=_env(),
+                         capture_output=True, text=True, check=True).stdout
+    return float(out)
+
+
+def cold_start(*codes):
+    """
+    Nejkratší čas (s) procesu, který jen provede code, pro každou variantu.
+    Varianty se střídají, aby je šum stroje zatížil stejně; minimum je stabilnější než medián.
+    """
+    times = [[] for _ in codes]
+    for _ in range(ROUNDS):
+        for bucket, code in zip(times, codes):
+            bucket.append(_run(code))
+    return [min(bucket) for bucket in times]
+
+
+def import_profile(code):
+    """Vrátí [(kumulativní µs, modul)] z -X importtime, seřazené sestupně."""
+    err = subprocess.run([sys.executable, '-X', 'importtime', '-c', code], cwd=ROOT, env=_env(),
+                         capture_output=True, text=True, check=True).stderr
+    rows = []
+    for line in err.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, cumulative, name = line[len('import time:'):].split('|')
+        rows.append((int(cumulative), name.strip()))
+    return sorted(rows, reverse=True)
+
+
+def loaded_libs(storage_uri):
+    """Množina modulů libs.* načtených po samotném import app s daným úložištěm limiteru."""
+    code = 'import sys, app; print(" ".join(m for m in sys.modules if m.startswith("libs.")))'
+    out = subprocess.run([sys.executable, '-c', code], cwd=ROOT, env=_env(RATELIMIT_STORAGE_URI=storage_uri),
+                         capture_output=True, text=True, check=True).stdout
+    return set(out.split())
+
+
+def main():
+    lazy, eager = cold_start(LAZY, EAGER)
+    print(f'{"varianta":<28} {"import [ms]":>12}')
+    print(f'{"líně (import app)":<28} {lazy * 1000:>12.1f}')
+    print(f'{"vše předem":<28} {eager * 1000:>12.1f}')
+    print(f'{"úspora":<28} {(eager - lazy) * 1000:>12.1f}')
+
+    print('\nNejdražší importy při líném startu (kumulativně, -X importtime):')
+    for cumulative, name in import_profile(LAZY)[:TOP]:
+        print(f'{cumulative / 1000:>10.1f} ms  {name}')
+
+    print('\nModuly libs/* načtené při importu app:')
+    unexpected = False
+    for storage_uri, allowed in STORAGES:
+        loaded = loaded_libs(storage_uri)
+        extra = loaded - allowed
+        unexpected |= bool(extra)
+        print(f'  {storage_uri.split("//")[0]:<8} {", ".join(sorted(loaded))}'
+              + (f'  — navíc: {", ".join(sorted(extra))}' if extra else ''))
+    return 1 if unexpected else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -1 +1,32 @@
 # DD Tools Libraries
+
+import importlib
+
+
+class LazyModule:
+    """
+    Zástupce modulu libs.<name>: skutečný import (i s yaml, zoneinfo, difflib…) proběhne
+    až při prvním přístupu k atributu, takže worker startuje jen s tím, co opravdu použije.
+    """
+
+    __slots__ = ('_name', '_module')
+
+    def __init__(self, name):
+        self._name = name
+        self._module = None
+
+    def __getattr__(self, attr):
+        module = self._module
+        if module is None:
+            # import_module drží importní zámek — souběžná vlákna modul nespustí dvakrát
+            module = self._module = importlib.import_module(f'{__name__}.{self._name}')
+        return getattr(module, attr)
+
+    def __repr__(self):
+        state = 'načten' if self._module is not None else 'nenačten'
+        return f'<LazyModule libs.{self._name} ({state})>'
+
+
+def lazy_modules(*names):
+    """Vrátí LazyModule pro každé jméno (pořadí zachováno)."""
+    return [LazyModule(name) for name in names]
@@ -3,7 +3,7 @@ Knihovna pro převod Unicode escape sekvencí na čísla a zpět
 """
 
 import re
-import struct
+from decimal import Context, Decimal, Inexact, InvalidOperation, Overflow
 
 MAX_INPUT = 10_000
 
@@ -35,10 +35,13 @@ def escapes_to_number(text, divisor=1, byteorder='big'):
     for b in bytes_list:
         value = (value << 8) | b
 
-    if divisor and divisor != 0:
-        result = value / divisor
-    else:
-        result = float(value)
+    try:
+        if divisor and divisor != 0:
+            result = value / divisor
+        else:
+            result = float(value)
+    except OverflowError:
+        return None, 'Číslo je příliš velké pro desetinný výsledek — použij hromadný převod (přesná čísla)'
 
     return result, None
 
@@ -60,6 +63,8 @@ def number_to_escapes(value, divisor=1, byteorder='big'):
         int_val = round(float(value) * divisor)
     except (ValueError, TypeError):
         return None, "Neplatná číselná hodnota"
+    except OverflowError:
+        return None, "Hodnota je příliš velká"
 
     # Automatická detekce počtu bajtů
     byte_count = max(1, (int_val.bit_length() + 7) // 8)
@@ -75,3 +80,182 @@ def number_to_escapes(value, divisor=1, byteorder='big'):
 
     result = ''.join(f'\\u{b:04x}' for b in bytes_list)
     return result, None
+
+
+# ══════════════════════════════════════════════════════════════════════════════
+# Hromadný převod (přesná celá čísla / Decimal)
+# ══════════════════════════════════════════════════════════════════════════════
+
+MAX_BATCH_INPUT = 1_000_000
+MAX_BATCH_LINES = 10_000
+
+WIDTHS = [('auto', 'Automaticky')] + [(str(n), f'{n} B') for n in (1, 2, 4, 8, 16)]
+
+BATCH_FIELDS = ['line', 'field', 'escapes', 'value', 'error']
+
+# Z každé \uXXXX sekvence se bere nižší bajt (stejně jako escapes_to_number)
+_LOW_BYTE_RE = re.compile(r'\\u[0-9a-fA-F]{2}([0-9a-fA-F]{2})')
+
+# Nejširší číslo (pevná šířka i automatická) — delší vstup se odmítne dřív, než se z něj staví int
+MAX_WIDTH = 64
+
+# Dělitel posouvá desetinnou čárku nejvýš o tolik míst
+MAX_DIVISOR_EXPONENT = 64
+
+# Přesnost Decimal pro 64bajtová čísla (155 číslic) i s dělitelem
+_DECIMAL_CONTEXT = Context(prec=200)
+
+# Násobení dělitelem: ztráta nenulových číslic (Inexact) znamená, že výsledek není celý
+_EXACT_CONTEXT = Context(prec=200, traps=[InvalidOperation, Inexact])
+
+
+def _parse_width(width):
+    if width in ('auto', '', None):
+        return None
+    width = int(width)
+    if not 1 <= width <= MAX_WIDTH:
+        raise ValueError(f'Šířka musí být 1–{MAX_WIDTH} bajtů')
+    return width
+
+
+def _parse_divisor(divisor):
+    try:
+        divisor = Decimal(str(divisor).strip() or '1')
+    except InvalidOperation:
+        raise ValueError('Neplatný dělitel')
+    if not divisor.is_finite() or divisor <= 0:
+        raise ValueError('Dělitel musí být kladné číslo')
+    if abs(divisor.adjusted()) > MAX_DIVISOR_EXPONENT:
+        raise ValueError(f'Dělitel musí být v rozsahu 1e-{MAX_DIVISOR_EXPONENT} až 1e{MAX_DIVISOR_EXPONENT}')
+    return divisor
+
+
+def _scale(value, divisor):
+    """
+    Vydělí celé číslo dělitelem přesně, vždy bez exponentu. Mocnina 10 jen posune
+    desetinnou čárku na počet míst dělitele (12.00, ne 12; 0.0000005, ne 5E-7).
+    """
+    if divisor == 1:
+        return str(value)
+    if divisor.normalize(_DECIMAL_CONTEXT).as_tuple().digits == (1,):
+        return format(Decimal(value).scaleb(-divisor.adjusted(), _DECIMAL_CONTEXT), 'f')
+    # Nedělitelný výsledek (např. /3) se zaokrouhlí na 20 platných číslic za celou částí
+    return format(Context(prec=len(str(abs(value))) + 20).divide(Decimal(value), divisor), 'f')
+
+
+def _escapes(data):
+    h = data.hex()
+    return ''.join(['\\u00' + h[i:i + 2] for i in range(0, len(h), 2)])
+
+
+def batch_escapes_to_numbers(text, width='auto', signed=False, byteorder='big', divisor='1'):
+    """
+    Převede řádky s \\uXXXX sekvencemi na přesná čísla (int.from_bytes, bez float).
+
+    S pevnou šířkou se bajty řádku rozdělí na pole po width bajtech (zabalené záznamy
+    z dumpu → více hodnot na řádek); bez ní je celý řádek jedno číslo.
+    Vrátí (list dictů s klíči BATCH_FIELDS, error).
+    """
+    if len(text) > MAX_BATCH_INPUT:
+        return None, 'Vstup je příliš velký (max 1 MB)'
+    try:
+        width = _parse_width(width)
+        divisor = _parse_divisor(divisor)
+    except ValueError as e:
+        return None, str(e)
+    byteorder = 'little' if byteorder == 'little' else 'big'
+
+    lines = [(n, line) for n, line in enumerate(text.splitlines(), 1) if line.strip()]
+    if not lines:
+        return None, 'Zadej alespoň jednu hodnotu.'
+    if len(lines) > MAX_BATCH_LINES:
+        return None, f'Příliš mnoho řádků (max {MAX_BATCH_LINES:,}).'.replace(',', ' ')
+
+    rows = []
+    for n, line in lines:
+        data = bytes.fromhex(''.join(_LOW_BYTE_RE.findall(line)))
+        if not data:
+            rows.append({'line': n, 'field': 1, 'escapes': line.strip(), 'value': '',
+                         'error': 'Nenalezeny žádné \\uXXXX sekvence'})
+            continue
+        if not width and len(data) > MAX_WIDTH:
+            rows.append({'line': n, 'field': 1, 'escapes': line.strip(), 'value': '',
+                         'error': f'Číslo je delší než {MAX_WIDTH} B — zvol pevnou šířku'})
+            continue
+        step = width or len(data)
+        for field, start in enumerate(range(0, len(data), step), 1):
+            chunk = data[start:start + step]
+            row = {'line': n, 'field': field, 'escapes': _escapes(chunk), 'value': '', 'error': ''}
+            if len(chunk) != step:
+                row['error'] = f'Neúplné pole: {len(chunk)} z {step} B'
+            else:
+                row['value'] = _scale(int.from_bytes(chunk, byteorder, signed=signed), divisor)
+            rows.append(row)
+    return rows, None
+
+
+def batch_numbers_to_escapes(text, width='auto', signed=False, byteorder='big', divisor='1'):
+    """
+    Převede řádky s čísly na \\uXXXX sekvence. Hodnota se přesně vynásobí dělitelem
+    (Decimal) a musí vyjít celá. Bez pevné šířky se použije nejmenší počet bajtů,
+    nejvýš MAX_WIDTH. Příliš velké číslo se odmítne podle exponentu ještě před
+    převodem na int.
+    Vrátí (list dictů s klíči BATCH_FIELDS, error).
+    """
+    if len(text) > MAX_BATCH_INPUT:
+        return None, 'Vstup je příliš velký (max 1 MB)'
+    try:
+        width = _parse_width(width)
+        divisor = _parse_divisor(divisor)
+    except ValueError as e:
+        return None, str(e)
+    byteorder = 'little' if byteorder == 'little' else 'big'
+
+    lines = [(n, line.strip()) for n, line in enumerate(text.splitlines(), 1) if line.strip()]
+    if not lines:
+        return None, 'Zadej alespoň jednu hodnotu.'
+    if len(lines) > MAX_BATCH_LINES:
+        return None, f'Příliš mnoho řádků (max {MAX_BATCH_LINES:,}).'.replace(',', ' ')
+
+    limit = width or MAX_WIDTH
+    max_digits = len(str(256 ** limit))
+    rows = []
+    for n, line in lines:
+        row = {'line': n, 'field': 1, 'escapes': '', 'value': line, 'error': ''}
+        rows.append(row)
+        try:
+            number = Decimal(line.replace(' ', '').replace(',', '.'))
+        except InvalidOperation:
+            row['error'] = 'Neplatné číslo'
+            continue
+        if not number.is_finite():
+            row['error'] = 'Po vynásobení dělitelem nevychází celé číslo'
+            continue
+        # Součin má aspoň adjusted() + adjusted() + 1 číslic — nic takového se do limitu nevejde
+        if number and number.adjusted() + divisor.adjusted() >= max_digits:
+            row['error'] = f'Hodnota se nevejde do {limit} B'
+            continue
+        try:
+            scaled = _EXACT_CONTEXT.multiply(number, divisor)
+        except Overflow:
+            row['error'] = f'Hodnota se nevejde do {limit} B'
+            continue
+        except (Inexact, InvalidOperation):
+            row['error'] = 'Po vynásobení dělitelem nevychází celé číslo'
+            continue
+        if scaled != scaled.to_integral_value():
+            row['error'] = 'Po vynásobení dělitelem nevychází celé číslo'
+            continue
+        value = int(scaled)
+        if value < 0 and not signed:
+            row['error'] = 'Záporné číslo vyžaduje znaménkový režim'
+            continue
+        size = width or max(1, (value.bit_length() + (8 if signed else 7)) // 8)
+        if size > limit:
+            row['error'] = f'Hodnota se nevejde do {limit} B'
+            continue
+        try:
+            row['escapes'] = _escapes(value.to_bytes(size, byteorder, signed=signed))
+        except OverflowError:
+            row['error'] = f'Hodnota se nevejde do {limit} B'
+    return rows, None
@@ -180,7 +180,7 @@ def next_runs(expression, count=5):
 
         return runs, None
 
-    except Exception as e:
+    except ValueError as e:
         return None, f'Chyba: {str(e)}'
 
 
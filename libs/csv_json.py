@@ -9,29 +9,42 @@ import io
 MAX_INPUT = 1_000_000
 
 
-def csv_to_json(text, delimiter=','):
-    if len(text) > MAX_INPUT:
-        return None, 'Vstup je příliš velký (max 1 MB)'
+def check_delimiter(delimiter):
+    """Chyba v oddělovači (musí být jeden znak), nebo None."""
+    if not isinstance(delimiter, str) or len(delimiter) != 1:
+        return 'Oddělovač musí být jeden znak'
+    return None
+
+
+def csv_to_json(text, delimiter=',', max_input=MAX_INPUT):
+    if len(text) > max_input:
+        return None, f'Vstup je příliš velký (max {max_input // 1_000_000} MB)'
+    error = check_delimiter(delimiter)
+    if error:
+        return None, error
     try:
         reader = csv.DictReader(io.StringIO(text), delimiter=delimiter)
         rows = list(reader)
         if not rows:
             return None, 'CSV neobsahuje žádná data'
         return json.dumps(rows, indent=2, ensure_ascii=False), None
-    except Exception as e:
+    except (csv.Error, TypeError, ValueError) as e:
         return None, str(e)
 
 
-def json_to_csv(text, delimiter=','):
-    if len(text) > MAX_INPUT:
-        return None, 'Vstup je příliš velký (max 1 MB)'
+def json_to_csv(text, delimiter=',', max_input=MAX_INPUT):
+    if len(text) > max_input:
+        return None, f'Vstup je příliš velký (max {max_input // 1_000_000} MB)'
+    error = check_delimiter(delimiter)
+    if error:
+        return None, error
     try:
         data = json.loads(text)
         if not isinstance(data, list):
             return None, 'JSON musí být pole objektů [ {...}, {...} ]'
         if not data:
             return '', None
-        if not isinstance(data[0], dict):
+        if not all(isinstance(row, dict) for row in data):
             return None, 'JSON musí být pole objektů [ {...}, {...} ]'
 
         output = io.StringIO()
@@ -46,5 +59,5 @@ def json_to_csv(text, delimiter=','):
         return output.getvalue(), None
     except json.JSONDecodeError as e:
         return None, f'Chyba JSON: {e}'
-    except Exception as e:
+    except (csv.Error, TypeError, ValueError, RecursionError) as e:
         return None, str(e)
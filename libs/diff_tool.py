@@ -7,15 +7,18 @@ import difflib
 MAX_INPUT = 500_000
 
 
-def compare(text1, text2):
+def compare(text1, text2, max_input=MAX_INPUT):
     """
     Porovná dva texty a vrátí seznam řádků s typem změny.
 
+    Args:
+        max_input: Strop délky každého textu (úlohy na pozadí mají vyšší)
+
     Returns:
         tuple: (list of dicts, identical: bool)
     """
-    if len(text1) > MAX_INPUT or len(text2) > MAX_INPUT:
-        return None, 'Vstup je příliš velký (max 500 KB na text)'
+    if len(text1) > max_input or len(text2) > max_input:
+        return None, f'Vstup je příliš velký (max {max_input // 1000} KB na text)'
     lines1 = text1.splitlines()
     lines2 = text2.splitlines()
 
@@ -42,3 +45,11 @@ def compare(text1, text2):
             result.append({'type': 'context', 'text': line[1:] if line.startswith(' ') else line})
 
     return result, False
+
+
+_PREFIXES = {'header': '', 'hunk': '', 'add': '+', 'remove': '-', 'context': ' '}
+
+
+def to_text(lines):
+    """Složí řádky z compare() zpět do unified diff textu (pro stažení jako .diff)."""
+    return ''.join(f'{_PREFIXES[line["type"]]}{line["text"]}\n' for line in lines)
@@ -28,6 +28,18 @@ def get_error_modes():
     return ERROR_MODES
 
 
+def check_params(source_encoding, target_encoding, error_mode):
+    """Chyba v parametrech převodu (kódování mimo ENCODINGS, neznámý režim), nebo None."""
+    encodings = dict(ENCODINGS)
+    if source_encoding not in encodings:
+        return 'Neplatné zdrojové kódování'
+    if target_encoding not in encodings:
+        return 'Neplatné cílové kódování'
+    if error_mode not in dict(ERROR_MODES):
+        return 'Neplatný režim pro nepřevoditelné znaky'
+    return None
+
+
 def convert_content(content, source_encoding, target_encoding, error_mode='replace'):
     """
     Převede textový obsah mezi kódováními
@@ -41,6 +53,9 @@ def convert_content(content, source_encoding, target_encoding, error_mode='repla
     Returns:
         tuple: (převedený obsah v bytes, chybová zpráva nebo None)
     """
+    error = check_params(source_encoding, target_encoding, error_mode)
+    if error:
+        return None, error
     try:
         # Dekóduj ze zdrojového kódování
         text = content.decode(source_encoding)
@@ -54,7 +69,7 @@ def convert_content(content, source_encoding, target_encoding, error_mode='repla
         return None, f"Chyba při dekódování: Zdrojové kódování '{source_encoding}' pravděpodobně není správné."
     except UnicodeEncodeError as e:
         return None, f"Chyba při enkódování: Některé znaky nelze převést do '{target_encoding}'."
-    except Exception as e:
+    except LookupError as e:
         return None, f"Neočekávaná chyba: {str(e)}"
 
 
@@ -63,6 +78,9 @@ def convert_text(text, source_encoding, target_encoding, error_mode='replace'):
     Převede text zadaný jako řetězec mezi kódováními.
     Vrací (výsledný řetězec, chybová zpráva nebo None).
     """
+    error = check_params(source_encoding, target_encoding, error_mode)
+    if error:
+        return None, error
     try:
         encoded = text.encode(source_encoding, errors=error_mode)
         result = encoded.decode(target_encoding, errors=error_mode)
@@ -71,7 +89,7 @@ def convert_text(text, source_encoding, target_encoding, error_mode='replace'):
         return None, f"Chyba při enkódování: Zdrojové kódování '{source_encoding}' neodpovídá vstupnímu textu."
     except UnicodeDecodeError:
         return None, f"Chyba při dekódování: Výsledek nelze interpretovat jako '{target_encoding}'."
-    except Exception as e:
+    except LookupError as e:
         return None, f"Neočekávaná chyba: {str(e)}"
 
 
@@ -7,6 +7,17 @@ import random
 from datetime import date, timedelta
 
 
+def make_rng(seed=None):
+    """
+    Vytvoří vlastní instanci random.Random pro jeden požadavek — souběžné požadavky
+    nesdílí stav globálního modulu random. Se zadaným seed (int nebo libovolný
+    řetězec) je výstup reprodukovatelný; prázdný seed znamená náhodný.
+    """
+    if seed is None or seed == '':
+        return random.Random()
+    return random.Random(seed)
+
+
 # ══════════════════════════════════════════════════════════════════════════════
 # Čísla účtů
 # ══════════════════════════════════════════════════════════════════════════════
@@ -14,37 +25,90 @@ from datetime import date, timedelta
 # Váhy dle ČNB pro mod-11 kontrolu (pozice 1–10 zleva)
 _ACCOUNT_WEIGHTS = [6, 3, 7, 9, 10, 5, 8, 4, 2, 1]
 
+# Limity počtu: HTML výstup vs. hromadné stažení (na variantu)
+MAX_COUNT_ACCOUNTS = 100
+MAX_COUNT_BIRTH_NUMBERS = 200
+BULK_MAX_COUNT = 1_000_000
+
+
+# Váhové součty mod 11 pro trojice číslic 000–999 na pozicích 1–3, 4–6 a 7–9
+# (bez kontrolní číslice). Součet tří vyhledání nahradí skalární součin po číslicích.
+_ACCOUNT_CHUNK_SUMS = [
+    [sum(int(d) * w for d, w in zip(f'{x:03d}', _ACCOUNT_WEIGHTS[i:i + 3])) % 11 for x in range(1000)]
+    for i in (0, 3, 6)
+]
+
+_ACCOUNT_BATCH_SIZE = 10_000
+
 
-def _generate_account_part(min_len, max_len):
+def _generate_account_parts(n, min_len, max_len, rng):
     """
-    Vygeneruje číslo (prefix nebo číslo účtu) validní dle mod-11.
-    Číslo nemá úvodní nuly a je nenulové.
+    Vygeneruje n čísel (prefixů nebo čísel účtů) validních dle mod-11.
+    Čísla nemají úvodní nuly a jsou nenulová.
+
+    Jedno getrandbits(64) na číslo určí délku i číslice bez kontrolní; kontrolní
+    číslice se dopočítá z tabulek _ACCOUNT_CHUNK_SUMS. Kandidáti se zbytkem 10
+    se zahodí a dávka se doplní — rozdělení zůstává rovnoměrné.
     """
-    for _ in range(500):
-        length = random.randint(min_len, max_len)
-        # První číslice nesmí být 0; dále (length-2) náhodných číslic
-        digits = [random.randint(1, 9)] + [random.randint(0, 9) for _ in range(length - 2)]
-        # Zarovnáme na 9 číslic (bez poslední) pro výpočet váhového součtu
-        padded = [0] * (9 - len(digits)) + digits
-        current_sum = sum(d * w for d, w in zip(padded, _ACCOUNT_WEIGHTS[:9]))
-        # Poslední číslice má váhu _ACCOUNT_WEIGHTS[9] = 1, takže:
-        last = (-current_sum) % 11
-        if last <= 9:
-            digits.append(last)
-            return ''.join(str(d) for d in digits)
-    return None
+    # Pro délku L: (L-1) číslic bez kontrolní, první nenulová → rozsah <10^(L-2), 10^(L-1))
+    ranges = [(10 ** (length - 2), 9 * 10 ** (length - 2)) for length in range(min_len, max_len + 1)]
+    n_ranges = len(ranges)
+    hi_sums, mid_sums, lo_sums = _ACCOUNT_CHUNK_SUMS
+    getrandbits = rng.getrandbits
+
+    parts = []
+    while len(parts) < n:
+        for _ in range(n - len(parts)):
+            r = getrandbits(64)
+            low, span = ranges[r % n_ranges]
+            body = low + (r >> 8) % span
+            last = -(hi_sums[body // 1_000_000] + mid_sums[body // 1000 % 1000] + lo_sums[body % 1000]) % 11
+            if last <= 9:
+                parts.append(str(body * 10 + last))
+    return parts
+
+
+def account_check_digit(body):
+    """
+    Vrátí kontrolní číslici (0–10) pro číslo bez poslední číslice (max 9 číslic).
+    Hodnota 10 znamená, že s tímto začátkem žádné platné číslo neexistuje.
+    """
+    hi_sums, mid_sums, lo_sums = _ACCOUNT_CHUNK_SUMS
+    return -(hi_sums[body // 1_000_000] + mid_sums[body // 1000 % 1000] + lo_sums[body % 1000]) % 11
+
+
+# Písmena IBAN → číslice (A=10 … Z=35)
+_IBAN_LETTERS = str.maketrans({chr(ord('A') + i): str(10 + i) for i in range(26)})
+
+# MOD-97 (ISO 7064 MOD 97-10) se počítá po blocích číslic: zbytek se vynásobí 10^délka bloku
+# mod 97 (předpočítané) a přičte se blok — žádné dlouhé celé číslo se nesestavuje
+_MOD97_CHUNK = 9
+_POW10_MOD97 = [pow(10, n, 97) for n in range(11)]
 
+# Zbytek přesunutého 'CZ00' (→ 123500) je pro CZ IBAN konstanta
+_MOD97_CZ00 = int('CZ00'.translate(_IBAN_LETTERS)) % 97
 
-def generate_iban(account_number, prefix, bank_code):
-    """Vygeneruje IBAN pro CZ bankovní účet (MOD-97)."""
-    bank_padded = str(bank_code).zfill(4)
-    prefix_padded = str(prefix).zfill(6)
-    account_padded = str(account_number).zfill(10)
-    basic = bank_padded + prefix_padded + account_padded
-    rearranged = basic + 'CZ00'
-    numeric_str = ''.join(str(ord(ch) - ord('A') + 10) if ch.isalpha() else ch for ch in rearranged)
-    check = 98 - (int(numeric_str) % 97)
-    return f'CZ{check:02d}{basic}'
+
+def iban_mod97(text):
+    """Vrátí zbytek po dělení 97 pro alfanumerický řetězec (ISO 7064 MOD 97-10), po 9místných blocích."""
+    digits = text.translate(_IBAN_LETTERS)
+    pow10, remainder = _POW10_MOD97, 0
+    for i in range(0, len(digits), _MOD97_CHUNK):
+        chunk = digits[i:i + _MOD97_CHUNK]
+        remainder = (remainder * pow10[len(chunk)] + int(chunk)) % 97
+    return remainder
+
+
+def cz_iban_check_digits(bank_code, prefix, account_number):
+    """
+    Vrátí kontrolní číslice CZ IBAN (2–98) pro kód banky, prefix a číslo účtu (int).
+    Stejný blokový výpočet jako iban_mod97, jen bloky jsou rovnou číselná pole
+    CZ BBAN (4 + 6 + 10 číslic) a přesunuté 'CZ00' — bez převodu na řetězec.
+    """
+    pow10 = _POW10_MOD97
+    remainder = (bank_code * pow10[6] + prefix) % 97
+    remainder = (remainder * pow10[10] + account_number) % 97
+    return 98 - (remainder * pow10[6] + _MOD97_CZ00) % 97
 
 
 def format_iban(iban, grouped=False):
@@ -54,48 +118,93 @@ def format_iban(iban, grouped=False):
     return iban
 
 
-def generate_account_numbers(count, with_prefix, without_prefix, bank_code=None, iban_format='plain'):
+def generate_iban(account_number, prefix, bank_code, grouped=False):
+    """
+    Vygeneruje IBAN pro CZ bankovní účet (MOD-97).
+    grouped=True oddělí každé 4 znaky mezerou (CZ IBAN má pevnou délku 24 znaků).
+    """
+    bank, prefix, account = int(bank_code), int(prefix), int(account_number)
+    iban = f'CZ{cz_iban_check_digits(bank, prefix, account):02d}{bank:04d}{prefix:06d}{account:010d}'
+    if grouped:
+        return f'{iban[:4]} {iban[4:8]} {iban[8:12]} {iban[12:16]} {iban[16:20]} {iban[20:]}'
+    return iban
+
+
+def _validate_account_params(count, with_prefix, without_prefix, bank_code, max_count):
+    """Společná validace vstupů pro generování čísel účtů; vrátí chybu nebo None."""
+    if not with_prefix and not without_prefix:
+        return 'Zvol alespoň jednu variantu.'
+    if not (1 <= count <= max_count):
+        return f'Počet musí být v rozmezí 1–{max_count:,}.'.replace(',', ' ')
+    if bank_code and not re.fullmatch(r'\d{4}', str(bank_code)):
+        return 'Kód banky musí mít přesně 4 číslice (0–9).'
+    return None
+
+
+def _iter_accounts(count, with_prefix, without_prefix, bank_code, grouped, rng):
+    """Líně generuje trojice (varianta, číslo účtu, IBAN nebo None) po dávkách."""
+    for start in range(0, count, _ACCOUNT_BATCH_SIZE):
+        n = min(_ACCOUNT_BATCH_SIZE, count - start)
+        plain_accounts = _generate_account_parts(n, 6, 10, rng) if without_prefix else None
+        prefixed_accounts = _generate_account_parts(n, 6, 10, rng) if with_prefix else None
+        prefixes = _generate_account_parts(n, 2, 6, rng) if with_prefix else None
+
+        for i in range(n):
+            if without_prefix:
+                acc = plain_accounts[i]
+                iban = generate_iban(acc, 0, bank_code, grouped) if bank_code else None
+                yield 'without_prefix', acc, iban
+
+            if with_prefix:
+                acc, prefix = prefixed_accounts[i], prefixes[i]
+                iban = generate_iban(acc, prefix, bank_code, grouped) if bank_code else None
+                yield 'with_prefix', f'{prefix}-{acc}', iban
+
+
+def generate_account_numbers(count, with_prefix, without_prefix, bank_code=None, iban_format='plain',
+                             seed=None):
     """
     Vygeneruje čísla účtů.
 
     Vrátí (result, error) kde result = {'with_prefix': [...], 'without_prefix': [...]}.
     Pokud je bank_code zadán, položky jsou dicty {'account': ..., 'iban': ...},
     jinak prosté stringy (zpětná kompatibilita).
+    Se stejným seed vrátí vždy stejná čísla (viz make_rng).
     """
-    if not with_prefix and not without_prefix:
-        return None, 'Zvol alespoň jednu variantu.'
-    if not (1 <= count <= 100):
-        return None, 'Počet musí být v rozmezí 1–100.'
+    error = _validate_account_params(count, with_prefix, without_prefix, bank_code, MAX_COUNT_ACCOUNTS)
+    if error:
+        return None, error
 
-    if bank_code and not re.fullmatch(r'\d{4}', str(bank_code)):
-        return None, 'Kód banky musí mít přesně 4 číslice (0–9).'
-
-    use_iban = bool(bank_code)
     result = {'with_prefix': [], 'without_prefix': []}
+    for variant, acc, iban in _iter_accounts(count, with_prefix, without_prefix,
+                                             bank_code, iban_format == 'grouped', make_rng(seed)):
+        result[variant].append({'account': acc, 'iban': iban} if bank_code else acc)
+    return result, None
 
-    for _ in range(count):
-        if without_prefix:
-            acc = _generate_account_part(6, 10)
-            if not acc:
-                return None, 'Generování čísla účtu selhalo, zkus to znovu.'
-            if use_iban:
-                iban = format_iban(generate_iban(acc, 0, bank_code), grouped=(iban_format == 'grouped'))
-                result['without_prefix'].append({'account': acc, 'iban': iban})
-            else:
-                result['without_prefix'].append(acc)
-
-        if with_prefix:
-            acc = _generate_account_part(6, 10)
-            prefix = _generate_account_part(2, 6)
-            if not acc or not prefix:
-                return None, 'Generování čísla účtu selhalo, zkus to znovu.'
-            if use_iban:
-                iban = format_iban(generate_iban(acc, prefix, bank_code), grouped=(iban_format == 'grouped'))
-                result['with_prefix'].append({'account': f'{prefix}-{acc}', 'iban': iban})
+
+def bulk_account_numbers(count, with_prefix, without_prefix, bank_code=None, iban_format='plain',
+                         seed=None):
+    """
+    Hromadné generování čísel účtů pro stažení (až BULK_MAX_COUNT na variantu).
+
+    Vrátí (rows, error) kde rows je iterátor dictů
+    {'variant': ..., 'account': ...[, 'iban': ...]} — nic se nedrží v paměti.
+    """
+    error = _validate_account_params(count, with_prefix, without_prefix, bank_code, BULK_MAX_COUNT)
+    if error:
+        return None, error
+
+    rng = make_rng(seed)
+
+    def rows():
+        for variant, acc, iban in _iter_accounts(count, with_prefix, without_prefix,
+                                                 bank_code, iban_format == 'grouped', rng):
+            if bank_code:
+                yield {'variant': variant, 'account': acc, 'iban': iban}
             else:
-                result['with_prefix'].append(f'{prefix}-{acc}')
+                yield {'variant': variant, 'account': acc}
 
-    return result, None
+    return rows(), None
 
 
 # ══════════════════════════════════════════════════════════════════════════════
@@ -103,6 +212,11 @@ def generate_account_numbers(count, with_prefix, without_prefix, bank_code=None,
 # ══════════════════════════════════════════════════════════════════════════════
 
 _CUTOFF_1954 = date(1954, 1, 1)
+_CUTOFF_2004 = date(2004, 1, 1)
+
+# Nejstarší datum narození, pro které varianta nového standardu existuje: desetimístná
+# čísla od 1954, měsíc +20/+70 od 2004 (starší YY by se četlo jako 20YY)
+_VARIANT_FROM = {'new_normal': _CUTOFF_1954, 'new_extended': _CUTOFF_2004}
 
 VARIANT_LABELS = {
     'old':          'Starý standard (XXX)',
@@ -119,19 +233,23 @@ def _subtract_years(d, years):
         return d.replace(year=d.year - years, day=28)
 
 
-def _random_date_in_age_range(age_min, age_max, upper_cutoff=None):
+def _age_range_bounds(age_min, age_max, upper_cutoff=None, lower_cutoff=None):
     """
-    Vrátí náhodné datum narození pro osobu ve věku age_min–age_max let (k dnešnímu dni).
-    Volitelný upper_cutoff omezuje horní hranici data (pro starý standard).
+    Vrátí (nejstarší datum, počet dní rozsahu) pro osobu ve věku age_min–age_max let
+    (k dnešnímu dni), nebo None pokud je rozsah prázdný.
+    Volitelný upper_cutoff omezuje horní hranici data (pro starý standard),
+    lower_cutoff dolní (pro nový standard).
     """
     today = date.today()
     latest = _subtract_years(today, age_min)
     earliest = _subtract_years(today, age_max + 1) + timedelta(days=1)
     if upper_cutoff:
         latest = min(latest, upper_cutoff)
+    if lower_cutoff:
+        earliest = max(earliest, lower_cutoff)
     if earliest > latest:
         return None
-    return earliest + timedelta(days=random.randint(0, (latest - earliest).days))
+    return earliest, (latest - earliest).days
 
 
 def _encode_month(month, gender, variant):
@@ -142,59 +260,79 @@ def _encode_month(month, gender, variant):
     return base
 
 
-def _rc_old(birth_date, gender):
-    """Starý standard: YYMMDD/SSS (bez mod-11 kontroly)."""
-    yy = birth_date.year % 100
-    mm = _encode_month(birth_date.month, gender, 'old')
-    dd = birth_date.day
-    sss = random.randint(1, 999)
-    return f'{yy:02d}{mm:02d}{dd:02d}/{sss:03d}'
+# Koncovky SSS (starý standard) a SSSC (nový standard) předpočítané pro všech 11 zbytků.
+# Celé číslo YYMMDDSSSC je dělitelné 11 a 10000 ≡ 1 (mod 11), takže platné koncovky
+# závisí jen na (YYMMDD mod 11) — výběr koncovky je pak jediné rng.choice.
+_RC_OLD_SUFFIXES = [f'{sss:03d}' for sss in range(1, 1000)]
+_RC_NEW_SUFFIXES = [
+    [f'{sss:03d}{c}' for sss in range(1, 1000) for c in [(-(residue + sss * 10)) % 11] if c <= 9]
+    for residue in range(11)
+]
+
+
+def _rc_date_part(birth_date, gender, variant):
+    """Vrátí datovou část rodného čísla YYMMDD."""
+    mm = _encode_month(birth_date.month, gender, variant)
+    return f'{birth_date.year % 100:02d}{mm:02d}{birth_date.day:02d}'
+
 
+def _rc_suffixes(date_part, variant):
+    """Vrátí seznam platných koncovek pro danou datovou část a variantu."""
+    if variant == 'old':
+        return _RC_OLD_SUFFIXES
+    return _RC_NEW_SUFFIXES[int(date_part) % 11]
 
-def _rc_new(birth_date, gender, variant, used_sss=None):
+
+class _UniqueSuffixSampler:
     """
-    Nový standard: YYMMDD/SSSC — celé desetimístné číslo dělitelné 11.
-    Volitelný used_sss (set) zajistí jedinečnost v rámci jednoho data+pohlaví+varianty.
+    Losování koncovek bez opakování (líný Fisher–Yates): O(1) na číslo,
+    vyčerpání poznáme podle remaining() místo opakovaných pokusů.
     """
-    yy = birth_date.year % 100
-    mm = _encode_month(birth_date.month, gender, variant)
-    dd = birth_date.day
-    base6 = yy * 10000 + mm * 100 + dd
-
-    candidates = list(range(1, 1000))
-    random.shuffle(candidates)
-
-    for sss in candidates:
-        if used_sss is not None and sss in used_sss:
-            continue
-        num_without_c = base6 * 10000 + sss * 10
-        c = (-num_without_c) % 11
-        if c <= 9:
-            if used_sss is not None:
-                used_sss.add(sss)
-            return f'{yy:02d}{mm:02d}{dd:02d}/{sss:03d}{c}'
-    return None
 
+    def __init__(self, suffixes, rng):
+        self._pool = list(suffixes)
+        self._rng = rng
+        self._used = 0
 
-def generate_birth_numbers(count, gender, variants, date_mode,
-                           age_min=None, age_max=None, specific_date=None):
+    def remaining(self):
+        return len(self._pool) - self._used
+
+    def draw(self):
+        if not self.remaining():
+            return None
+        i = self._rng.randrange(self._used, len(self._pool))
+        pool, used = self._pool, self._used
+        pool[i], pool[used] = pool[used], pool[i]
+        self._used += 1
+        return pool[used]
+
+
+def _rc_random(birth_date, gender, variant, rng):
     """
-    Vygeneruje rodná čísla.
+    Vygeneruje rodné číslo s náhodnou koncovkou.
+    Starý standard: YYMMDD/SSS (bez mod-11), nový: YYMMDD/SSSC dělitelné 11.
+    """
+    date_part = _rc_date_part(birth_date, gender, variant)
+    return f'{date_part}/{rng.choice(_rc_suffixes(date_part, variant))}'
 
-    Parametry:
-        count        – počet čísel (celkově, pro každou variantu)
-        gender       – 'M', 'F', nebo 'both'
-        variants     – list z ['old', 'new_normal', 'new_extended']
-        date_mode    – 'range' nebo 'specific'
-        age_min/max  – věkový rozsah (pro date_mode='range')
-        specific_date – date objekt (pro date_mode='specific')
 
-    Vrátí (results, error) kde results = {'old': [...], 'new_normal': [...], 'new_extended': [...]}.
+def _gender_counts(count, gender):
+    """Vrátí {pohlaví: počet} pro count čísel — pro 'both' půl na půl (ženy o 1 víc)."""
+    if gender == 'both':
+        return {'M': count // 2, 'F': count - count // 2}
+    return {gender: count}
+
+
+def _validate_birth_params(count, gender, variants, date_mode, age_min, age_max, specific_date, max_count):
+    """
+    Společná validace vstupů pro generování rodných čísel.
+    Vrátí (date_bounds, error) kde date_bounds = {varianta: (nejstarší datum, rozsah dní)}
+    pro date_mode='range', jinak prázdný dict.
     """
     if not variants:
         return None, 'Zvol alespoň jednu variantu.'
-    if not (1 <= count <= 200):
-        return None, 'Počet musí být v rozmezí 1–200.'
+    if not (1 <= count <= max_count):
+        return None, f'Počet musí být v rozmezí 1–{max_count:,}.'.replace(',', ' ')
 
     # Validace starého standardu
     if 'old' in variants:
@@ -214,50 +352,129 @@ def generate_birth_numbers(count, gender, variants, date_mode,
                     'Starý standard vyžaduje věk alespoň 73 let (narození před 1. 1. 1954).'
                 )
 
-    # Sestavení seznamu pohlaví
-    if gender == 'both':
-        half = count // 2
-        genders = ['M'] * half + ['F'] * (count - half)
-        random.shuffle(genders)
+    # Validace nového standardu (od 1954, rozšíření +20/+70 od 2004)
+    if date_mode == 'specific':
+        for variant in variants:
+            start = _VARIANT_FROM.get(variant)
+            if start and specific_date < start:
+                return None, (
+                    f'{VARIANT_LABELS[variant]} je pouze pro osoby narozené od 1. 1. {start.year}. '
+                    'Zadané datum je před tímto datem.'
+                )
+
+    date_bounds = {}
+    if date_mode != 'specific':
+        for variant in variants:
+            # Pro starý standard omezíme datum na pre-1954 oblast, pro nový na roky, kdy platí
+            cutoff = date(1953, 12, 31) if variant == 'old' else None
+            start = _VARIANT_FROM.get(variant)
+            bounds = _age_range_bounds(age_min, age_max, upper_cutoff=cutoff, lower_cutoff=start)
+            if bounds is None:
+                if start:
+                    return None, (
+                        f'Věkový rozsah {age_min}–{age_max} let nevede k datům od 1. 1. {start.year} '
+                        f'({VARIANT_LABELS[variant]}).'
+                    )
+                return None, (
+                    f'Nepodařilo se vygenerovat datum pro věkový rozsah {age_min}–{age_max} let.'
+                )
+            date_bounds[variant] = bounds
     else:
-        genders = [gender] * count
+        # Pro konkrétní datum jsou čísla unikátní — počet je omezen počtem platných koncovek
+        for variant in variants:
+            for g, needed in _gender_counts(count, gender).items():
+                capacity = len(_rc_suffixes(_rc_date_part(specific_date, g, variant), variant))
+                if needed > capacity:
+                    return None, (
+                        f'Pro zadané datum lze vygenerovat nejvýše {capacity} unikátních rodných čísel '
+                        f'({VARIANT_LABELS[variant]}, {"muži" if g == "M" else "ženy"}).'
+                    )
+    return date_bounds, None
 
-    results = {v: [] for v in variants}
 
-    # Pro specific_date sledujeme použité SSS hodnoty per (variant, gender) pro jedinečnost
-    used_sss_map = {}  # key: (variant, gender) → set
+def _iter_genders(count, gender, rng):
+    """
+    Líně vrací pohlaví pro count čísel. Pro 'both' přesně půl na půl v náhodném pořadí —
+    losování podle zbývajících počtů odpovídá zamíchanému seznamu, ale bez jeho alokace.
+    """
+    if gender != 'both':
+        for _ in range(count):
+            yield gender
+        return
+    males = _gender_counts(count, gender)['M']
+    for remaining in range(count, 0, -1):
+        if rng.randrange(remaining) < males:
+            males -= 1
+            yield 'M'
+        else:
+            yield 'F'
+
+
+def _iter_birth_numbers(count, gender, variants, date_mode, date_bounds, specific_date, rng):
+    """Líně generuje dvojice (varianta, rodné číslo)."""
+    # Pro specific_date losujeme koncovky bez opakování per (variant, gender);
+    # kapacitu ověřil _validate_birth_params, takže k vyčerpání nedojde
+    samplers = {}  # key: (variant, gender) → (datová část, _UniqueSuffixSampler)
+    if date_mode == 'specific':
+        for variant in variants:
+            for g in _gender_counts(count, gender):
+                date_part = _rc_date_part(specific_date, g, variant)
+                samplers[variant, g] = date_part, _UniqueSuffixSampler(_rc_suffixes(date_part, variant), rng)
 
-    for g in genders:
+    for g in _iter_genders(count, gender, rng):
         for variant in variants:
             if date_mode == 'specific':
-                birth_date = specific_date
-            elif variant == 'old':
-                # Pro starý standard omezíme datum na pre-1954 oblast
-                birth_date = _random_date_in_age_range(
-                    age_min, age_max,
-                    upper_cutoff=date(1953, 12, 31)
-                )
+                date_part, sampler = samplers[variant, g]
+                yield variant, f'{date_part}/{sampler.draw()}'
             else:
-                birth_date = _random_date_in_age_range(age_min, age_max)
+                earliest, span = date_bounds[variant]
+                birth_date = earliest + timedelta(days=rng.randint(0, span))
+                yield variant, _rc_random(birth_date, g, variant, rng)
 
-            if birth_date is None:
-                return None, (
-                    f'Nepodařilo se vygenerovat datum pro věkový rozsah {age_min}–{age_max} let.'
-                )
 
-            if variant == 'old':
-                rc = _rc_old(birth_date, g)
-            else:
-                key = (variant, g, birth_date if date_mode == 'specific' else None)
-                if date_mode == 'specific':
-                    if key not in used_sss_map:
-                        used_sss_map[key] = set()
-                    rc = _rc_new(birth_date, g, variant, used_sss_map[key])
-                else:
-                    rc = _rc_new(birth_date, g, variant)
-
-            if rc:
-                results[variant].append(rc)
-            # rc může být None jen při vyčerpání unikátních hodnot (extrémně vzácné)
+def generate_birth_numbers(count, gender, variants, date_mode,
+                           age_min=None, age_max=None, specific_date=None, seed=None):
+    """
+    Vygeneruje rodná čísla.
 
+    Parametry:
+        count        – počet čísel (celkově, pro každou variantu)
+        gender       – 'M', 'F', nebo 'both'
+        variants     – list z ['old', 'new_normal', 'new_extended']
+        date_mode    – 'range' nebo 'specific'
+        age_min/max  – věkový rozsah (pro date_mode='range')
+        specific_date – date objekt (pro date_mode='specific')
+        seed         – volitelný seed pro reprodukovatelný výstup (viz make_rng);
+                       u věkového rozsahu závisí výsledek i na dnešním datu
+
+    Vrátí (results, error) kde results = {'old': [...], 'new_normal': [...], 'new_extended': [...]}.
+    """
+    date_bounds, error = _validate_birth_params(count, gender, variants, date_mode, age_min, age_max,
+                                                specific_date, MAX_COUNT_BIRTH_NUMBERS)
+    if error:
+        return None, error
+
+    results = {v: [] for v in variants}
+    for variant, rc in _iter_birth_numbers(count, gender, variants, date_mode,
+                                           date_bounds, specific_date, make_rng(seed)):
+        results[variant].append(rc)
     return results, None
+
+
+def bulk_birth_numbers(count, gender, variants, date_mode,
+                       age_min=None, age_max=None, specific_date=None, seed=None):
+    """
+    Hromadné generování rodných čísel pro stažení (až BULK_MAX_COUNT na variantu).
+
+    Parametry jako generate_birth_numbers. Vrátí (rows, error) kde rows je iterátor
+    dictů {'variant': ..., 'birth_number': ...}.
+    """
+    date_bounds, error = _validate_birth_params(count, gender, variants, date_mode, age_min, age_max,
+                                                specific_date, BULK_MAX_COUNT)
+    if error:
+        return None, error
+
+    rows = ({'variant': variant, 'birth_number': rc}
+            for variant, rc in _iter_birth_numbers(count, gender, variants, date_mode,
+                                                   date_bounds, specific_date, make_rng(seed)))
+    return rows, None
@@ -8,6 +8,9 @@ MAX_INPUT = 1_000_000
 
 
 ALGORITHMS = ['MD5', 'SHA-1', 'SHA-256', 'SHA-512']
+_HASHLIB_NAMES = {'MD5': 'md5', 'SHA-1': 'sha1', 'SHA-256': 'sha256', 'SHA-512': 'sha512'}
+
+CHUNK_SIZE = 1024 * 1024
 
 
 def compute_all(text):
@@ -20,3 +23,16 @@ def compute_all(text):
         'SHA-256': hashlib.sha256(b).hexdigest(),
         'SHA-512': hashlib.sha512(b).hexdigest(),
     }
+
+
+def compute_stream(stream, progress=None):
+    """Hashe binárního proudu po blocích (velké soubory); progress(zpracované bajty) po každém bloku."""
+    hashers = {name: hashlib.new(_HASHLIB_NAMES[name]) for name in ALGORITHMS}
+    done = 0
+    while chunk := stream.read(CHUNK_SIZE):
+        for hasher in hashers.values():
+            hasher.update(chunk)
+        done += len(chunk)
+        if progress:
+            progress(done)
+    return {name: hasher.hexdigest() for name, hasher in hashers.items()}
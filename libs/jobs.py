@@ -0,0 +1,345 @@
+"""
+Fronta velkých převodů na pozadí bez externího brokera
+
+Úlohy leží v tabulce jobs ve sdíleném SQLite souboru (stejném jako libs/shared_store),
+vstupy a výstupy v adresáři UPLOAD_FOLDER/jobs/<id>/. Zpracovává je runner
+(python -m libs.jobs), samostatný proces, který si atomicky bere další úlohu ve frontě,
+volá stejné funkce libs/* jako stránky nástrojů a průběžně zapisuje průběh.
+Web worker runner spustí při zadání úlohy, pokud mu žádný neběží; runner bez práce
+sám skončí. Hotové úlohy i se soubory po JOB_TTL zmizí.
+"""
+
+import json
+import os
+import shutil
+import signal
+import sqlite3
+import subprocess
+import sys
+import threading
+import time
+import uuid
+
+try:
+    import resource
+except ImportError:  # Windows — paměťový limit runneru se nenastaví
+    resource = None
+
+# Druhy úloh: (id, popis, počet vstupních souborů)
+KINDS = [
+    ('encoding',    'Převod kódování',        1),
+    ('csv_to_json', 'CSV → JSON',             1),
+    ('json_to_csv', 'JSON → CSV',             1),
+    ('diff',        'Porovnání dvou souborů', 2),
+    ('hash',        'Hashe souboru',          1),
+]
+_INPUTS = {kind: count for kind, _, count in KINDS}
+
+# Skutečný průběh hlásí jen úlohy čtoucí vstup po blocích; ostatní zpracují celý soubor jedním voláním
+PROGRESS_KINDS = {'hash'}
+
+# Vstupní limity nástrojů platí pro synchronní požadavky; runner má vlastní časový a paměťový strop
+JOB_MAX_INPUT = 100 * 1024 * 1024
+JOB_TIMEOUT = 10 * 60
+JOB_MEMORY_MB = 2048
+JOB_TTL = 24 * 3600
+
+# Runner bez práce skončí po RUNNER_IDLE sekundách; frontu kontroluje každých POLL_INTERVAL
+RUNNER_IDLE = 60
+POLL_INTERVAL = 0.5
+PROGRESS_INTERVAL = 0.5
+SWEEP_INTERVAL = 60
+
+_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id          TEXT PRIMARY KEY,
+    kind        TEXT NOT NULL,
+    params      TEXT NOT NULL,
+    filename    TEXT NOT NULL,
+    status      TEXT NOT NULL,
+    progress    REAL NOT NULL DEFAULT 0,
+    error       TEXT,
+    output_name TEXT,
+    output_size INTEGER,
+    created     REAL NOT NULL,
+    updated     REAL NOT NULL,
+    expires     REAL NOT NULL
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS jobs_queue ON jobs (status, created);
+"""
+
+_FIELDS = ('id', 'kind', 'params', 'filename', 'status', 'progress', 'error',
+           'output_name', 'output_size', 'created', 'updated', 'expires')
+
+
+class _Timeout(BaseException):
+    """Vyhazuje ho časovač runneru; BaseException, aby ho nespolklo except Exception v knihovnách."""
+
+
+class JobQueue:
+    """Fronta úloh ve sdíleném SQLite souboru; spojení per vlákno a per proces jako SharedStore."""
+
+    def __init__(self, path, spool_dir, ttl=JOB_TTL):
+        self.path = path
+        self.spool_dir = spool_dir
+        self.ttl = ttl
+        self._local = threading.local()
+        self._last_sweep = 0.0
+        self._runner = None
+        self._runner_lock = threading.Lock()
+        os.makedirs(spool_dir, exist_ok=True)
+
+    def _connect(self):
+        local = self._local
+        if getattr(local, 'pid', None) != os.getpid():
+            conn = sqlite3.connect(self.path, timeout=5, isolation_level=None, check_same_thread=False)
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            conn.executescript(_SCHEMA)
+            local.conn, local.pid = conn, os.getpid()
+        return local.conn
+
+    def job_dir(self, job_id):
+        return os.path.join(self.spool_dir, job_id)
+
+    def output_path(self, job_id):
+        return os.path.join(self.job_dir(job_id), 'output')
+
+    # ── strana webu ──────────────────────────────────────────────────────────
+
+    def submit(self, kind, params, filename, streams):
+        """
+        Ověří parametry, uloží vstupní proudy do spoolu a zařadí úlohu. Vrátí (id úlohy, chyba).
+        """
+        if kind not in _INPUTS:
+            return None, 'Neznámý druh úlohy'
+        if len(streams) != _INPUTS[kind]:
+            return None, f'Úloha potřebuje {_INPUTS[kind]} vstupní soubor(y)'
+        error = _check_params(kind, params)
+        if error:
+            return None, error
+        self.sweep()
+        job_id = uuid.uuid4().hex
+        directory = self.job_dir(job_id)
+        os.makedirs(directory)
+        try:
+            for index, stream in enumerate(streams):
+                with open(os.path.join(directory, f'input{index}'), 'wb') as f:
+                    shutil.copyfileobj(stream, f, 1024 * 1024)
+        except OSError as e:
+            shutil.rmtree(directory, ignore_errors=True)
+            return None, f'Vstup se nepodařilo uložit: {e}'
+        now = time.time()
+        self._connect().execute(
+            'INSERT INTO jobs (id, kind, params, filename, status, created, updated, expires) '
+            'VALUES (?, ?, ?, ?, ?, ?, ?, ?)',
+            (job_id, kind, json.dumps(params), filename, 'queued', now, now, now + self.ttl))
+        self.ensure_runner()
+        return job_id, None
+
+    def get(self, job_id):
+        row = self._connect().execute(
+            f'SELECT {", ".join(_FIELDS)} FROM jobs WHERE id = ? AND expires > ?',
+            (job_id, time.time())).fetchone()
+        return dict(zip(_FIELDS, row)) if row else None
+
+    def get_many(self, job_ids):
+        """Úlohy v pořadí job_ids; prošlé a neznámé vynechá."""
+        jobs = (self.get(job_id) for job_id in job_ids)
+        return [job for job in jobs if job is not None]
+
+    def ensure_runner(self):
+        """Spustí runner, pokud tomuto workeru žádný neběží (ukončený se zároveň uklidí)."""
+        with self._runner_lock:
+            if self._runner is not None and self._runner.poll() is None:
+                return
+            self._runner = subprocess.Popen(
+                [sys.executable, '-m', 'libs.jobs', self.path, self.spool_dir],
+                cwd=_ROOT, stdin=subprocess.DEVNULL,
+            )
+
+    def sweep(self):
+        """Smaže prošlé úlohy i se soubory a označí úlohy, jejichž runner zmizel."""
+        now = time.time()
+        if now - self._last_sweep < SWEEP_INTERVAL:
+            return
+        self._last_sweep = now
+        conn = self._connect()
+        expired = [row[0] for row in conn.execute('SELECT id FROM jobs WHERE expires <= ?', (now,))]
+        for job_id in expired:
+            shutil.rmtree(self.job_dir(job_id), ignore_errors=True)
+        conn.execute('DELETE FROM jobs WHERE expires <= ?', (now,))
+        conn.execute(
+            "UPDATE jobs SET status = 'error', error = ?, updated = ? WHERE status = 'running' AND updated < ?",
+            ('Zpracování bylo přerušeno (runner neočekávaně skončil).', now, now - JOB_TIMEOUT - 60))
+
+    # ── strana runneru ───────────────────────────────────────────────────────
+
+    def claim(self):
+        """Atomicky převezme nejstarší úlohu ve frontě (i mezi více runnery). Vrátí dict nebo None."""
+        row = self._connect().execute(
+            "UPDATE jobs SET status = 'running', updated = :now "
+            "WHERE id = (SELECT id FROM jobs WHERE status = 'queued' ORDER BY created LIMIT 1) "
+            f"RETURNING {', '.join(_FIELDS)}", {'now': time.time()}).fetchone()
+        return dict(zip(_FIELDS, row)) if row else None
+
+    def update(self, job_id, **fields):
+        fields['updated'] = time.time()
+        if fields.get('status') in ('done', 'error'):
+            fields['expires'] = fields['updated'] + self.ttl
+        assignments = ', '.join(f'{name} = :{name}' for name in fields)
+        self._connect().execute(f'UPDATE jobs SET {assignments} WHERE id = :id', dict(fields, id=job_id))
+
+
+# ── zpracování úloh (běží v runneru) ─────────────────────────────────────────
+
+def _check_params(kind, params):
+    """Chyba v parametrech druhu úlohy, nebo None — runner pak dostane jen platné hodnoty."""
+    if kind == 'encoding':
+        from libs import encoding_converter
+        return encoding_converter.check_params(params.get('source_encoding'), params.get('target_encoding'),
+                                               params.get('error_mode', 'replace'))
+    if kind in ('csv_to_json', 'json_to_csv'):
+        from libs import csv_json
+        return csv_json.check_delimiter(params.get('delimiter', ','))
+    return None
+
+
+def _read_text(path):
+    with open(path, encoding='utf-8-sig', errors='replace') as f:
+        return f.read()
+
+
+def _base_name(filename):
+    return os.path.splitext(filename)[0] or 'vystup'
+
+
+def _run_encoding(job, inputs, output, progress):
+    from libs import encoding_converter
+    params = json.loads(job['params'])
+    with open(inputs[0], 'rb') as f:
+        content = f.read()
+    converted, error = encoding_converter.convert_content(
+        content, params['source_encoding'], params['target_encoding'], params.get('error_mode', 'replace'))
+    if error:
+        return None, error
+    with open(output, 'wb') as f:
+        f.write(converted)
+    return encoding_converter.generate_output_filename(job['filename'], params['target_encoding']), None
+
+
+def _run_csv_json(job, inputs, output, progress):
+    from libs import csv_json
+    params = json.loads(job['params'])
+    text = _read_text(inputs[0])
+    if job['kind'] == 'csv_to_json':
+        result, error = csv_json.csv_to_json(text, params.get('delimiter', ','), max_input=JOB_MAX_INPUT)
+        extension = 'json'
+    else:
+        result, error = csv_json.json_to_csv(text, params.get('delimiter', ','), max_input=JOB_MAX_INPUT)
+        extension = 'csv'
+    if error:
+        return None, error
+    with open(output, 'w', encoding='utf-8', newline='') as f:
+        f.write(result)
+    return f'{_base_name(job["filename"])}.{extension}', None
+
+
+def _run_diff(job, inputs, output, progress):
+    from libs import diff_tool
+    text1, text2 = _read_text(inputs[0]), _read_text(inputs[1])
+    lines, identical = diff_tool.compare(text1, text2, max_input=JOB_MAX_INPUT)
+    if isinstance(identical, str):
+        return None, identical
+    with open(output, 'w', encoding='utf-8') as f:
+        f.write('Soubory jsou identické.\n' if identical else diff_tool.to_text(lines))
+    return f'{_base_name(job["filename"])}.diff', None
+
+
+def _run_hash(job, inputs, output, progress):
+    from libs import hash_generator
+    size = os.path.getsize(inputs[0]) or 1
+    with open(inputs[0], 'rb') as f:
+        hashes = hash_generator.compute_stream(f, lambda done: progress(0.95 * done / size))
+    with open(output, 'w', encoding='utf-8') as f:
+        for name, digest in hashes.items():
+            f.write(f'{name:8} {digest}  {job["filename"]}\n')
+    return f'{_base_name(job["filename"])}.hashes.txt', None
+
+
+_HANDLERS = {
+    'encoding': _run_encoding,
+    'csv_to_json': _run_csv_json,
+    'json_to_csv': _run_csv_json,
+    'diff': _run_diff,
+    'hash': _run_hash,
+}
+
+
+def _on_alarm(signum, frame):
+    raise _Timeout()
+
+
+def execute(queue, job):
+    """Zpracuje jednu převzatou úlohu. Vrátí False, pokud by runner měl skončit (došla paměť)."""
+    last = [0.0]
+
+    def progress(fraction):
+        now = time.monotonic()
+        if now - last[0] >= PROGRESS_INTERVAL:
+            last[0] = now
+            queue.update(job['id'], progress=min(fraction, 0.99))
+
+    directory = queue.job_dir(job['id'])
+    inputs = [os.path.join(directory, f'input{i}') for i in range(_INPUTS[job['kind']])]
+    exhausted = False
+    signal.setitimer(signal.ITIMER_REAL, JOB_TIMEOUT)
+    try:
+        output_name, error = _HANDLERS[job['kind']](job, inputs, queue.output_path(job['id']), progress)
+    except _Timeout:
+        output_name, error = None, f'Úloha překročila časový limit {JOB_TIMEOUT // 60} min.'
+    except MemoryError:
+        exhausted = True
+        output_name, error = None, f'Úloha překročila paměťový limit {JOB_MEMORY_MB} MB.'
+    except Exception as e:
+        output_name, error = None, f'Neočekávaná chyba: {e}'
+    finally:
+        signal.setitimer(signal.ITIMER_REAL, 0)
+
+    for path in inputs:
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+    if error:
+        queue.update(job['id'], status='error', error=error)
+        return not exhausted
+    queue.update(job['id'], status='done', progress=1.0, output_name=output_name,
+                 output_size=os.path.getsize(queue.output_path(job['id'])))
+    return True
+
+
+def run(queue):
+    """Smyčka runneru: zpracovává frontu, po RUNNER_IDLE sekundách bez práce skončí."""
+    signal.signal(signal.SIGALRM, _on_alarm)
+    if resource is not None:
+        hard = resource.getrlimit(resource.RLIMIT_AS)[1]
+        limit = JOB_MEMORY_MB * 1024 * 1024
+        resource.setrlimit(resource.RLIMIT_AS, (limit if hard == resource.RLIM_INFINITY else min(limit, hard), hard))
+    idle_since = time.monotonic()
+    while time.monotonic() - idle_since < RUNNER_IDLE:
+        queue.sweep()
+        job = queue.claim()
+        if job is None:
+            time.sleep(POLL_INTERVAL)
+            continue
+        if not execute(queue, job):
+            return  # po MemoryError může být halda rozbitá — další úlohu vezme nový runner
+        idle_since = time.monotonic()
+
+
+if __name__ == '__main__':
+    # python -m libs.jobs <cesta k SQLite> <adresář spoolu>
+    run(JobQueue(sys.argv[1], sys.argv[2]))
@@ -1,29 +1,90 @@
 """
-Knihovna pro dekódování JWT tokenů
+Knihovna pro dekódování JWT tokenů — jednotlivě i hromadně z logů, s volitelným ověřením podpisu
 """
 
 import base64
+import binascii
+import hashlib
+import hmac
+import io
 import json
-from datetime import datetime
+import re
+import threading
+from collections import Counter, OrderedDict
+from datetime import datetime, timezone
+from time import time
 
 MAX_INPUT = 10_000
+MAX_BULK_INPUT = 1_000_000
+MAX_BULK_TOKENS = 1_000
+MAX_JWKS_INPUT = 100_000
+
+# Token v řádku logu: hlavička JSON začíná vždy '{"' → base64url 'eyJ'
+_TOKEN_RE = re.compile(r'eyJ[A-Za-z0-9_-]*\.[A-Za-z0-9_-]+\.[A-Za-z0-9_-]*')
+
+BULK_FIELDS = ['line', 'alg', 'kid', 'iss', 'sub', 'aud', 'iat', 'exp', 'expired', 'signature', 'error']
+
+# Velikost LRU výsledků (klíčem je hash tokenu a použitých klíčů) a cache naparsovaných JWK
+_RESULT_CACHE_SIZE = 10_000
+_KEY_CACHE_SIZE = 256
+
+_HASHES = {'256': hashlib.sha256, '384': hashlib.sha384, '512': hashlib.sha512}
+
+# DER prefix DigestInfo pro PKCS#1 v1.5 (RFC 8017, kap. 9.2)
+_DIGEST_INFO = {
+    '256': bytes.fromhex('3031300d060960864801650304020105000420'),
+    '384': bytes.fromhex('3041300d060960864801650304020205000430'),
+    '512': bytes.fromhex('3051300d060960864801650304020305000440'),
+}
+
+# Křivka P-256 (NIST / secp256r1), a = -3
+_P256_P = 0xFFFFFFFF00000001000000000000000000000000FFFFFFFFFFFFFFFFFFFFFFFF
+_P256_N = 0xFFFFFFFF00000000FFFFFFFFFFFFFFFFBCE6FAADA7179E84F3B9CAC2FC632551
+_P256_B = 0x5AC635D8AA3A93E7B3EBBD55769886BC651D06B0CC53B0F63BCE3C3E27D2604B
+_P256_G = (0x6B17D1F2E12C4247F8BCE6E563A440F277037D812DEB33A0F4A13945D898C296,
+           0x4FE342E2FE1A7F9B8EE7EB4A7C0F9E162BCE33576B315ECECBB6406837BF51F5)
+
+_cache_lock = threading.Lock()
+_result_cache = OrderedDict()
+_key_cache = OrderedDict()
+
+
+def _b64url_decode(s):
+    s += '=' * (-len(s) % 4)
+    return base64.urlsafe_b64decode(s)
+
+
+def _b64url_int(s):
+    return int.from_bytes(_b64url_decode(s), 'big')
+
+
+def parse_token(token):
+    """
+    Rozdělí JWT na části. Vrátí (header, payload, signing_input, signature) —
+    header a payload jako dicty, signing_input a signature jako bajty.
+    Při chybném tokenu vyhodí ValueError.
+    """
+    parts = token.strip().split('.')
+    if len(parts) != 3:
+        raise ValueError('Neplatný JWT token — musí mít 3 části oddělené tečkou.')
+    try:
+        header = json.loads(_b64url_decode(parts[0]))
+        payload = json.loads(_b64url_decode(parts[1]))
+        signature = _b64url_decode(parts[2])
+    except (binascii.Error, UnicodeDecodeError, json.JSONDecodeError) as e:
+        raise ValueError(f'Chyba při dekódování: {e}')
+    if not isinstance(header, dict) or not isinstance(payload, dict):
+        raise ValueError('Header i payload musí být JSON objekty.')
+    return header, payload, f'{parts[0]}.{parts[1]}'.encode('ascii'), signature
 
 
 def decode(token):
     if len(token) > MAX_INPUT:
         return None, 'Vstup je příliš velký (max 10 KB)'
-    parts = token.strip().split('.')
-    if len(parts) != 3:
-        return None, 'Neplatný JWT token — musí mít 3 části oddělené tečkou.'
 
     try:
-        def b64url_decode(s):
-            s += '=' * (-len(s) % 4)
-            return base64.urlsafe_b64decode(s)
-
-        header = json.loads(b64url_decode(parts[0]))
-        payload = json.loads(b64url_decode(parts[1]))
-        signature = parts[2]
+        header, payload, _, _ = parse_token(token)
+        signature = token.strip().split('.')[2]
 
         expiry = None
         expired = None
@@ -39,5 +100,440 @@ def decode(token):
             'expired': expired,
         }, None
 
+    except ValueError as e:
+        return None, str(e)
     except Exception as e:
         return None, f'Chyba při dekódování: {str(e)}'
+
+
+# ══════════════════════════════════════════════════════════════════════════════
+# Ověření podpisu (HS*, RS*, ES256) — jen standardní knihovna
+# ══════════════════════════════════════════════════════════════════════════════
+
+def _p256_double(p):
+    """Zdvojení bodu v Jacobiho souřadnicích (a = -3)."""
+    x, y, z = p
+    if not z or not y:
+        return (0, 1, 0)
+    P = _P256_P
+    delta = z * z % P
+    gamma = y * y % P
+    beta = x * gamma % P
+    alpha = 3 * (x - delta) * (x + delta) % P
+    x3 = (alpha * alpha - 8 * beta) % P
+    z3 = ((y + z) ** 2 - gamma - delta) % P
+    y3 = (alpha * (4 * beta - x3) - 8 * gamma * gamma) % P
+    return (x3, y3, z3)
+
+
+def _p256_add(p, q):
+    """Součet dvou bodů v Jacobiho souřadnicích (z = 0 je bod v nekonečnu)."""
+    if not p[2]:
+        return q
+    if not q[2]:
+        return p
+    P = _P256_P
+    x1, y1, z1 = p
+    x2, y2, z2 = q
+    z1z1, z2z2 = z1 * z1 % P, z2 * z2 % P
+    u1, u2 = x1 * z2z2 % P, x2 * z1z1 % P
+    s1, s2 = y1 * z2 * z2z2 % P, y2 * z1 * z1z1 % P
+    if u1 == u2:
+        return _p256_double(p) if s1 == s2 else (0, 1, 0)
+    h = u2 - u1
+    i = 4 * h * h % P
+    j = h * i % P
+    r = 2 * (s2 - s1) % P
+    v = u1 * i % P
+    x3 = (r * r - j - 2 * v) % P
+    y3 = (r * (v - x3) - 2 * s1 * j) % P
+    z3 = ((z1 + z2) ** 2 - z1z1 - z2z2) * h % P
+    return (x3, y3, z3)
+
+
+def _p256_on_curve(x, y):
+    P = _P256_P
+    return 0 <= x < P and 0 <= y < P and (y * y - x * x * x + 3 * x - _P256_B) % P == 0
+
+
+def _es256_verify(public, message, signature):
+    """ECDSA P-256 / SHA-256; podpis JWS je r ‖ s (2 × 32 bajtů)."""
+    if len(signature) != 64:
+        return False
+    N = _P256_N
+    r, s = int.from_bytes(signature[:32], 'big'), int.from_bytes(signature[32:], 'big')
+    if not (0 < r < N and 0 < s < N):
+        return False
+    e = int.from_bytes(hashlib.sha256(message).digest(), 'big')
+    w = pow(s, -1, N)
+    u1, u2 = e * w % N, r * w % N
+
+    # Shamirův trik: u1·G + u2·Q jedním průchodem bitů
+    g, q = (*_P256_G, 1), (*public, 1)
+    table = {1: g, 2: q, 3: _p256_add(g, q)}
+    acc = (0, 1, 0)
+    for bit in range(max(u1.bit_length(), u2.bit_length()) - 1, -1, -1):
+        acc = _p256_double(acc)
+        idx = (u1 >> bit & 1) | (u2 >> bit & 1) << 1
+        if idx:
+            acc = _p256_add(acc, table[idx])
+    x, _, z = acc
+    if not z:
+        return False
+    return x * pow(z * z, -1, _P256_P) % _P256_P % N == r
+
+
+def _rsa_verify(public, bits, message, signature):
+    """RSASSA-PKCS1-v1_5: porovná dešifrovaný podpis s očekávaným kódováním EMSA."""
+    n, e = public
+    k = (n.bit_length() + 7) // 8
+    if len(signature) != k:
+        return False
+    s = int.from_bytes(signature, 'big')
+    if s >= n:
+        return False
+    t = _DIGEST_INFO[bits] + _HASHES[bits](message).digest()
+    expected = b'\x00\x01' + b'\xff' * (k - len(t) - 3) + b'\x00' + t
+    return hmac.compare_digest(pow(s, e, n).to_bytes(k, 'big'), expected)
+
+
+def _parse_jwk(jwk):
+    """Převede JWK na (kty, veřejný klíč). Při nepodporovaném/chybném klíči vyhodí ValueError."""
+    kty = jwk.get('kty')
+    try:
+        if kty == 'RSA':
+            return 'RSA', (_b64url_int(jwk['n']), _b64url_int(jwk['e']))
+        if kty == 'EC':
+            if jwk.get('crv') != 'P-256':
+                raise ValueError(f'Nepodporovaná křivka {jwk.get("crv")}')
+            x, y = _b64url_int(jwk['x']), _b64url_int(jwk['y'])
+            if not _p256_on_curve(x, y):
+                raise ValueError('Bod EC klíče neleží na křivce P-256')
+            return 'EC', (x, y)
+        if kty == 'oct':
+            return 'oct', _b64url_decode(jwk['k'])
+    except (KeyError, TypeError, binascii.Error) as e:
+        raise ValueError(f'Neplatný JWK ({kty}): {e}')
+    raise ValueError(f'Nepodporovaný typ klíče {kty}')
+
+
+class _KeyRing:
+    """
+    Klíče pro ověření: HMAC secret a/nebo JWKS. JWK se parsují až při prvním použití
+    a ukládají do sdílené cache podle (otisk JWKS, kid), takže opakovaně nahraný
+    stejný JWKS se neparsuje znovu.
+    """
+
+    def __init__(self, secret, jwks):
+        self.secret = secret.encode('utf-8') if secret else None
+        self.jwks = {}
+        jwks_id = b''
+        if jwks:
+            jwks_id = hashlib.blake2b(json.dumps(jwks, sort_keys=True).encode('utf-8'), digest_size=16).digest()
+            for i, jwk in enumerate(jwks.get('keys', [])):
+                if isinstance(jwk, dict):
+                    self.jwks.setdefault(jwk.get('kid', f'#{i}'), jwk)
+        self.jwks_id = jwks_id
+        self.fingerprint = hashlib.blake2b(jwks_id + (self.secret or b''), digest_size=16).digest()
+
+    def __bool__(self):
+        return bool(self.secret or self.jwks)
+
+    def key(self, kid):
+        """Vrátí (kty, klíč) pro kid; bez kid se použije jediný klíč v JWKS."""
+        if kid is None and len(self.jwks) == 1:
+            kid = next(iter(self.jwks))
+        if kid not in self.jwks:
+            raise ValueError(f'Klíč s kid „{kid}“ není v JWKS' if kid else 'Token nemá kid a JWKS obsahuje více klíčů')
+        cache_key = (self.jwks_id, kid)
+        with _cache_lock:
+            parsed = _key_cache.get(cache_key)
+            if parsed is not None:
+                _key_cache.move_to_end(cache_key)
+                return parsed
+        parsed = _parse_jwk(self.jwks[kid])
+        with _cache_lock:
+            _key_cache[cache_key] = parsed
+            if len(_key_cache) > _KEY_CACHE_SIZE:
+                _key_cache.popitem(last=False)
+        return parsed
+
+
+def _verify(header, signing_input, signature, keys):
+    """Ověří podpis tokenu. Vrátí textový stav pro výstup."""
+    alg = str(header.get('alg', ''))
+    family, bits = alg[:2], alg[2:]
+    if family not in ('HS', 'RS', 'ES') or bits not in _HASHES or (family == 'ES' and bits != '256'):
+        return f'nepodporovaný algoritmus {alg or "(chybí)"}'
+    try:
+        if family == 'HS':
+            if keys.secret is not None:
+                secret = keys.secret
+            else:
+                kty, secret = keys.key(header.get('kid'))
+                if kty != 'oct':
+                    return f'klíč pro {alg} musí být typu oct'
+            expected = hmac.new(secret, signing_input, _HASHES[bits]).digest()
+            ok = hmac.compare_digest(expected, signature)
+        else:
+            if not keys.jwks:
+                return f'pro {alg} je potřeba JWKS'
+            kty, public = keys.key(header.get('kid'))
+            if kty != ('RSA' if family == 'RS' else 'EC'):
+                return f'klíč typu {kty} nelze použít pro {alg}'
+            if family == 'RS':
+                ok = _rsa_verify(public, bits, signing_input, signature)
+            else:
+                ok = _es256_verify(public, signing_input, signature)
+    except ValueError as e:
+        return str(e)
+    return 'platný' if ok else 'neplatný'
+
+
+# ══════════════════════════════════════════════════════════════════════════════
+# Hromadné dekódování
+# ══════════════════════════════════════════════════════════════════════════════
+
+def load_keys(secret='', jwks_text=''):
+    """Připraví klíče pro ověření z HMAC secret a/nebo JWKS (JSON). Vrátí (keys, error)."""
+    jwks = None
+    if jwks_text.strip():
+        if len(jwks_text) > MAX_JWKS_INPUT:
+            return None, 'JWKS je příliš velký (max 100 KB)'
+        try:
+            jwks = json.loads(jwks_text)
+        except json.JSONDecodeError as e:
+            return None, f'Neplatný JWKS: {e}'
+        if isinstance(jwks, dict) and 'keys' not in jwks and 'kty' in jwks:
+            jwks = {'keys': [jwks]}
+        if not isinstance(jwks, dict) or not isinstance(jwks.get('keys'), list):
+            return None, 'JWKS musí být objekt s polem "keys" nebo jeden JWK.'
+    return _KeyRing(secret, jwks), None
+
+
+def _iso_utc(value):
+    if isinstance(value, bool) or not isinstance(value, (int, float)):
+        return '' if value is None else str(value)
+    try:
+        return datetime.fromtimestamp(value, tz=timezone.utc).isoformat()
+    except (ValueError, OverflowError, OSError):
+        return str(value)
+
+
+def _decode_uncached(token, keys):
+    """Dekóduje a případně ověří jeden token; vrátí dict bez čísla řádku a příznaku expirace."""
+    try:
+        header, payload, signing_input, signature = parse_token(token)
+    except ValueError as e:
+        return {'error': str(e)}
+    aud = payload.get('aud', '')
+    exp = payload.get('exp')
+    return {
+        'alg': header.get('alg', ''),
+        'kid': header.get('kid', ''),
+        'iss': payload.get('iss', ''),
+        'sub': payload.get('sub', ''),
+        'aud': ' '.join(map(str, aud)) if isinstance(aud, list) else aud,
+        'iat': _iso_utc(payload.get('iat')),
+        'exp': _iso_utc(exp),
+        '_exp': exp if isinstance(exp, (int, float)) and not isinstance(exp, bool) else None,
+        'signature': _verify(header, signing_input, signature, keys) if keys else 'neověřeno',
+        'error': '',
+    }
+
+
+def _decode_cached(token, keys):
+    """Výsledek pro token z LRU (klíč = hash tokenu + otisk klíčů); opakované tokeny nic nestojí."""
+    cache_key = hashlib.blake2b(token.encode('utf-8'), digest_size=16, key=keys.fingerprint).digest()
+    with _cache_lock:
+        cached = _result_cache.get(cache_key)
+        if cached is not None:
+            _result_cache.move_to_end(cache_key)
+            return cached
+    decoded = _decode_uncached(token, keys)
+    with _cache_lock:
+        _result_cache[cache_key] = decoded
+        if len(_result_cache) > _RESULT_CACHE_SIZE:
+            _result_cache.popitem(last=False)
+    return decoded
+
+
+def _iter_rows(lines, keys):
+    """Najde tokeny v řádcích (číslovaných od 1) a vrací řádky výsledku s klíči BULK_FIELDS."""
+    for number, line in lines:
+        for match in _TOKEN_RE.finditer(line):
+            decoded = _decode_cached(match.group(), keys)
+            row = dict.fromkeys(BULK_FIELDS, '')
+            row.update((k, v) for k, v in decoded.items() if k in row)
+            row['line'] = number
+            if decoded.get('_exp') is not None:
+                row['expired'] = decoded['_exp'] < time()
+            yield row
+
+
+def decode_bulk_text(text, keys):
+    """
+    Dekóduje všechny tokeny nalezené ve vloženém textu (např. výřez logu).
+    Vrátí (list řádků s klíči BULK_FIELDS, error).
+    """
+    if len(text) > MAX_BULK_INPUT:
+        return None, 'Vstup je příliš velký (max 1 MB)'
+    rows = []
+    for row in _iter_rows(enumerate(text.splitlines(), 1), keys):
+        if len(rows) == MAX_BULK_TOKENS:
+            return None, f'Příliš mnoho tokenů (max {MAX_BULK_TOKENS}) — pro větší objem nahraj soubor.'
+        rows.append(row)
+    if not rows:
+        return None, 'Ve vstupu nebyl nalezen žádný JWT token.'
+    return rows, None
+
+
+def decode_bulk_file(binary_stream, keys):
+    """
+    Proudově dekóduje tokeny z nahraného logu (řádek po řádku); po dočtení soubor zavře.
+    Vrátí (rows, error) kde rows je iterátor dictů s klíči BULK_FIELDS.
+    """
+    text = io.TextIOWrapper(binary_stream, encoding='utf-8', errors='replace')
+
+    def rows():
+        try:
+            yield from _iter_rows(enumerate(text, 1), keys)
+        finally:
+            text.close()
+
+    return rows(), None
+
+
+# ══════════════════════════════════════════════════════════════════════════════
+# Statistiky claimů
+# ══════════════════════════════════════════════════════════════════════════════
+
+STATS_TOP = 20
+
+# Horní meze (s) pro histogram životnosti exp − iat
+LIFETIME_BUCKETS = [
+    (300,    '≤ 5 min'),
+    (900,    '5–15 min'),
+    (3600,   '15–60 min'),
+    (21600,  '1–6 h'),
+    (86400,  '6–24 h'),
+    (604800, '1–7 dní'),
+    (None,   '> 7 dní'),
+]
+
+# Horní meze (s) pro exp − teď; záporné = již expirované
+EXPIRY_BUCKETS = [
+    (-30 * 86400, 'expirováno před > 30 dny'),
+    (-86400,      'expirováno před 1–30 dny'),
+    (0,           'expirováno během 24 h'),
+    (3600,        'vyprší do 1 h'),
+    (86400,       'vyprší do 24 h'),
+    (None,        'vyprší později'),
+]
+
+_COUNTED_CLAIMS = [('iss', 'Vydavatel (iss)'), ('aud', 'Příjemce (aud)'), ('scope', 'Scope'), ('alg', 'Algoritmus')]
+
+
+def _number(value):
+    return value if isinstance(value, (int, float)) and not isinstance(value, bool) else None
+
+
+def _bucket(buckets, value):
+    """Index prvního koše, jehož horní mez je ≥ value (poslední koš nemá mez)."""
+    for i, (limit, _) in enumerate(buckets):
+        if limit is None or value <= limit:
+            return i
+    return len(buckets) - 1
+
+
+class _ClaimStats:
+    """Průběžně skládá claimy do čítačů a histogramů; tokeny ani payloady si neuchovává."""
+
+    def __init__(self, now):
+        self.now = now
+        self.total = 0
+        self.invalid = 0
+        self.no_exp = 0
+        self.seen = set()
+        self.counters = {claim: Counter() for claim, _ in _COUNTED_CLAIMS}
+        self.lifetimes = [0] * len(LIFETIME_BUCKETS)
+        self.lifetime_sum = 0
+        self.lifetime_count = 0
+        self.expiry = [0] * len(EXPIRY_BUCKETS)
+
+    def add(self, token):
+        self.total += 1
+        self.seen.add(hashlib.blake2b(token.encode('utf-8'), digest_size=8).digest())
+        try:
+            header, payload, _, _ = parse_token(token)
+        except ValueError:
+            self.invalid += 1
+            return
+
+        counters = self.counters
+        counters['alg'][str(header.get('alg', '(chybí)'))] += 1
+        if 'iss' in payload:
+            counters['iss'][str(payload['iss'])] += 1
+        aud = payload.get('aud')
+        if aud is not None:
+            counters['aud'].update(map(str, aud) if isinstance(aud, list) else (str(aud),))
+        scope = payload.get('scope', payload.get('scp'))
+        if isinstance(scope, str):
+            counters['scope'].update(scope.split())
+        elif isinstance(scope, list):
+            counters['scope'].update(map(str, scope))
+
+        exp, iat = _number(payload.get('exp')), _number(payload.get('iat'))
+        if exp is None:
+            self.no_exp += 1
+            return
+        self.expiry[_bucket(EXPIRY_BUCKETS, exp - self.now)] += 1
+        if iat is not None:
+            self.lifetimes[_bucket(LIFETIME_BUCKETS, exp - iat)] += 1
+            self.lifetime_sum += exp - iat
+            self.lifetime_count += 1
+
+    def summary(self):
+        expired = sum(n for (limit, _), n in zip(EXPIRY_BUCKETS, self.expiry) if limit is not None and limit <= 0)
+        return {
+            'total': self.total,
+            'unique': len(self.seen),
+            'invalid': self.invalid,
+            'expired': expired,
+            'no_exp': self.no_exp,
+            'avg_lifetime': self.lifetime_sum / self.lifetime_count if self.lifetime_count else None,
+            'claims': [(label, self.counters[claim].most_common(STATS_TOP), len(self.counters[claim]))
+                       for claim, label in _COUNTED_CLAIMS],
+            'lifetimes': [(label, n) for (_, label), n in zip(LIFETIME_BUCKETS, self.lifetimes)],
+            'expiry': [(label, n) for (_, label), n in zip(EXPIRY_BUCKETS, self.expiry)],
+        }
+
+
+def _analyze(lines):
+    stats = _ClaimStats(time())
+    for line in lines:
+        for match in _TOKEN_RE.finditer(line):
+            stats.add(match.group())
+    if not stats.total:
+        return None, 'Ve vstupu nebyl nalezen žádný JWT token.'
+    return stats.summary(), None
+
+
+def analyze_text(text):
+    """Statistiky claimů tokenů ve vloženém textu. Vrátí (summary, error)."""
+    if len(text) > MAX_BULK_INPUT:
+        return None, 'Vstup je příliš velký (max 1 MB) — pro větší objem nahraj soubor.'
+    return _analyze(text.splitlines())
+
+
+def analyze_file(binary_stream):
+    """
+    Statistiky claimů tokenů v nahraném logu — jeden průchod řádek po řádku,
+    v paměti zůstávají jen čítače a 8bajtové otisky pro počet unikátních tokenů.
+    Vrátí (summary, error).
+    """
+    text = io.TextIOWrapper(binary_stream, encoding='utf-8', errors='replace')
+    try:
+        return _analyze(text)
+    finally:
+        text.close()
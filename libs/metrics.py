@@ -0,0 +1,127 @@
+"""
+Metriky latence a propustnosti nástrojů ve formátu Prometheus
+
+Každý worker sčítá do lokálního slovníku (jeden bisect a pár přičtení na požadavek)
+a jednou za FLUSH_INTERVAL sekund přelije přírůstky do SharedStore jednou transakcí.
+/metrics pak čte součty všech workerů ze sdíleného SQLite souboru.
+"""
+
+import threading
+import time
+from bisect import bisect_left
+from collections import defaultdict
+
+# Horní meze histogramu latence v sekundách (+Inf se dopočítá z počtu)
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+
+FLUSH_INTERVAL = 5.0
+
+# Sdílené čítače prakticky nevyprší (Prometheus reset čítače stejně zvládá)
+RETENTION = 365 * 24 * 3600
+
+_PREFIX = 'metrics:'
+_SEP = '\x1f'
+
+_HELP = {
+    'dd_tool_requests_total':          ('counter',   'Počet požadavků na nástroj a akci'),
+    'dd_tool_errors_total':            ('counter',   'Požadavky, které skončily chybou (HTTP >= 400 nebo chyba ve výsledku)'),
+    'dd_tool_input_bytes_total':       ('counter',   'Součet velikostí vstupů (Content-Length) v bajtech'),
+    'dd_tool_duration_seconds':        ('histogram', 'Doba zpracování požadavku v sekundách'),
+    'dd_result_cache_requests_total':  ('counter',   'Dotazy na cache výsledků podle nástroje a výsledku'),
+    'dd_sandbox_kills_total':          ('counter',   'Volání zabitá izolací (libs/sandbox) podle důvodu'),
+}
+
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+class Metrics:
+    """
+    Sběr metrik jednoho procesu se sdíleným úložištěm (libs.shared_store.SharedStore).
+
+    Doba se ukládá v mikrosekundách jako celé číslo, aby šla sčítat atomickým incr.
+    """
+
+    def __init__(self, store, flush_interval=FLUSH_INTERVAL):
+        self.store = store
+        self.flush_interval = flush_interval
+        self._pending = defaultdict(int)
+        self._sources = []
+        self._labels = {}
+        self._lock = threading.Lock()
+        self._last_flush = time.monotonic()
+
+    def observe(self, tool, action, seconds, input_bytes=0, error=False):
+        """Zaznamená jeden požadavek; případně přelije přírůstky do sdíleného úložiště."""
+        base = f'{_SEP}{tool}{_SEP}{action}'
+        pending = self._pending
+        with self._lock:
+            pending['dd_tool_requests_total' + base] += 1
+            pending['dd_tool_duration_seconds_sum' + base] += int(seconds * 1_000_000)
+            pending[f'dd_tool_duration_seconds_bucket{base}{_SEP}{bisect_left(LATENCY_BUCKETS, seconds)}'] += 1
+            if input_bytes:
+                pending['dd_tool_input_bytes_total' + base] += input_bytes
+            if error:
+                pending['dd_tool_errors_total' + base] += 1
+        if time.monotonic() - self._last_flush >= self.flush_interval:
+            self.flush()
+
+    def track(self, name, read, labels=('result',)):
+        """
+        Přidá zdroj kumulativních čítačů: read() vrací {hodnoty labelů: počet} — n-tici v pořadí labels,
+        u jediného labelu stačí samotná hodnota. Při flush se do úložiště zapíše jen rozdíl od minulého čtení.
+        """
+        self._sources.append((name, read, {}))
+        self._labels[name] = labels
+
+    def flush(self):
+        """Zapíše nasbírané přírůstky jednou transakcí."""
+        with self._lock:
+            self._last_flush = time.monotonic()
+            for name, read, previous in self._sources:
+                for key, value in read().items():
+                    delta = value - previous.get(key, 0)
+                    if delta:
+                        values = key if isinstance(key, tuple) else (key,)
+                        self._pending[_SEP.join((name, *map(str, values)))] += delta
+                        previous[key] = value
+            pending, self._pending = self._pending, defaultdict(int)
+        if pending:
+            self.store.incr_many({_PREFIX + key: value for key, value in pending.items()}, RETENTION)
+
+    def render(self):
+        """Vrátí součty všech workerů v textovém formátu Prometheus."""
+        self.flush()
+        series = defaultdict(list)
+        histograms = defaultdict(lambda: {'buckets': [0] * (len(LATENCY_BUCKETS) + 1), 'sum': 0})
+        for key, value in self.store.counters(_PREFIX):
+            name, *labels = key[len(_PREFIX):].split(_SEP)
+            if name == 'dd_tool_duration_seconds_bucket':
+                histograms[tuple(labels[:2])]['buckets'][int(labels[2])] += value
+            elif name == 'dd_tool_duration_seconds_sum':
+                histograms[tuple(labels)]['sum'] += value
+            else:
+                series[name].append((labels, value))
+
+        lines = []
+        for name, (kind, text) in _HELP.items():
+            lines.append(f'# HELP {name} {text}')
+            lines.append(f'# TYPE {name} {kind}')
+            if kind == 'histogram':
+                for (tool, action), hist in sorted(histograms.items()):
+                    labels = f'tool="{_escape(tool)}",action="{_escape(action)}"'
+                    total = 0
+                    for bound, count in zip((*LATENCY_BUCKETS, '+Inf'), hist['buckets']):
+                        total += count
+                        lines.append(f'{name}_bucket{{{labels},le="{bound}"}} {total}')
+                    lines.append(f'{name}_sum{{{labels}}} {hist["sum"] / 1_000_000}')
+                    lines.append(f'{name}_count{{{labels}}} {total}')
+            else:
+                names = self._labels.get(name, ('tool', 'action'))
+                for values, value in series[name]:
+                    if len(values) != len(names):
+                        continue  # záznam z doby, kdy měl zdroj jiné labely (např. cache bez 'tool')
+                    labels = ','.join(f'{label}="{_escape(v)}"' for label, v in zip(names, values))
+                    lines.append(f'{name}{{{labels}}} {value}')
+        return '\n'.join(lines) + '\n'
@@ -0,0 +1,40 @@
+"""
+Cache předrenderovaných stránek (GET bez výsledku) s ETagem
+"""
+
+import hashlib
+import threading
+from collections import OrderedDict
+
+MAX_PAGES = 256
+
+
+class PageCache:
+    """LRU cache těl stránek: klíč → (bajty, etag). Per-proces, vláknově bezpečná."""
+
+    def __init__(self, max_entries=MAX_PAGES):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        """Vrátí (body, etag), nebo None."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+            return entry
+
+    def put(self, key, body):
+        """Uloží tělo stránky; ETag je obsahový hash, takže je stejný ve všech workerech. Vrátí (body, etag)."""
+        entry = (body, hashlib.blake2b(body, digest_size=16).hexdigest())
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return entry
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
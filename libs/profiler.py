@@ -0,0 +1,169 @@
+"""
+Vzorkovací profiler požadavků a ukládání profilů pro flame graf
+
+SamplingProfiler v samostatném vlákně každou INTERVAL sekundu přečte zásobník
+profilovaného vlákna (sys._current_frames) a počítá shodné zásobníky. Výsledek se
+ukládá ve formátu collapsed stacks ("a;b;c počet", jako flamegraph.pl / speedscope)
+do kruhového bufferu ve sdíleném úložišti, takže ho vidí všechny workery.
+"""
+
+import json
+import os
+import sys
+import threading
+import time
+from collections import Counter
+from functools import lru_cache
+
+INTERVAL = 0.001
+MAX_DEPTH = 200
+
+# Kruhový buffer posledních profilů ve SharedStore
+RING_SIZE = 20
+PROFILE_TTL = 24 * 3600
+
+# Políčka užší než tento podíl vzorků se ve flame grafu nekreslí
+MIN_FRACTION = 0.005
+
+_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+_PREFIX = 'profiles:'
+
+
+@lru_cache(maxsize=4096)
+def _label(code):
+    """Popisek rámce: cesta v repozitáři (libs/formatter.py), jinak balíček/soubor, + funkce."""
+    path = code.co_filename
+    if path.startswith(_ROOT + os.sep):
+        path = os.path.relpath(path, _ROOT)
+    else:
+        parts = path.split(os.sep)
+        path = '/'.join(parts[-2:])
+    return f'{path}:{code.co_qualname}'
+
+
+class SamplingProfiler:
+    """Vzorkuje zásobník vlákna, které zavolalo start(), dokud se nezavolá stop()."""
+
+    def __init__(self, interval=INTERVAL):
+        self.interval = interval
+        self.samples = Counter()
+        self.duration = 0.0
+        self._stop = threading.Event()
+        self._thread_id = None
+        self._sampler = None
+        self._started = 0.0
+
+    def start(self):
+        self._thread_id = threading.get_ident()
+        self._started = time.perf_counter()
+        self._sampler = threading.Thread(target=self._run, name='profiler', daemon=True)
+        self._sampler.start()
+
+    def _run(self):
+        current_frames, samples, thread_id = sys._current_frames, self.samples, self._thread_id
+        while not self._stop.wait(self.interval):
+            frame = current_frames().get(thread_id)
+            stack = []
+            while frame is not None and len(stack) < MAX_DEPTH:
+                stack.append(_label(frame.f_code))
+                frame = frame.f_back
+            if stack:
+                stack.reverse()
+                samples[tuple(stack)] += 1
+
+    def stop(self):
+        """Zastaví vzorkování a vrátí Counter {zásobník: počet vzorků}."""
+        self._stop.set()
+        self._sampler.join()
+        self.duration = time.perf_counter() - self._started
+        return self.samples
+
+
+def collapse(samples):
+    """
+    Převede vzorky na collapsed stacks. Společný začátek všech zásobníků (server, Flask
+    dispatch) se zkrátí na poslední společný rámec, aby graf začínal u view.
+    """
+    if not samples:
+        return ''
+    stacks = list(samples)
+    common = 0
+    for frames in zip(*stacks):
+        if len(set(frames)) != 1:
+            break
+        common += 1
+    common = max(0, min(common, min(map(len, stacks))) - 1)
+    lines = [f'{";".join(stack[common:])} {count}' for stack, count in samples.items()]
+    return '\n'.join(sorted(lines))
+
+
+def flame_rows(collapsed, min_fraction=MIN_FRACTION):
+    """
+    Rozloží collapsed stacks do řádků icicle grafu (kořen nahoře).
+    Vrátí (total, rows), kde rows[hloubka] je list dictů {name, left, width, count}
+    s left/width v procentech.
+    """
+    tree = {'children': {}, 'count': 0}
+    for line in collapsed.splitlines():
+        stack, _, count = line.rpartition(' ')
+        if not stack:
+            continue
+        count = int(count)
+        tree['count'] += count
+        node = tree
+        for name in stack.split(';'):
+            node = node['children'].setdefault(name, {'children': {}, 'count': 0})
+            node['count'] += count
+
+    total = tree['count']
+    rows = []
+    if not total:
+        return 0, rows
+
+    def place(children, depth, left):
+        for name, node in sorted(children.items()):
+            width = node['count'] / total
+            if width >= min_fraction:
+                if len(rows) <= depth:
+                    rows.append([])
+                rows[depth].append({'name': name, 'left': left * 100, 'width': width * 100, 'count': node['count']})
+                place(node['children'], depth + 1, left)
+            left += width
+
+    place(tree['children'], 0, 0.0)
+    return total, rows
+
+
+class ProfileStore:
+    """Posledních RING_SIZE profilů ve SharedStore (sdílené mezi workery)."""
+
+    def __init__(self, store, size=RING_SIZE, ttl=PROFILE_TTL):
+        self.store = store
+        self.size = size
+        self.ttl = ttl
+
+    def add(self, meta, collapsed):
+        """Uloží profil do dalšího slotu (nejstarší se přepíše). Vrátí jeho pořadové číslo."""
+        seq = self.store.incr(_PREFIX + 'seq', 10 * 365 * 24 * 3600)
+        record = dict(meta, seq=seq, collapsed=collapsed)
+        self.store.set_value(f'{_PREFIX}{seq % self.size}',
+                             json.dumps(record, ensure_ascii=False).encode(), self.ttl)
+        return seq
+
+    def get(self, seq):
+        data = self.store.get_value(f'{_PREFIX}{seq % self.size}')
+        if data is None:
+            return None
+        record = json.loads(data)
+        return record if record['seq'] == seq else None
+
+    def recent(self):
+        """Uložené profily od nejnovějšího (bez collapsed textu)."""
+        records = []
+        for slot in range(self.size):
+            data = self.store.get_value(f'{_PREFIX}{slot}')
+            if data is not None:
+                record = json.loads(data)
+                record.pop('collapsed', None)
+                records.append(record)
+        return sorted(records, key=lambda r: r['seq'], reverse=True)
@@ -0,0 +1,214 @@
+"""
+Obsahově adresovaná cache výsledků deterministických nástrojů
+
+Klíč je blake2b z (nástroj, funkce, verze modulu, argumenty) — vstup se hashuje
+přímo, takže opakované odeslání stejného 1MB dokumentu se nepřepočítává.
+Hodnoty se ukládají serializované přes marshal (str/dict/list/tuple/čísla): přesná
+velikost pro bajtový rozpočet, cache nejde zmutovat přes vrácený objekt a disková
+vrstva nemůže spustit kód jako pickle.
+"""
+
+import hashlib
+import marshal
+import os
+import sys
+import tempfile
+import threading
+from collections import OrderedDict, defaultdict
+from functools import lru_cache
+
+# Jednotlivý výsledek větší než tento podíl rozpočtu se necachuje
+_MAX_ENTRY_FRACTION = 8
+
+# Po kolika zápisech na disk se přepočítá velikost diskové vrstvy
+_DISK_SWEEP_EVERY = 64
+
+
+@lru_cache(maxsize=None)
+def _module_version(module_name):
+    """Čas změny souboru modulu — po nasazení nové verze se staré klíče přestanou trefovat."""
+    path = getattr(sys.modules.get(module_name), '__file__', None)
+    try:
+        return str(os.stat(path).st_mtime_ns) if path else ''
+    except OSError:
+        return ''
+
+
+def make_key(tool, fn, args, kwargs):
+    """Hex klíč z nástroje, funkce a jejích argumentů (řetězce se hashují bez kopírování do repr)."""
+    h = hashlib.blake2b(digest_size=20)
+    h.update(f'{tool}\0{fn.__module__}.{fn.__qualname__}\0{_module_version(fn.__module__)}\0'.encode())
+    for value in (*args, *sorted(kwargs.items())):
+        if isinstance(value, str):
+            data = value.encode('utf-8', 'surrogatepass')
+            h.update(b's%d:' % len(data))
+            h.update(data)
+        else:
+            data = repr(value).encode('utf-8', 'surrogatepass')
+            h.update(b'r%d:' % len(data))
+            h.update(data)
+    return h.hexdigest()
+
+
+class ResultCache:
+    """
+    LRU cache s rozpočtem v bajtech a volitelnou diskovou vrstvou.
+
+    Paměťová vrstva je per-proces; disková (disk_dir) je sdílená mezi workery —
+    zápis přes dočasný soubor + os.replace je atomický.
+    """
+
+    def __init__(self, max_bytes=64 * 1024 * 1024, disk_dir=None, disk_max_bytes=256 * 1024 * 1024):
+        self.max_bytes = max_bytes
+        self.disk_dir = disk_dir if disk_max_bytes else None
+        self.disk_max_bytes = disk_max_bytes
+        self._entries = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self._disk_bytes = None
+        self._disk_writes = 0
+        self.hits = self.disk_hits = self.misses = self.evictions = 0
+        self.tool_counts = defaultdict(int)  # (nástroj, 'memory_hit' | 'disk_hit' | 'miss') → počet
+        if self.disk_dir:
+            os.makedirs(self.disk_dir, mode=0o700, exist_ok=True)
+
+    def call(self, tool, fn, *args, **kwargs):
+        """Vrátí fn(*args, **kwargs) z cache, nebo ho spočítá a uloží."""
+        key = make_key(tool, fn, args, kwargs)
+        data = self._get(key, tool)
+        if data is not None:
+            return marshal.loads(data)
+        result = fn(*args, **kwargs)
+        try:
+            data = marshal.dumps(result)
+        except ValueError:
+            return result  # nepodporovaný typ výsledku — jen se necachuje
+        self._put(key, data)
+        return result
+
+    def tool_stats(self):
+        """Zásahy a minutí podle nástroje: {(nástroj, výsledek): počet} (pro libs.metrics)."""
+        with self._lock:
+            return dict(self.tool_counts)
+
+    def stats(self):
+        """Počítadla zásahů a obsazenost paměťové vrstvy."""
+        with self._lock:
+            return {
+                'hits': self.hits,
+                'disk_hits': self.disk_hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'entries': len(self._entries),
+                'bytes': self._bytes,
+                'max_bytes': self.max_bytes,
+            }
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    # ── paměťová vrstva ──────────────────────────────────────────────────────
+
+    def _get(self, key, tool):
+        with self._lock:
+            data = self._entries.get(key)
+            if data is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                self.tool_counts[tool, 'memory_hit'] += 1
+                return data
+        data = self._disk_get(key)
+        with self._lock:
+            if data is None:
+                self.misses += 1
+                self.tool_counts[tool, 'miss'] += 1
+                return None
+            self.disk_hits += 1
+            self.tool_counts[tool, 'disk_hit'] += 1
+        self._memory_put(key, data)
+        return data
+
+    def _put(self, key, data):
+        if len(data) > self.max_bytes // _MAX_ENTRY_FRACTION:
+            return
+        self._memory_put(key, data)
+        self._disk_put(key, data)
+
+    def _memory_put(self, key, data):
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self._bytes -= len(old)
+            self._entries[key] = data
+            self._bytes += len(data)
+            while self._bytes > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self._bytes -= len(evicted)
+                self.evictions += 1
+
+    # ── disková vrstva ───────────────────────────────────────────────────────
+
+    def _disk_path(self, key):
+        return os.path.join(self.disk_dir, key[:2], key)
+
+    def _disk_get(self, key):
+        if not self.disk_dir:
+            return None
+        path = self._disk_path(key)
+        try:
+            with open(path, 'rb') as f:
+                data = f.read()
+            os.utime(path)  # mtime slouží jako LRU pořadí při úklidu
+        except OSError:
+            return None
+        return data
+
+    def _disk_put(self, key, data):
+        if not self.disk_dir or len(data) > self.disk_max_bytes // _MAX_ENTRY_FRACTION:
+            return
+        path = self._disk_path(key)
+        try:
+            os.makedirs(os.path.dirname(path), mode=0o700, exist_ok=True)
+            fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path), prefix='.tmp-')
+            with os.fdopen(fd, 'wb') as f:
+                f.write(data)
+            os.replace(tmp, path)
+        except OSError:
+            return
+        with self._lock:
+            self._disk_writes += 1
+            if self._disk_bytes is not None:
+                self._disk_bytes += len(data)
+            sweep = (self._disk_bytes is None or self._disk_bytes > self.disk_max_bytes
+                     or self._disk_writes % _DISK_SWEEP_EVERY == 0)
+        if sweep:
+            self._disk_sweep()
+
+    def _disk_sweep(self):
+        """Sečte diskovou vrstvu a nad rozpočtem smaže nejdéle nepoužité soubory (na 80 %)."""
+        files = []
+        for sub in os.scandir(self.disk_dir):
+            if not sub.is_dir():
+                continue
+            for entry in os.scandir(sub.path):
+                try:
+                    st = entry.stat()
+                except OSError:
+                    continue
+                files.append((st.st_mtime, st.st_size, entry.path))
+        total = sum(size for _, size, _ in files)
+        if total > self.disk_max_bytes:
+            files.sort()
+            target = self.disk_max_bytes * 4 // 5
+            for _, size, path in files:
+                if total <= target:
+                    break
+                try:
+                    os.remove(path)
+                except OSError:
+                    continue
+                total -= size
+        with self._lock:
+            self._disk_bytes = total
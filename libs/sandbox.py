@@ -0,0 +1,165 @@
+"""
+Izolované spouštění drahých volání nástrojů v omezeném poolu procesů
+
+Patologický vstup (YAML aliasy, obří diff, řídký cron rozvrh) by jinak držel
+gunicorn worker i všechny požadavky za ním. Volání běží v pomocném procesu
+s limitem času (po vypršení se proces zabije) a paměti (RLIMIT_AS). Pomocné
+procesy jsou čisté interprety (python -m libs.sandbox), takže nedědí vlákna, SQLite
+spojení ani celou aplikaci, a zůstávají běžet pro další volání — režie jednoho
+volání je jen předání argumentů a výsledku přes pipe.
+
+Hlídají se jen funkce vracející (výsledek, chyba); překročení limitu se vrátí
+jako (None, FailureMessage).
+"""
+
+import importlib
+import os
+import subprocess
+import sys
+import threading
+import time
+from functools import wraps
+from multiprocessing.connection import Connection
+
+try:
+    import resource
+except ImportError:  # Windows — paměťový limit se nenastaví, časový platí dál
+    resource = None
+
+# Počet pomocných procesů na worker = počet souběžně hlídaných volání
+POOL_SIZE = 2
+
+MB = 1024 * 1024
+
+_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+class FailureMessage(str):
+    """
+    Chybová hláška izolace. Je to str, takže ji šablony zobrazí jako každou jinou
+    chybu; marshal ale podtřídy neserializuje, a tak ji cache výsledků neuloží.
+    """
+
+
+def _serve(receiver, sender):
+    """Smyčka pomocného procesu: přijme (fn, args, kwargs, paměť), vrátí (stav, výsledek)."""
+    while True:
+        try:
+            fn, args, kwargs, memory = receiver.recv()
+        except EOFError:
+            return
+        if resource is not None and memory:
+            hard = resource.getrlimit(resource.RLIMIT_AS)[1]
+            limit = memory if hard == resource.RLIM_INFINITY else min(memory, hard)
+            resource.setrlimit(resource.RLIMIT_AS, (limit, hard))
+        try:
+            reply = ('ok', fn(*args, **kwargs))
+        except MemoryError:
+            reply = ('memory', None)
+        except Exception as e:
+            reply = ('error', str(e))
+        finally:
+            if resource is not None and memory:
+                resource.setrlimit(resource.RLIMIT_AS, (hard, hard))
+        sender.send(reply)
+        if reply[0] == 'memory':
+            return  # po MemoryError může být halda rozbitá — proces se nahradí novým
+
+
+class Sandbox:
+    """
+    Pool pomocných procesů jednoho workeru. Procesy se startují líně a po každém
+    zabití (timeout, paměť) se nahradí novým.
+    """
+
+    def __init__(self, size=POOL_SIZE, preload=()):
+        self.size = size
+        self.preload = list(preload)
+        self.timeouts = 0
+        self.memory_errors = 0
+        self._slots = threading.BoundedSemaphore(size)
+        self._idle = []
+        self._lock = threading.Lock()
+        self._pid = None
+
+    def _spawn(self):
+        with self._lock:
+            if self._pid != os.getpid():  # nový worker po forku — pool rodiče nepatří nám
+                self._idle = []
+                self._pid = os.getpid()
+            if self._idle:
+                return self._idle.pop()
+        from_parent, to_child = os.pipe()
+        from_child, to_parent = os.pipe()
+        process = subprocess.Popen(
+            [sys.executable, '-m', 'libs.sandbox', str(from_parent), str(to_parent), *self.preload],
+            cwd=_ROOT, pass_fds=(from_parent, to_parent), stdin=subprocess.DEVNULL,
+        )
+        os.close(from_parent)
+        os.close(to_parent)
+        return process, Connection(to_child, readable=False), Connection(from_child, writable=False)
+
+    def _release(self, worker, healthy):
+        process, sender, receiver = worker
+        if healthy:
+            with self._lock:
+                self._idle.append(worker)
+        else:
+            process.kill()
+            process.wait()
+            sender.close()
+            receiver.close()
+        self._slots.release()
+
+    def call(self, fn, args, kwargs, timeout, memory_mb=None):
+        """
+        Spustí fn(*args, **kwargs) v pomocném procesu. Čekání na volný proces se
+        započítává do timeoutu. Vrátí výsledek fn, nebo (None, FailureMessage).
+        """
+        deadline = time.monotonic() + timeout
+        if not self._slots.acquire(timeout=timeout):
+            return None, FailureMessage('Server je přetížený drahými výpočty, zkus to prosím za chvíli.')
+        try:
+            worker = self._spawn()
+        except OSError:
+            self._slots.release()
+            return None, FailureMessage('Zpracování selhalo (nepodařilo se spustit pomocný proces).')
+        _, sender, receiver = worker
+        try:
+            sender.send((fn, args, kwargs, memory_mb * MB if memory_mb else None))
+            ready = receiver.poll(max(0.0, deadline - time.monotonic()))
+            status, value = receiver.recv() if ready else (None, None)
+        except (EOFError, OSError):
+            self._release(worker, healthy=False)
+            return None, FailureMessage('Zpracování selhalo (pomocný proces neočekávaně skončil).')
+
+        if not ready:
+            self.timeouts += 1
+            self._release(worker, healthy=False)
+            return None, FailureMessage(f'Zpracování překročilo časový limit {timeout:g} s — vstup je na tento nástroj příliš náročný.')
+        if status == 'memory':
+            self.memory_errors += 1
+            self._release(worker, healthy=False)
+            return None, FailureMessage(f'Zpracování překročilo paměťový limit {memory_mb} MB — vstup je na tento nástroj příliš náročný.')
+        self._release(worker, healthy=True)
+        if status == 'error':
+            return None, FailureMessage(f'Chyba: {value}')
+        return value
+
+    def guard(self, fn, timeout, memory_mb=None):
+        """Obalí fn tak, aby běžela v poolu. Zachová jméno i modul kvůli klíčům cache výsledků."""
+        @wraps(fn)
+        def guarded(*args, **kwargs):
+            return self.call(fn, args, kwargs, timeout, memory_mb)
+        return guarded
+
+    def stats(self):
+        """Počty zabitých volání podle důvodu (pro libs.metrics)."""
+        return {'timeout': self.timeouts, 'memory': self.memory_errors}
+
+
+if __name__ == '__main__':
+    # python -m libs.sandbox <fd pro čtení> <fd pro zápis> [moduly k přednačtení…]
+    for name in sys.argv[3:]:
+        importlib.import_module(name)
+    _serve(Connection(int(sys.argv[1]), writable=False), Connection(int(sys.argv[2]), readable=False))
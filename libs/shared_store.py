@@ -0,0 +1,181 @@
+"""
+Sdílené úložiště pro gunicorn workery bez externí služby (SQLite ve WAL režimu)
+
+SharedStore nabízí atomické čítače s expirací a bloby s TTL; SQLiteStorage ho
+zpřístupňuje Flask-Limiteru pod schématem sqlite:///cesta/k/souboru.db, takže
+limit 60/min platí pro všechny workery dohromady, ne pro každý zvlášť.
+"""
+
+import os
+import sqlite3
+import threading
+import time
+import urllib.parse
+
+from limits.storage import Storage
+
+# Expirované řádky se mažou jedním DELETE nejvýš jednou za tolik sekund (na proces)
+SWEEP_INTERVAL = 30
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS counters (
+    key     TEXT PRIMARY KEY,
+    value   INTEGER NOT NULL,
+    expires REAL NOT NULL
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS blobs (
+    key     TEXT PRIMARY KEY,
+    value   BLOB NOT NULL,
+    expires REAL NOT NULL
+) WITHOUT ROWID;
+"""
+
+# Jeden příkaz = atomický i mezi procesy; prošlý čítač začíná znovu od amount
+_UPSERT_SQL = """
+INSERT INTO counters (key, value, expires) VALUES (:key, :amount, :expires)
+ON CONFLICT (key) DO UPDATE SET
+    value   = CASE WHEN expires <= :now THEN excluded.value ELSE value + excluded.value END,
+    expires = CASE WHEN expires <= :now THEN excluded.expires ELSE expires END
+"""
+_INCR_SQL = _UPSERT_SQL + 'RETURNING value'
+
+
+class SharedStore:
+    """
+    Klíč–hodnota úložiště v jednom SQLite souboru sdíleném mezi procesy.
+
+    Spojení je per vlákno a per proces (po forku se otevře nové); zápisy běží
+    v autocommit režimu, WAL dovoluje souběžné čtení během zápisu.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._local = threading.local()
+        self._last_sweep = 0.0
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._connect()
+
+    def _connect(self):
+        local = self._local
+        if getattr(local, 'pid', None) != os.getpid():
+            conn = sqlite3.connect(self.path, timeout=5, isolation_level=None, check_same_thread=False)
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            conn.executescript(_SCHEMA)
+            local.conn, local.pid = conn, os.getpid()
+        return local.conn
+
+    def _maybe_sweep(self, conn, now):
+        """Dávkový úklid expirovaných řádků — místo mazání při každém čtení."""
+        if now - self._last_sweep < SWEEP_INTERVAL:
+            return
+        self._last_sweep = now
+        conn.execute('DELETE FROM counters WHERE expires <= ?', (now,))
+        conn.execute('DELETE FROM blobs WHERE expires <= ?', (now,))
+
+    # ── čítače ───────────────────────────────────────────────────────────────
+
+    def incr(self, key, expiry, amount=1):
+        """Atomicky přičte amount; nový (nebo prošlý) čítač vyprší za expiry sekund. Vrátí novou hodnotu."""
+        conn = self._connect()
+        now = time.time()
+        self._maybe_sweep(conn, now)
+        row = conn.execute(_INCR_SQL, {'key': key, 'amount': amount, 'expires': now + expiry, 'now': now}).fetchone()
+        return row[0]
+
+    def incr_many(self, amounts, expiry):
+        """Přičte {klíč: amount} v jedné transakci — pro dávkové zápisy (metriky)."""
+        conn = self._connect()
+        now = time.time()
+        self._maybe_sweep(conn, now)
+        params = [{'key': key, 'amount': amount, 'expires': now + expiry, 'now': now}
+                  for key, amount in amounts.items()]
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            conn.executemany(_UPSERT_SQL, params)
+        except BaseException:
+            conn.execute('ROLLBACK')
+            raise
+        conn.execute('COMMIT')
+
+    def counters(self, prefix):
+        """Vrátí [(klíč, hodnota)] živých čítačů začínajících prefix, seřazené podle klíče."""
+        return self._connect().execute(
+            'SELECT key, value FROM counters WHERE key >= ? AND key < ? AND expires > ? ORDER BY key',
+            (prefix, prefix + '\U0010ffff', time.time())).fetchall()
+
+    def get(self, key):
+        row = self._connect().execute(
+            'SELECT value FROM counters WHERE key = ? AND expires > ?', (key, time.time())).fetchone()
+        return row[0] if row else 0
+
+    def get_expiry(self, key):
+        now = time.time()
+        row = self._connect().execute(
+            'SELECT expires FROM counters WHERE key = ? AND expires > ?', (key, now)).fetchone()
+        return row[0] if row else now
+
+    def clear(self, key):
+        self._connect().execute('DELETE FROM counters WHERE key = ?', (key,))
+
+    def reset(self):
+        """Smaže všechny čítače. Vrátí jejich počet."""
+        return self._connect().execute('DELETE FROM counters').rowcount
+
+    def ping(self):
+        """Ověří, že databáze odpovídá."""
+        try:
+            self._connect().execute('SELECT 1')
+            return True
+        except sqlite3.Error:
+            return False
+
+    # ── bloby (např. pro cache výsledků) ─────────────────────────────────────
+
+    def get_value(self, key):
+        """Vrátí uložené bajty, nebo None (chybí / vypršelo)."""
+        row = self._connect().execute(
+            'SELECT value FROM blobs WHERE key = ? AND expires > ?', (key, time.time())).fetchone()
+        return row[0] if row else None
+
+    def set_value(self, key, value, ttl):
+        conn = self._connect()
+        now = time.time()
+        self._maybe_sweep(conn, now)
+        conn.execute('INSERT OR REPLACE INTO blobs (key, value, expires) VALUES (?, ?, ?)',
+                     (key, value, now + ttl))
+
+    def delete_value(self, key):
+        self._connect().execute('DELETE FROM blobs WHERE key = ?', (key,))
+
+
+class SQLiteStorage(Storage):
+    """Backend Flask-Limiteru (fixed-window) nad SharedStore: storage_uri='sqlite:///cesta.db'."""
+
+    STORAGE_SCHEME = ['sqlite']
+
+    def __init__(self, uri=None, wrap_exceptions=False, **options):
+        self.store = SharedStore(urllib.parse.urlparse(uri).path)
+        super().__init__(uri, wrap_exceptions=wrap_exceptions, **options)
+
+    @property
+    def base_exceptions(self):
+        return sqlite3.Error
+
+    def incr(self, key, expiry, amount=1):
+        return self.store.incr(key, expiry, amount)
+
+    def get(self, key):
+        return self.store.get(key)
+
+    def get_expiry(self, key):
+        return self.store.get_expiry(key)
+
+    def check(self):
+        return self.store.ping()
+
+    def reset(self):
+        return self.store.reset()
+
+    def clear(self, key):
+        self.store.clear(key)
@@ -0,0 +1,100 @@
+"""
+Knihovna pro streamovaný export řádků do CSV a NDJSON
+"""
+
+import csv
+import io
+import json
+
+FORMATS = [
+    ('csv',    'CSV'),
+    ('ndjson', 'NDJSON'),
+]
+
+MIMETYPES = {
+    'csv':    'text/csv',
+    'ndjson': 'application/x-ndjson',
+}
+
+# Výsledky textových nástrojů ke stažení (přípona → mimetype)
+TEXT_MIMETYPES = {
+    'json': 'application/json',
+    'csv':  'text/csv',
+    'yaml': 'application/yaml',
+    'xml':  'application/xml',
+    'diff': 'text/x-diff',
+}
+
+# Řádky se skládají do bloků ~64 KB, aby WSGI server neposílal každý řádek zvlášť
+CHUNK_SIZE = 64 * 1024
+
+
+def _csv_chunks(rows, delimiter):
+    buffer = io.StringIO()
+    writer = None
+    for row in rows:
+        if writer is None:
+            writer = csv.DictWriter(buffer, fieldnames=list(row.keys()),
+                                    delimiter=delimiter, extrasaction='ignore')
+            writer.writeheader()
+        writer.writerow(row)
+        if buffer.tell() >= CHUNK_SIZE:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue()
+
+
+def _ndjson_chunks(rows):
+    parts = []
+    size = 0
+    for row in rows:
+        line = json.dumps(row, ensure_ascii=False)
+        parts.append(line)
+        size += len(line) + 1
+        if size >= CHUNK_SIZE:
+            yield '\n'.join(parts) + '\n'
+            parts = []
+            size = 0
+    if parts:
+        yield '\n'.join(parts) + '\n'
+
+
+def stream_rows(rows, fmt, delimiter=','):
+    """
+    Převede iterátor dictů na iterátor textových bloků v požadovaném formátu.
+    Hlavička CSV se bere z klíčů prvního řádku; paměť je konstantní.
+    """
+    if fmt == 'ndjson':
+        return _ndjson_chunks(rows)
+    return _csv_chunks(rows, delimiter)
+
+
+def stream_lines(lines, encoding='utf-8'):
+    """
+    Složí iterátor textových řádků (včetně konců řádků) do bajtových bloků ~CHUNK_SIZE.
+    Nedekódovatelné bajty ze vstupu (surrogateescape) se zapíší beze změny.
+    """
+    parts = []
+    size = 0
+    for line in lines:
+        parts.append(line)
+        size += len(line)
+        if size >= CHUNK_SIZE:
+            yield ''.join(parts).encode(encoding, 'surrogateescape')
+            parts = []
+            size = 0
+    if parts:
+        yield ''.join(parts).encode(encoding, 'surrogateescape')
+
+
+def stream_text(text, encoding='utf-8'):
+    """Pošle hotový text po blocích ~CHUNK_SIZE — kóduje se a komprimuje postupně, ne celý najednou."""
+    for start in range(0, len(text), CHUNK_SIZE):
+        yield text[start:start + CHUNK_SIZE].encode(encoding, 'surrogateescape')
+
+
+def download_name(basename, fmt):
+    """Vrátí název souboru ke stažení, např. ucty.csv."""
+    return f'{basename}.{fmt if fmt in MIMETYPES else "csv"}'
@@ -2,10 +2,18 @@
 Knihovna pro různé utility: Unix timestamp, unescape
 """
 
+import codecs
+import heapq
 import html
+import io
 import json
 import re
-from datetime import date, datetime, timezone
+import tempfile
+from bisect import bisect_right
+from datetime import date, datetime, timedelta, timezone
+from decimal import Decimal, InvalidOperation
+from functools import lru_cache
+from itertools import chain, islice
 from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
 
 MAX_INPUT = 100_000
@@ -35,26 +43,18 @@ def datetime_to_timestamp(dt_str, unit='s', timezone_name='UTC'):
         tz = timezone.utc
         timezone_name = 'UTC'
 
-    formats = [
-        '%Y-%m-%dT%H:%M:%S',
-        '%Y-%m-%d %H:%M:%S',
-        '%Y-%m-%d %H:%M',
-        '%Y-%m-%d',
-        '%d.%m.%Y %H:%M:%S',
-        '%d.%m.%Y %H:%M',
-        '%d.%m.%Y',
-    ]
-
     if not dt_str or not dt_str.strip():
         dt = datetime.now(tz=tz)
     else:
         dt = None
-        for fmt in formats:
+        _, parts = _match_datetime(dt_str.strip(), DT_FORMATS[:7])
+        if parts:
+            y, mo, d, h, mi, sec, ns, offset = parts
             try:
-                dt = datetime.strptime(dt_str.strip(), fmt).replace(tzinfo=tz)
-                break
+                zone = tz if offset is None else timezone(timedelta(seconds=offset))
+                dt = datetime(y, mo, d, h, mi, sec, ns // 1000, tzinfo=zone)
             except ValueError:
-                continue
+                dt = None
         if dt is None:
             return None, 'Nepodporovaný formát. Použij např. 2024-01-15 09:30:00 nebo 15.01.2024 09:30:00'
 
@@ -70,6 +70,711 @@ def datetime_to_timestamp(dt_str, unit='s', timezone_name='UTC'):
     return {'value': value, 'unit': normalized_unit, 'timezone': timezone_name}, None
 
 
+# ── Hromadný převod timestampů ────────────────────────────────────────────────
+
+MAX_TS_LINES = 10_000
+TS_BATCH_SIZE = 10_000
+
+TS_UNITS = [
+    ('auto', 'Automaticky'),
+    ('s',    'Sekundy'),
+    ('ms',   'Milisekundy'),
+    ('us',   'Mikrosekundy'),
+    ('ns',   'Nanosekundy'),
+]
+
+TS_FIELDS = ['value', 'unit', 'utc', 'local', 'error']
+
+# Počet desetinných míst sekundy pro jednotku a horní mez |hodnoty| pro automatickou detekci
+_UNIT_DIGITS = {'s': 0, 'ms': 3, 'us': 6, 'ns': 9}
+_UNIT_LIMITS = [(10 ** 11, 's'), (10 ** 14, 'ms'), (10 ** 17, 'us')]
+
+# Rozsah datetime (0001-01-01 až 9999-12-31) v unixových sekundách
+_TS_MIN = -62_135_596_800
+_TS_MAX = 253_402_300_799
+
+# Nejvyšší řád (Decimal.adjusted) hodnoty, která se v některé jednotce ještě vejde do rozsahu
+# (_TS_MAX v ns má 21 číslic); větší exponenty se odmítnou dřív, než se z nich staví celé číslo
+_TS_MAX_ADJUSTED = len(str(_TS_MAX * 10 ** 9)) - 1
+
+# Nad tento rozsah hodnot v dávce se přechody zóny nepředpočítávají (offset se počítá pro každou hodnotu)
+_ZONE_SPAN_MAX = 400 * 366 * 86_400
+
+_zone_cache = {}
+
+
+def _detect_unit(value):
+    magnitude = abs(value)
+    for limit, unit in _UNIT_LIMITS:
+        if magnitude < limit:
+            return unit
+    return 'ns'
+
+
+def _offset_at(tz, ts):
+    return int(datetime.fromtimestamp(ts, tz).utcoffset().total_seconds())
+
+
+class _ZoneOffsets:
+    """
+    Přechody UTC offsetu zóny pro rozsah [start, end] unixových sekund.
+    Offset se zjišťuje po dnech a změna se dohledá půlením na sekundu; převod
+    hodnoty je pak jen bisect v seznamu přechodů.
+    """
+
+    def __init__(self, tz, start, end):
+        self.start = start = max(start - start % 86_400 - 86_400, _TS_MIN + 2 * 86_400)
+        self.end = end = min(end - end % 86_400 + 2 * 86_400, _TS_MAX - 2 * 86_400)
+        self.starts = [start]
+        self.offsets = [_offset_at(tz, start)]
+        t = start
+        while t < end:
+            nxt = min(t + 86_400, end)
+            offset = _offset_at(tz, nxt)
+            if offset != self.offsets[-1]:
+                lo, hi = t, nxt
+                while hi - lo > 1:
+                    mid = (lo + hi) // 2
+                    if _offset_at(tz, mid) == self.offsets[-1]:
+                        lo = mid
+                    else:
+                        hi = mid
+                self.starts.append(hi)
+                self.offsets.append(offset)
+            t = nxt
+
+    def covers(self, lo, hi):
+        return self.start <= lo and hi <= self.end
+
+
+def _zone_offsets(timezone_name, tz, lo, hi):
+    """Přechody zóny pokrývající [lo, hi] — sdílené mezi dávkami i požadavky, při potřebě se rozšíří."""
+    cached = _zone_cache.get(timezone_name)
+    if cached and cached.covers(lo, hi):
+        return cached
+    if cached and max(hi, cached.end) - min(lo, cached.start) <= _ZONE_SPAN_MAX:
+        lo, hi = min(lo, cached.start), max(hi, cached.end)
+    zone = _ZoneOffsets(tz, lo, hi)
+    _zone_cache[timezone_name] = zone
+    return zone
+
+
+@lru_cache(maxsize=65_536)
+def _day_str(day):
+    return (EPOCH + timedelta(days=day)).isoformat()
+
+
+@lru_cache(maxsize=1)
+def _time_of_day():
+    """Tabulka 'THH:MM:SS' pro všech 86 400 sekund dne — převod je pak jen indexace."""
+    return [f'T{h:02d}:{m:02d}:{s:02d}' for h in range(24) for m in range(60) for s in range(60)]
+
+
+@lru_cache(maxsize=256)
+def _offset_str(offset):
+    if not offset:
+        return 'Z'
+    sign = '-' if offset < 0 else '+'
+    h, rest = divmod(abs(offset), 3600)
+    m, s = divmod(rest, 60)
+    # Místní střední čas (LMT) před zavedením pásem má offset i se sekundami, např. +00:57:44
+    return f'{sign}{h:02d}:{m:02d}:{s:02d}' if s else f'{sign}{h:02d}:{m:02d}'
+
+
+def _parse_ts(text, unit):
+    """
+    Vrátí (sekundy, zlomek sekundy jako '.123' nebo '', jednotka). Při chybě vyhodí
+    ValueError (nebo ArithmeticError z výpočtu s Decimal).
+    """
+    try:
+        value = int(text)
+        exact = True
+    except ValueError:
+        try:
+            value = Decimal(text)
+        except InvalidOperation:
+            raise ValueError('Neplatné číslo')
+        if not value.is_finite():
+            raise ValueError('Neplatné číslo')
+        if value and value.adjusted() > _TS_MAX_ADJUSTED:
+            raise ValueError('Mimo rozsah let 1–9999')
+        exact = False
+    if unit == 'auto':
+        unit = _detect_unit(int(value))
+    digits = _UNIT_DIGITS[unit]
+
+    if exact:
+        if not digits:
+            return value, '', unit
+        secs, sub = divmod(value, 10 ** digits)
+        return secs, f'.{sub:0{digits}d}', unit
+
+    ns = int((value * 10 ** (9 - digits)).to_integral_value(rounding='ROUND_FLOOR'))
+    secs, sub = divmod(ns, 10 ** 9)
+    frac = f'{sub:09d}'.rstrip('0')
+    return secs, f'.{frac}' if frac else '', unit
+
+
+def _parse_uniform(texts, unit):
+    """
+    Rychlá cesta pro dávku celých čísel se společnou jednotkou (typický sloupec z logu/DB).
+    Vrátí (sekundy, zlomky, jednotka), nebo None, pokud dávka není homogenní.
+    """
+    try:
+        values = list(map(int, texts))
+    except ValueError:
+        return None
+    lo, hi = min(values), max(values)
+    if unit == 'auto':
+        # Při stejném znaménku leží |v| mezi |lo| a |hi| → jednotka je pro celou dávku stejná
+        unit = _detect_unit(lo)
+        if (lo < 0 < hi) or _detect_unit(hi) != unit:
+            return None
+    digits = _UNIT_DIGITS[unit]
+    scale = 10 ** digits
+    if not (_TS_MIN <= lo // scale and hi // scale <= _TS_MAX):
+        return None
+    if not digits:
+        return values, [''] * len(values), unit
+    pairs = [divmod(v, scale) for v in values]
+    return [p[0] for p in pairs], [f'.{p[1]:0{digits}d}' for p in pairs], unit
+
+
+def _format_local(secs, frac, offset):
+    """Jeden místní čas; None, pokud offset chybí (None) nebo posun do zóny vyjde mimo roky 1–9999."""
+    if offset is None:
+        return None
+    day, sod = divmod(secs + offset, 86_400)
+    try:
+        return f'{_day_str(day)}{_time_of_day()[sod]}{frac}{_offset_str(offset)}'
+    except OverflowError:
+        return None
+
+
+def _format_column(secs, fracs, timezone_name, tz):
+    """
+    Naformátuje sloupec sekund na ISO 8601 v UTC a v zóně. Vrátí (utc, local);
+    místní čas mimo roky 1–9999 (krajní hodnoty posunuté offsetem) je None.
+    """
+    day_str, time_of_day = _day_str, _time_of_day()
+    days = [divmod(v, 86_400) for v in secs]
+    utc = [f'{day_str(d)}{time_of_day[t]}{f}Z' for (d, t), f in zip(days, fracs)]
+    if tz is timezone.utc:
+        return utc, utc
+
+    lo, hi = min(secs), max(secs)
+    if hi - lo <= _ZONE_SPAN_MAX:
+        zone = _zone_offsets(timezone_name, tz, lo, hi)
+        starts, zone_offsets = zone.starts, zone.offsets
+        offsets = [zone_offsets[bisect_right(starts, v) - 1] for v in secs]
+    else:
+        offsets = []
+        for v in secs:
+            try:
+                offsets.append(_offset_at(tz, v))
+            except (OverflowError, ValueError, OSError):
+                offsets.append(None)  # místní čas u hranice rozsahu nejde v zóně vyjádřit
+    if None not in offsets:
+        try:
+            return utc, [f'{day_str(d)}{time_of_day[t]}{f}{_offset_str(o)}'
+                         for (d, t), f, o in zip((divmod(v + o, 86_400) for v, o in zip(secs, offsets)),
+                                                 fracs, offsets)]
+        except OverflowError:
+            pass
+    # Mimo rozsah může být jen pár hodnot u hranic — ty se označí po jedné
+    return utc, [_format_local(v, f, o) for v, f, o in zip(secs, fracs, offsets)]
+
+
+_LOCAL_RANGE_ERROR = 'Místní čas je mimo rozsah let 1–9999'
+
+
+def _ts_row(text, unit, utc, local):
+    if local is None:
+        return {'value': text, 'unit': unit, 'utc': utc, 'local': '', 'error': _LOCAL_RANGE_ERROR}
+    return {'value': text, 'unit': unit, 'utc': utc, 'local': local, 'error': ''}
+
+
+def _convert_batch(texts, unit, timezone_name, tz):
+    uniform = _parse_uniform(texts, unit)
+    if uniform:
+        secs, fracs, detected = uniform
+        utc, local = _format_column(secs, fracs, timezone_name, tz)
+        return [_ts_row(t, detected, u, l) for t, u, l in zip(texts, utc, local)]
+
+    # Obecná cesta: desetinná čísla, smíšené jednotky, chybné hodnoty
+    parsed = []
+    for text in texts:
+        try:
+            secs, frac, detected = _parse_ts(text, unit)
+            if not _TS_MIN <= secs <= _TS_MAX:
+                raise ValueError('Mimo rozsah let 1–9999')
+            parsed.append((secs, frac, detected, None))
+        except ValueError as e:
+            parsed.append((0, '', '', str(e)))
+        except ArithmeticError:
+            parsed.append((0, '', '', 'Neplatné číslo'))
+    valid = [p for p in parsed if p[3] is None]
+    if valid:
+        formatted = iter(zip(*_format_column([p[0] for p in valid], [p[1] for p in valid], timezone_name, tz)))
+    rows = []
+    for text, (_, _, detected, error) in zip(texts, parsed):
+        if error:
+            rows.append({'value': text, 'unit': '', 'utc': '', 'local': '', 'error': error})
+        else:
+            utc, local = next(formatted)
+            rows.append(_ts_row(text, detected, utc, local))
+    return rows
+
+
+def convert_timestamps(values, unit='auto', timezone_name='UTC'):
+    """
+    Hromadně převede timestampy na ISO 8601 v UTC a ve zvolené zóně.
+    Jednotka (s/ms/us/ns) se při 'auto' určí pro každou hodnotu podle řádu.
+    Vrátí (rows, error) kde rows je iterátor dictů s klíči TS_FIELDS;
+    hodnoty se zpracovávají po dávkách TS_BATCH_SIZE.
+    """
+    if unit not in _UNIT_DIGITS and unit != 'auto':
+        return None, f'Neznámá jednotka: {unit}'
+    try:
+        tz = timezone.utc if timezone_name in ('', 'UTC') else ZoneInfo(timezone_name)
+    except (ZoneInfoNotFoundError, ValueError):
+        return None, f'Neznámá časová zóna: {timezone_name}'
+
+    def rows():
+        it = (v.strip() for v in values)
+        it = (v for v in it if v)
+        while True:
+            batch = list(islice(it, TS_BATCH_SIZE))
+            if not batch:
+                return
+            yield from _convert_batch(batch, unit, timezone_name or 'UTC', tz)
+
+    return rows(), None
+
+
+def convert_timestamps_text(text, unit='auto', timezone_name='UTC'):
+    """Převede timestampy vložené po řádcích. Vrátí (list dictů s klíči TS_FIELDS, error)."""
+    lines = [line for line in text.splitlines() if line.strip()]
+    if not lines:
+        return None, 'Zadej alespoň jeden timestamp.'
+    if len(lines) > MAX_TS_LINES:
+        return None, f'Příliš mnoho řádků (max {MAX_TS_LINES:,}) — pro větší objem nahraj soubor.'.replace(',', ' ')
+    rows, error = convert_timestamps(lines, unit, timezone_name)
+    if error:
+        return None, error
+    return list(rows), None
+
+
+def convert_timestamps_file(binary_stream, unit='auto', timezone_name='UTC'):
+    """Proudově převede soubor s jedním timestampem na řádek; po dočtení soubor zavře. Vrátí (rows, error)."""
+    text = io.TextIOWrapper(binary_stream, encoding='utf-8-sig', errors='replace')
+    rows, error = convert_timestamps(text, unit, timezone_name)
+    if error:
+        text.close()
+        return None, error
+
+    def closing_rows():
+        try:
+            yield from rows
+        finally:
+            text.close()
+
+    return closing_rows(), None
+
+
+# ── Hromadné parsování data a času ────────────────────────────────────────────
+
+DT_FIELDS = ['value', 'format', 'timestamp', 'utc', 'error']
+
+# Podporované formáty v pořadí priority; za %S je vždy povolen zlomek sekundy
+# (.123 nebo ,123) a na konci offset (Z, +01:00, +0100), pokud formát nemá vlastní %z
+DT_FORMATS = [
+    '%Y-%m-%dT%H:%M:%S',
+    '%Y-%m-%d %H:%M:%S',
+    '%Y-%m-%d %H:%M',
+    '%Y-%m-%d',
+    '%d.%m.%Y %H:%M:%S',
+    '%d.%m.%Y %H:%M',
+    '%d.%m.%Y',
+    '%Y-%m-%dT%H:%M',
+    '%Y%m%dT%H%M%S',
+    '%d/%m/%Y %H:%M:%S',
+    '%d/%m/%Y',
+    '%d/%b/%Y:%H:%M:%S %z',
+    '%a, %d %b %Y %H:%M:%S %z',
+    '%b %d %H:%M:%S',
+]
+
+# Vzorek pro určení formátu sloupce
+DT_SNIFF_SIZE = 50
+
+_MONTH_ABBR = {m: i for i, m in enumerate(
+    ('jan', 'feb', 'mar', 'apr', 'may', 'jun', 'jul', 'aug', 'sep', 'oct', 'nov', 'dec'), 1)}
+
+_SECONDS = r'(?P<S>\d{1,2})'
+_DIRECTIVES = {
+    'Y': r'(?P<Y>\d{4})',
+    'm': r'(?P<m>\d{1,2})',
+    'd': r'(?P<d>\d{1,2})',
+    'H': r'(?P<H>\d{1,2})',
+    'M': r'(?P<M>\d{1,2})',
+    'S': _SECONDS + r'(?:[.,](?P<f>\d{1,9}))?',
+    'f': r'(?P<f>\d{1,9})',
+    'b': r'(?P<b>[A-Za-z]{3})',
+    'a': r'[A-Za-z]{3}',
+    'z': r'(?P<z>Z|UTC|GMT|[+-]\d{2}(?::?\d{2})?)',
+    '%': '%',
+}
+_OPTIONAL_OFFSET = r'(?:\s*(?P<z>Z|UTC|GMT|[+-]\d{2}(?::?\d{2})?))?'
+
+
+@lru_cache(maxsize=128)
+def _compile_format(fmt):
+    """
+    Přeloží strptime formát na regulární výraz se pojmenovanými skupinami.
+    Výsledek se cachuje; nepodporovaná nebo opakovaná direktiva vyhodí ValueError.
+    """
+    pattern, seen, i = [], set(), 0
+    while i < len(fmt):
+        ch = fmt[i]
+        if ch != '%':
+            pattern.append(r'\s+' if ch == ' ' else re.escape(ch))
+            i += 1
+            continue
+        directive = fmt[i + 1:i + 2]
+        if directive not in _DIRECTIVES:
+            raise ValueError(f'Nepodporovaná direktiva %{directive} (podporováno: %Y %m %d %H %M %S %f %b %a %z)')
+        if directive in seen:
+            raise ValueError(f'Direktiva %{directive} je ve formátu vícekrát')
+        if directive != '%':
+            seen.add(directive)
+        pattern.append(_DIRECTIVES[directive])
+        i += 2
+    if 'S' in seen and 'f' in seen:
+        # Zlomek sekundy zachytí samostatné %f — %S pak nesmí definovat skupinu f podruhé
+        pattern[pattern.index(_DIRECTIVES['S'])] = _SECONDS
+    if '%z' not in fmt:
+        pattern.append(_OPTIONAL_OFFSET)
+    return re.compile(''.join(pattern), re.IGNORECASE)
+
+
+def _parse_offset(z):
+    if z[0] not in '+-':
+        return 0
+    sign = -1 if z[0] == '-' else 1
+    digits = z[1:].replace(':', '')
+    return sign * (int(digits[:2]) * 3600 + int(digits[2:4] or 0) * 60)
+
+
+def _match_parts(m):
+    """
+    Složky data z výsledku regexu: (Y, m, d, H, M, S, ns, offset nebo None).
+    Bez roku (syslog) se doplní aktuální rok, ne 1900 jako u strptime.
+    """
+    g = m.groupdict()
+    if g.get('b'):
+        month = _MONTH_ABBR.get(g['b'].lower())
+        if month is None:
+            return None
+    else:
+        month = int(g.get('m') or 1)
+    f = g.get('f')
+    z = g.get('z')
+    return (int(g.get('Y') or date.today().year), month, int(g.get('d') or 1),
+            int(g.get('H') or 0), int(g.get('M') or 0), int(g.get('S') or 0),
+            int(f.ljust(9, '0')) if f else 0,
+            _parse_offset(z) if z else None)
+
+
+def _match_datetime(text, formats):
+    """Najde první formát, jehož regex odpovídá celému textu. Vrátí (formát, složky) nebo (None, None)."""
+    for fmt in formats:
+        m = _compile_format(fmt).fullmatch(text)
+        if m:
+            parts = _match_parts(m)
+            if parts:
+                return fmt, parts
+    return None, None
+
+
+def sniff_format(samples):
+    """Vybere z DT_FORMATS formát, kterému odpovídá nejvíce vzorků. Vrátí formát nebo None."""
+    best, best_hits = None, 0
+    for fmt in DT_FORMATS:
+        regex = _compile_format(fmt)
+        hits = sum(1 for s in samples if regex.fullmatch(s))
+        if hits > best_hits:
+            best, best_hits = fmt, hits
+    return best
+
+
+@lru_cache(maxsize=65_536)
+def _epoch_day(y, mo, d):
+    return (date(y, mo, d) - EPOCH).days
+
+
+@lru_cache(maxsize=65_536)
+def _local_offset(timezone_name, quarter_hour):
+    """UTC offset zóny pro lokální čas (po čtvrthodinách — přechody zón leží na celých čtvrthodinách)."""
+    local = datetime(1970, 1, 1) + timedelta(seconds=quarter_hour * 900)
+    return int(local.replace(tzinfo=ZoneInfo(timezone_name)).utcoffset().total_seconds())
+
+
+def _to_epoch(parts, timezone_name):
+    """Převede složky na (unixové sekundy UTC, ns). Neplatné datum/čas vyhodí ValueError."""
+    y, mo, d, h, mi, sec, ns, offset = parts
+    if h > 23 or mi > 59 or sec > 59:
+        raise ValueError('Neplatný čas')
+    local = _epoch_day(y, mo, d) * 86_400 + h * 3600 + mi * 60 + sec
+    if offset is None:
+        offset = 0 if timezone_name == 'UTC' else _local_offset(timezone_name, local // 900)
+    return local - offset, ns
+
+
+def parse_datetimes(values, fmt='', unit='s', timezone_name='UTC'):
+    """
+    Hromadně převede data a časy na timestampy. Formát se zadá (strptime) nebo se
+    jednou určí ze vzorku prvních DT_SNIFF_SIZE hodnot; řádky, které mu neodpovídají,
+    zkusí ostatní formáty z DT_FORMATS. Časy bez offsetu se chápou v zóně timezone_name.
+    Vrátí (rows, error) kde rows je iterátor dictů s klíči DT_FIELDS.
+    """
+    unit = unit if unit in ('s', 'ms', 'us') else 's'
+    timezone_name = timezone_name or 'UTC'
+    if timezone_name != 'UTC':
+        try:
+            ZoneInfo(timezone_name)
+        except (ZoneInfoNotFoundError, ValueError):
+            return None, f'Neznámá časová zóna: {timezone_name}'
+    if fmt:
+        try:
+            _compile_format(fmt)
+        except ValueError as e:
+            return None, str(e)
+
+    scale = {'s': 1, 'ms': 1_000, 'us': 1_000_000}[unit]
+    day_str, time_of_day = _day_str, _time_of_day()
+
+    def rows():
+        it = (v.strip() for v in values)
+        it = (v for v in it if v)
+        head = list(islice(it, DT_SNIFF_SIZE))
+        primary = fmt or sniff_format(head)
+        primary_regex = _compile_format(primary) if primary else None
+        fallback = [f for f in DT_FORMATS if f != primary]
+
+        for text in chain(head, it):
+            m = primary_regex.fullmatch(text) if primary_regex else None
+            used, parts = (primary, _match_parts(m)) if m else (None, None)
+            if not parts:
+                used, parts = _match_datetime(text, fallback)
+            if not parts:
+                yield {'value': text, 'format': '', 'timestamp': '', 'utc': '', 'error': 'Nerozpoznaný formát'}
+                continue
+            try:
+                secs, ns = _to_epoch(parts, timezone_name)
+            except ValueError:
+                yield {'value': text, 'format': used, 'timestamp': '', 'utc': '', 'error': 'Neplatné datum nebo čas'}
+                continue
+            if not _TS_MIN <= secs <= _TS_MAX:
+                yield {'value': text, 'format': used, 'timestamp': '', 'utc': '', 'error': 'Čas v UTC je mimo rozsah let 1–9999'}
+                continue
+            day, sod = divmod(secs, 86_400)
+            frac = f'.{ns:09d}'.rstrip('0').rstrip('.') if ns else ''
+            yield {'value': text, 'format': used, 'timestamp': secs * scale + ns * scale // 1_000_000_000,
+                   'utc': f'{day_str(day)}{time_of_day[sod]}{frac}Z', 'error': ''}
+
+    return rows(), None
+
+
+def parse_datetimes_text(text, fmt='', unit='s', timezone_name='UTC'):
+    """Převede data a časy vložené po řádcích. Vrátí (list dictů s klíči DT_FIELDS, error)."""
+    lines = [line for line in text.splitlines() if line.strip()]
+    if not lines:
+        return None, 'Zadej alespoň jedno datum.'
+    if len(lines) > MAX_TS_LINES:
+        return None, f'Příliš mnoho řádků (max {MAX_TS_LINES:,}) — pro větší objem nahraj soubor.'.replace(',', ' ')
+    rows, error = parse_datetimes(lines, fmt, unit, timezone_name)
+    if error:
+        return None, error
+    return list(rows), None
+
+
+def parse_datetimes_file(binary_stream, fmt='', unit='s', timezone_name='UTC'):
+    """Proudově převede soubor s jedním datem na řádek; po dočtení soubor zavře. Vrátí (rows, error)."""
+    text = io.TextIOWrapper(binary_stream, encoding='utf-8-sig', errors='replace')
+    rows, error = parse_datetimes(text, fmt, unit, timezone_name)
+    if error:
+        text.close()
+        return None, error
+
+    def closing_rows():
+        try:
+            yield from rows
+        finally:
+            text.close()
+
+    return closing_rows(), None
+
+
+# ── Normalizace časů v logu ───────────────────────────────────────────────────
+
+LOG_OUTPUTS = [
+    ('utc',      'ISO 8601 UTC'),
+    ('local',    'ISO 8601 ve zvolené zóně'),
+    ('epoch_ms', 'Unix ms'),
+]
+
+# Počet řádků jednoho setříděného běhu externího merge sortu
+SORT_RUN_LINES = 200_000
+
+# Detektor časů v řádku: jedna předkompilovaná alternace, typ určí lastgroup
+_LOG_TS_RE = re.compile(
+    r'(?P<iso>\d{4}-\d{2}-\d{2}[T ]\d{2}:\d{2}(?::\d{2}(?:[.,]\d{1,9})?)?(?:\s?(?:Z|[+-]\d{2}:?\d{2})\b)?)'
+    r'|(?P<clf>\d{2}/[A-Za-z]{3}/\d{4}:\d{2}:\d{2}:\d{2} [+-]\d{4})'
+    r'|(?P<cz>\b\d{1,2}\.\d{1,2}\.\d{4} \d{1,2}:\d{2}(?::\d{2})?)'
+    r'|(?P<syslog>^[A-Z][a-z]{2} [ \d]\d \d{2}:\d{2}:\d{2})'
+    r'|(?P<epoch>(?<![\w.])1\d{9}(?:\d{3}){0,2}(?![\w.]))'
+)
+
+_LOG_FORMATS = {
+    'iso':    ['%Y-%m-%dT%H:%M:%S', '%Y-%m-%d %H:%M:%S', '%Y-%m-%dT%H:%M', '%Y-%m-%d %H:%M'],
+    'clf':    ['%d/%b/%Y:%H:%M:%S %z'],
+    'cz':     ['%d.%m.%Y %H:%M:%S', '%d.%m.%Y %H:%M'],
+    'syslog': ['%b %d %H:%M:%S'],
+}
+
+# Šířka řadicího klíče: ns od roku 1 (21 číslic) + pořadí řádku (12 číslic)
+_SORT_KEY_WIDTH = 33
+
+
+def _log_stamp(match, timezone_name, epochs):
+    """Převede nalezený čas na (sekundy UTC, ns); None, pokud nejde o platný čas."""
+    kind, text = match.lastgroup, match.group()
+    if kind == 'epoch':
+        if not epochs:
+            return None
+        digits = len(text) - 10
+        secs, sub = divmod(int(text), 10 ** digits)
+        return secs, sub * 10 ** (9 - digits)
+    _, parts = _match_datetime(text, _LOG_FORMATS[kind])
+    if not parts:
+        return None
+    try:
+        secs, ns = _to_epoch(parts, timezone_name)
+    except ValueError:
+        return None
+    return (secs, ns) if _TS_MIN <= secs <= _TS_MAX else None
+
+
+def _normalized_lines(lines, output, timezone_name, tz, epochs):
+    """
+    Přepíše první čas v každém řádku do kanonického tvaru.
+    Vrací (sekundy, ns, řádek); řádky bez času (např. stack trace) přebírají čas předchozího.
+    """
+    day_str, time_of_day = _day_str, _time_of_day()
+    zone = None
+    last = None
+    # Stejný text času (řádky v téže sekundě) se převádí jen jednou
+    seen = {}
+    for line in lines:
+        stamp = None
+        for match in _LOG_TS_RE.finditer(line):
+            cached = seen.get(match.group())
+            if cached:
+                break
+            stamp = _log_stamp(match, timezone_name, epochs)
+            if stamp:
+                break
+        else:
+            yield (last[:2] if last else (_TS_MIN, 0)) + (line,)
+            continue
+        if cached:
+            secs, ns, new = last = cached
+            yield secs, ns, f'{line[:match.start()]}{new}{line[match.end():]}'
+            continue
+
+        secs, ns = stamp
+        frac = f'.{ns:09d}'.rstrip('0') if ns else ''
+        if output == 'epoch_ms':
+            new = str(secs * 1000 + ns // 1_000_000)
+        elif output == 'local' and tz is not timezone.utc:
+            if zone is None or not zone.start <= secs <= zone.end:
+                zone = _zone_offsets(timezone_name, tz, secs - 31 * 86_400, secs + 366 * 86_400)
+            offset = zone.offsets[bisect_right(zone.starts, secs) - 1]
+            new = _format_local(secs, frac, offset)
+        else:
+            new = None
+        if new is None:  # UTC, nebo místní čas by vyšel mimo roky 1–9999
+            day, sod = divmod(secs, 86_400)
+            new = f'{day_str(day)}{time_of_day[sod]}{frac}Z'
+        if len(seen) >= 100_000:
+            seen.clear()
+        seen[match.group()] = last = (secs, ns, new)
+        yield secs, ns, f'{line[:match.start()]}{new}{line[match.end():]}'
+
+
+def _external_sort(records, tmp_dir):
+    """
+    Externí merge sort řádků podle (čas, pořadí): běhy po SORT_RUN_LINES se setřídí
+    v paměti, uloží do dočasných souborů a slijí přes heapq.merge. Malý vstup se
+    setřídí rovnou v paměti.
+    """
+    runs = []
+    try:
+        while True:
+            chunk = list(islice(records, SORT_RUN_LINES))
+            if not chunk:
+                break
+            chunk.sort()
+            if not runs and len(chunk) < SORT_RUN_LINES:
+                for record in chunk:
+                    yield record[_SORT_KEY_WIDTH + 1:]
+                return
+            run = tempfile.TemporaryFile('w+', encoding='utf-8', errors='surrogateescape', newline='', dir=tmp_dir)
+            run.writelines(chunk)
+            run.seek(0)
+            runs.append(run)
+        for record in heapq.merge(*runs):
+            yield record[_SORT_KEY_WIDTH + 1:]
+    finally:
+        for run in runs:
+            run.close()
+
+
+def normalize_log(binary_stream, output='utc', timezone_name='UTC', sort=False, epochs=True, tmp_dir=None):
+    """
+    Proudově přepíše časy v logu (ISO 8601, access log, syslog, dd.mm.yyyy, epoch s/ms/µs)
+    do jednoho kanonického tvaru. Časy bez offsetu se chápou v zóně timezone_name.
+    Se sort=True se řádky seřadí podle normalizovaného času (stabilně, víceřádkové
+    záznamy zůstanou pohromadě). Vrátí (iterátor řádků, error); soubor se po dočtení zavře.
+    """
+    if output not in dict(LOG_OUTPUTS):
+        return None, f'Neznámý výstupní formát: {output}'
+    timezone_name = timezone_name or 'UTC'
+    try:
+        tz = timezone.utc if timezone_name == 'UTC' else ZoneInfo(timezone_name)
+    except (ZoneInfoNotFoundError, ValueError):
+        return None, f'Neznámá časová zóna: {timezone_name}'
+
+    text = io.TextIOWrapper(binary_stream, encoding='utf-8', errors='surrogateescape', newline='')
+
+    def lines():
+        try:
+            records = _normalized_lines(text, output, timezone_name, tz, epochs)
+            if not sort:
+                for _, _, line in records:
+                    yield line
+                return
+            keyed = (f'{(secs - _TS_MIN) * 1_000_000_000 + ns:021d}{seq:012d}\t'
+                     f'{line if line.endswith(chr(10)) else line + chr(10)}'
+                     for seq, (secs, ns, line) in enumerate(records))
+            yield from _external_sort(keyed, tmp_dir)
+        finally:
+            text.close()
+
+    return lines(), None
+
+
 # ── Unescape ──────────────────────────────────────────────────────────────────
 
 def unescape_json_string(text):
@@ -90,16 +795,128 @@ def unescape_unicode(text):
     if len(text) > MAX_INPUT:
         return None, 'Vstup je příliš velký (max 100 KB)'
     try:
-        result = re.sub(
-            r'\\u([0-9a-fA-F]{4})',
-            lambda m: chr(int(m.group(1), 16)),
-            text
-        )
-        return result, None
+        return _fix_surrogates(_unescape_unicode(text)), None
     except Exception as e:
         return None, f'Chyba: {e}'
 
 
+# ── Escape / unescape engine ──────────────────────────────────────────────────
+
+ESCAPE_OPS = [
+    ('json_unescape',    'JSON unescape'),
+    ('json_escape',      'JSON escape'),
+    ('unicode_unescape', '\\uXXXX → znaky'),
+    ('unicode_escape',   'znaky → \\uXXXX'),
+    ('html_decode',      'HTML entity decode'),
+    ('html_encode',      'HTML entity encode'),
+]
+
+# Velikost bloku (znaků) při proudovém zpracování souboru
+ESCAPE_CHUNK_SIZE = 1024 * 1024
+
+# Samostatné zpětné lomítko, které nezačíná \uXXXX (pro převod na JSON literál)
+_LONE_BACKSLASH_RE = re.compile(r'\\(?!u[0-9a-fA-F]{4})')
+# Neplatná JSON escape sekvence / neescapovaná uvozovka — sudý počet lomítek před nimi
+_INVALID_JSON_ESCAPE_RE = re.compile(r'(?<!\\)((?:\\\\)*)\\(?!["\\/bfnrt]|u[0-9a-fA-F]{4})')
+_RAW_QUOTE_RE = re.compile(r'(?<!\\)((?:\\\\)*)"')
+_HIGH_SURROGATE_ESCAPE_RE = re.compile(r'\\u[dD][89abAB][0-9a-fA-F]{2}')
+
+
+def _uescape_errors(exc):
+    """Codec error handler: celý běh ne-ASCII znaků → \\uXXXX (astrální znaky jako surrogate pár)."""
+    h = exc.object[exc.start:exc.end].encode('utf-16-be', 'surrogatepass').hex()
+    return ''.join(['\\u' + h[i:i + 4] for i in range(0, len(h), 4)]), exc.end
+
+
+codecs.register_error('utilities.uescape', _uescape_errors)
+
+
+def _fix_surrogates(text):
+    """Osamocené surrogaty (např. neúplný pár \\uD83D) nahradí U+FFFD, aby šel text zakódovat do UTF-8."""
+    return text.encode('utf-16-le', 'surrogatepass').decode('utf-16-le', 'replace')
+
+
+def _unescape_unicode(text):
+    # Text se převede na JSON literál, který dekóduje C parser json (včetně surrogate párů)
+    body = _LONE_BACKSLASH_RE.sub(r'\\\\', text).replace('"', '\\"')
+    return json.loads(f'"{body}"', strict=False)
+
+
+def _unescape_json(text):
+    try:
+        return json.loads(f'"{text}"', strict=False)
+    except json.JSONDecodeError:
+        # Tolerantní varianta: neplatné escape sekvence a neescapované uvozovky zůstanou doslovně
+        body = _RAW_QUOTE_RE.sub(r'\1\\"', _INVALID_JSON_ESCAPE_RE.sub(r'\1\\\\', text))
+        return json.loads(f'"{body}"', strict=False)
+
+
+def _escape_cut(chunk):
+    """
+    Místo, kde lze blok rozdělit bez přetržení escape sekvence nebo surrogate páru.
+    Přenos do dalšího bloku má nejvýš 19 znaků (surrogate pár + jedno lomítko): z běhu
+    zpětných lomítek před řezem zůstane v bloku sudý počet (celé páry \\\\), takže
+    ani dlouhý běh lomítek se nepřenáší a neprochází znovu.
+    """
+    cut = chunk.find('\\', max(0, len(chunk) - 12))
+    if cut < 0:
+        return len(chunk)
+    if _HIGH_SURROGATE_ESCAPE_RE.fullmatch(chunk, max(0, cut - 6), cut):
+        cut -= 6
+    start = cut
+    while start > 0 and chunk[start - 1] == '\\':
+        start -= 1
+    return cut - (cut - start) % 2
+
+
+def _entity_cut(chunk):
+    """Místo před posledním '&' v koncových 40 znacích — nejdelší HTML entita má 33 znaků."""
+    cut = chunk.rfind('&', max(0, len(chunk) - 40))
+    return cut if cut >= 0 else len(chunk)
+
+
+# op → (převod bloku, hledání bezpečného konce bloku nebo None)
+_ESCAPE_OPS = {
+    'json_unescape':    (_unescape_json, _escape_cut),
+    'json_escape':      (lambda t: json.dumps(t, ensure_ascii=False)[1:-1], None),
+    'unicode_unescape': (_unescape_unicode, _escape_cut),
+    'unicode_escape':   (lambda t: t.encode('ascii', 'utilities.uescape').decode('ascii'), None),
+    'html_decode':      (html.unescape, _entity_cut),
+    'html_encode':      (lambda t: html.escape(t, quote=True), None),
+}
+
+
+def escape_stream(binary_stream, op):
+    """
+    Proudově převede soubor (UTF-8) po blocích ESCAPE_CHUNK_SIZE znaků. Konec bloku se
+    posune tak, aby nepřetrhl escape sekvenci, surrogate pár ani HTML entitu.
+    Vrátí (iterátor textových bloků, error); soubor se po dočtení zavře.
+    """
+    if op not in _ESCAPE_OPS:
+        return None, f'Neznámá operace: {op}'
+    convert, find_cut = _ESCAPE_OPS[op]
+    text = io.TextIOWrapper(binary_stream, encoding='utf-8-sig', errors='replace', newline='')
+
+    def chunks():
+        try:
+            carry = ''
+            while True:
+                block = text.read(ESCAPE_CHUNK_SIZE)
+                if not block:
+                    break
+                block = carry + block
+                cut = find_cut(block) if find_cut else len(block)
+                block, carry = block[:cut], block[cut:]
+                if block:
+                    yield _fix_surrogates(convert(block))
+            if carry:
+                yield _fix_surrogates(convert(carry))
+        finally:
+            text.close()
+
+    return chunks(), None
+
+
 # ── Epoch days ───────────────────────────────────────────────────────────────
 
 EPOCH = date(1970, 1, 1)
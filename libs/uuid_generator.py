@@ -2,24 +2,301 @@
 Knihovna pro generování UUID
 """
 
+import io
+import os
+import re
+import struct
+import threading
+import time
 import uuid
+from datetime import datetime, timezone
+
+from libs.generator import make_rng
 
 VERSIONS = [
     ('4', 'UUID v4 (náhodný)'),
+    ('7', 'UUID v7 (časově řazený)'),
     ('1', 'UUID v1 (časový)'),
+    ('5', 'UUID v5 (jmenný, SHA-1)'),
+    ('3', 'UUID v3 (jmenný, MD5)'),
+]
+
+NAMESPACES = [
+    ('dns',  'DNS'),
+    ('url',  'URL'),
+    ('oid',  'OID'),
+    ('x500', 'X.500'),
 ]
 
+_NAMESPACE_UUIDS = {
+    'dns':  uuid.NAMESPACE_DNS,
+    'url':  uuid.NAMESPACE_URL,
+    'oid':  uuid.NAMESPACE_OID,
+    'x500': uuid.NAMESPACE_X500,
+}
+
+MAX_COUNT = 50
+BULK_MAX_COUNT = 5_000_000
+MAX_NAMES_INPUT = 1_000_000
+MAX_INSPECT_LINES = 1_000
+
+# Počet UUID z jednoho os.urandom / jednoho zámku v7
+_BATCH_SIZE = 10_000
+
+# Multicast bit v node — RFC 4122 jím označuje node, který není MAC adresa
+_RANDOM_NODE_BIT = 1 << 40
+
+# Hex číslice na pozici varianty → 8/9/a/b (varianta RFC 4122, zachová 2 náhodné bity)
+_VARIANT_HEX = {h: '89ab'[int(h, 16) & 3] for h in '0123456789abcdef'}
+
+# Stav v7 v rámci procesu: poslední milisekunda a 12bitový čítač (RFC 9562, metoda 1)
+_v7_lock = threading.Lock()
+_v7_last_ms = 0
+_v7_counter = 0
+
+
+def _format_hex(h, version):
+    """Složí 32 hex znaků do tvaru UUID a přepíše verzi a variantu."""
+    return f'{h[:8]}-{h[8:12]}-{version}{h[13:16]}-{_VARIANT_HEX[h[16]]}{h[17:20]}-{h[20:32]}'
+
+
+def _v4_batch(n, random_bytes):
+    """n UUID v4 z jednoho bloku náhodných bajtů (16 B na UUID)."""
+    h = random_bytes(16 * n).hex()
+    return [_format_hex(h[i:i + 32], '4') for i in range(0, 32 * n, 32)]
+
+
+def _v7_batch(n, random_bytes):
+    """
+    n UUID v7: 48 bitů unixového času v ms, 12bitový čítač (rand_a) a 62 náhodných bitů.
+    Čítač zaručuje rostoucí pořadí i v rámci jedné milisekundy; při přetečení se
+    čas posune o 1 ms dopředu.
+    """
+    global _v7_last_ms, _v7_counter
+    h = random_bytes(8 * n).hex()
+    results = []
+    with _v7_lock:
+        ms, counter = _v7_last_ms, _v7_counter
+        now = time.time_ns() // 1_000_000
+        if now > ms:
+            # Nová milisekunda: čítač začíná náhodně v dolní polovině rozsahu
+            ms, counter = now, int.from_bytes(random_bytes(2), 'big') & 0x7FF
+        prefix_ms = None
+        for i in range(0, 16 * n, 16):
+            counter += 1
+            if counter > 0xFFF:
+                ms, counter = ms + 1, 0
+            if ms != prefix_ms:
+                t = f'{ms:012x}'
+                prefix, prefix_ms = f'{t[:8]}-{t[8:]}-7', ms
+            results.append(f'{prefix}{counter:03x}-{_VARIANT_HEX[h[i]]}{h[i + 1:i + 4]}-{h[i + 4:i + 16]}')
+        _v7_last_ms, _v7_counter = ms, counter
+    return results
+
+
+def _resolve_namespace(namespace):
+    """Vrátí UUID jmenného prostoru — předdefinovaný klíč nebo vlastní UUID."""
+    if namespace in _NAMESPACE_UUIDS:
+        return _NAMESPACE_UUIDS[namespace]
+    return uuid.UUID(namespace.strip())
+
+
+def _iter_uuids(version, count, rng):
+    """Líně generuje count náhodných/časových UUID po dávkách."""
+    random_bytes = rng.randbytes if rng else os.urandom
+    for start in range(0, count, _BATCH_SIZE):
+        n = min(_BATCH_SIZE, count - start)
+        if version == 7:
+            yield from _v7_batch(n, random_bytes)
+        elif version == 1:
+            for _ in range(n):
+                if rng:
+                    yield str(uuid.uuid1(node=rng.getrandbits(48) | _RANDOM_NODE_BIT,
+                                         clock_seq=rng.getrandbits(14)))
+                else:
+                    yield str(uuid.uuid1())
+        else:
+            yield from _v4_batch(n, random_bytes)
+
+
+def _prepare(version, count, seed, namespace, names, max_count):
+    """
+    Společná validace pro generate a bulk_generate.
+    Vrátí (iterátor UUID, error). Pro v3/v5 se generuje jedno UUID na každý neprázdný
+    řádek names (count se ignoruje).
+    """
+    if str(version) not in dict(VERSIONS):
+        supported = ', '.join(sorted(dict(VERSIONS)))
+        return None, f'Nepodporovaná verze UUID: {version} (podporováno: {supported})'
+    version = int(version)
+    if version in (3, 5):
+        if len(names) > MAX_NAMES_INPUT:
+            return None, 'Vstup je příliš velký (max 1 MB)'
+        try:
+            ns = _resolve_namespace(namespace)
+        except ValueError:
+            return None, 'Neplatný jmenný prostor — zadej DNS/URL/OID/X.500 nebo platné UUID.'
+        lines = [line.strip() for line in names.splitlines() if line.strip()]
+        if not lines:
+            return None, 'Pro v3/v5 zadej alespoň jedno jméno (jedno na řádek).'
+        make = uuid.uuid5 if version == 5 else uuid.uuid3
+        return (str(make(ns, name)) for name in lines), None
+
+    count = int(count)
+    if not (1 <= count <= max_count):
+        return None, f'Počet musí být v rozmezí 1–{max_count:,}.'.replace(',', ' ')
+    rng = make_rng(seed) if seed not in (None, '') else None
+    return _iter_uuids(version, count, rng), None
+
+
+def generate(version='4', count=1, seed=None, namespace='dns', names=''):
+    """
+    Vygeneruje UUID zadané verze (v1/v4/v7 max MAX_COUNT kusů, v3/v5 pro každé jméno).
+    Se seed je náhodná část reprodukovatelná; časová složka v1/v7 zůstává aktuální.
+    """
+    try:
+        if str(version) not in ('3', '5'):
+            count = max(1, min(int(count), MAX_COUNT))
+        uuids, error = _prepare(version, count, seed, namespace, names, MAX_COUNT)
+    except (TypeError, ValueError):
+        return None, 'Neplatná verze nebo počet.'
+    if error:
+        return None, error
+    return list(uuids), None
+
 
-def generate(version='4', count=1):
+def bulk_generate(version='4', count=1, seed=None, namespace='dns', names=''):
+    """
+    Hromadné generování UUID pro stažení (až BULK_MAX_COUNT kusů).
+    Vrátí (rows, error) kde rows je iterátor dictů {'uuid': ...}.
+    """
     try:
-        count = max(1, min(int(count), 50))
-        version = int(version)
-        results = []
-        for _ in range(count):
+        uuids, error = _prepare(version, count, seed, namespace, names, BULK_MAX_COUNT)
+    except (TypeError, ValueError):
+        return None, 'Neplatná verze nebo počet.'
+    if error:
+        return None, error
+    return ({'uuid': u} for u in uuids), None
+
+
+# ══════════════════════════════════════════════════════════════════════════════
+# Dekódování UUID / ULID
+# ══════════════════════════════════════════════════════════════════════════════
+
+# 128 bitů UUID jako (32, 16, 16, 16, 48 bitů) — jedno rozbalení pokryje v1, v6 i v7
+_UUID_LAYOUT = struct.Struct('>IHHH6s')
+
+# Počet 100ns intervalů mezi 1582-10-15 (epocha v1/v6) a 1970-01-01
+_GREGORIAN_OFFSET = 0x01B21DD213814000
+
+# Crockford Base32 (ULID) → číslice pro int(x, 32); I/L → 1, O → 0
+_CROCKFORD = str.maketrans(
+    {c: '0123456789abcdefghijklmnopqrstuv'[i] for i, c in enumerate('0123456789ABCDEFGHJKMNPQRSTVWXYZ')}
+    | {'I': '1', 'L': '1', 'O': '0'}
+)
+
+# 26 znaků Crockford Base32 (bez U, s aliasy I/L/O); první znak nese jen 3 bity, proto ≤ 7
+_ULID_RE = re.compile(r'[0-7ILO][0-9A-TV-Z]{25}')
+
+# 32 hex číslic UUID bez oddělovačů — bytes.fromhex by jinak tiše přeskočil mezery uvnitř
+_UUID_HEX_RE = re.compile(r'[0-9a-f]{32}')
+
+INSPECT_FIELDS = ['id', 'type', 'version', 'variant', 'timestamp', 'unix_ms', 'node', 'clock_seq', 'counter', 'error']
+
+
+def _variant_name(octet):
+    """Vrátí název varianty podle horních bitů 9. bajtu UUID."""
+    if octet < 0x80:
+        return 'NCS'
+    if octet < 0xC0:
+        return 'RFC 9562'
+    if octet < 0xE0:
+        return 'Microsoft'
+    return 'rezervováno'
+
+
+def _iso_utc(seconds):
+    return datetime.fromtimestamp(seconds, tz=timezone.utc).isoformat()
+
+
+def inspect_id(text):
+    """
+    Rozebere UUID nebo ULID: verzi, variantu a u v1/v6/v7/ULID i čas, node a sekvenci.
+    Vrátí dict s klíči INSPECT_FIELDS (chyba je v klíči 'error').
+    """
+    info = dict.fromkeys(INSPECT_FIELDS, '')
+    info['id'] = text.strip()
+    s = info['id'].lower().removeprefix('urn:uuid:').strip('{}').replace('-', '')
+
+    try:
+        if len(s) == 26:
+            ulid = s.upper()
+            if not _ULID_RE.fullmatch(ulid):
+                info['error'] = 'Neplatný ULID — očekáváno 26 znaků Crockford Base32, první nejvýš 7'
+                return info
+            ms = int(ulid.translate(_CROCKFORD), 32) >> 80
+            info.update(type='ULID', unix_ms=ms)
+            try:
+                info['timestamp'] = _iso_utc(ms / 1000)
+            except (ValueError, OverflowError, OSError):
+                info['error'] = 'Časová složka je mimo podporovaný rozsah'
+            return info
+
+        if len(s) != 32:
+            info['error'] = 'Neznámý formát — očekáváno UUID (32 hex znaků) nebo ULID (26 znaků)'
+            return info
+        if not _UUID_HEX_RE.fullmatch(s):
+            info['error'] = 'Neplatné znaky v UUID/ULID'
+            return info
+        time_low, time_mid, time_hi_version, clock_seq_variant, node = _UUID_LAYOUT.unpack(bytes.fromhex(s))
+    except ValueError:
+        info['error'] = 'Neplatné znaky v UUID/ULID'
+        return info
+
+    version = time_hi_version >> 12
+    info.update(type='UUID', version=version, variant=_variant_name(clock_seq_variant >> 8))
+    try:
+        if version in (1, 6):
             if version == 1:
-                results.append(str(uuid.uuid1()))
+                ticks = (time_hi_version & 0x0FFF) << 48 | time_mid << 32 | time_low
             else:
-                results.append(str(uuid.uuid4()))
-        return results, None
-    except Exception as e:
-        return None, str(e)
+                ticks = time_low << 28 | time_mid << 12 | (time_hi_version & 0x0FFF)
+            ticks -= _GREGORIAN_OFFSET
+            info.update(unix_ms=ticks // 10_000, timestamp=_iso_utc(ticks / 10_000_000),
+                        node=node.hex(':'), clock_seq=clock_seq_variant & 0x3FFF)
+        elif version == 7:
+            ms = time_low << 16 | time_mid
+            info.update(unix_ms=ms, timestamp=_iso_utc(ms / 1000), counter=time_hi_version & 0x0FFF)
+    except (ValueError, OverflowError, OSError):
+        info['error'] = 'Časová složka je mimo podporovaný rozsah'
+    return info
+
+
+def inspect_text(text):
+    """Rozebere ID zadaná po řádcích. Vrátí (list dictů, error)."""
+    if len(text) > MAX_NAMES_INPUT:
+        return None, 'Vstup je příliš velký (max 1 MB)'
+    lines = [line for line in text.splitlines() if line.strip()]
+    if not lines:
+        return None, 'Zadej alespoň jedno UUID nebo ULID.'
+    if len(lines) > MAX_INSPECT_LINES:
+        return None, f'Příliš mnoho řádků (max {MAX_INSPECT_LINES}) — pro větší objem nahraj soubor.'
+    return [inspect_id(line) for line in lines], None
+
+
+def inspect_file(binary_stream):
+    """
+    Proudově rozebere soubor s jedním ID na řádek (prázdné řádky se přeskočí).
+    Vrátí (rows, error) kde rows je iterátor dictů s klíči INSPECT_FIELDS.
+    """
+    text = io.TextIOWrapper(binary_stream, encoding='utf-8-sig', errors='replace')
+
+    def rows():
+        try:
+            for line in text:
+                if line.strip():
+                    yield inspect_id(line)
+        finally:
+            text.close()
+
+    return rows(), None
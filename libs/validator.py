@@ -0,0 +1,248 @@
+"""
+Knihovna pro validaci čísel účtů, IBAN a rodných čísel — jednotlivě i hromadně z CSV
+"""
+
+import csv
+import io
+import re
+from datetime import date
+from itertools import islice
+
+from libs.generator import _ACCOUNT_CHUNK_SUMS, account_check_digit, cz_iban_check_digits, iban_mod97
+
+MAX_INPUT = 1_000_000
+MAX_LINES = 1_000
+
+KINDS = [
+    ('account',      'Číslo účtu'),
+    ('iban',         'IBAN'),
+    ('birth_number', 'Rodné číslo'),
+]
+
+BATCH_SIZE = 10_000
+
+_ACCOUNT_RE = re.compile(r'(?:(\d{1,6})-)?(\d{2,10})(?:/(\d{4}))?')
+_IBAN_RE = re.compile(r'[A-Z]{2}\d{2}[A-Z0-9]{11,30}')
+_BIRTH_NUMBER_RE = re.compile(r'(\d{2})(\d{2})(\d{2})/?(\d{3,4})')
+
+# Délky IBAN pro země, které kontrolujeme přesně; ostatní jen obecný rozsah 15–34
+_IBAN_LENGTHS = {'CZ': 24, 'SK': 24}
+
+# Zakódovaný měsíc rodného čísla → (měsíc, pohlaví, rozšíření); +20/+70 je rozšíření
+# pro vyčerpané koncovky, platné jen pro narozené od roku _BIRTH_EXTENDED_FROM
+_BIRTH_MONTHS = {
+    month + offset: (month, gender, offset in (20, 70))
+    for offset, gender in ((0, 'M'), (20, 'M'), (50, 'F'), (70, 'F'))
+    for month in range(1, 13)
+}
+_BIRTH_EXTENDED_FROM = 2004
+
+# Výsledky ověření čísla účtu (sdílené n-tice, ať dávka nealokuje po hodnotě)
+_VALID = (True, None)
+_ACCOUNT_FORMAT_ERROR = (False, 'Neplatný formát (očekáváno [prefix-]číslo[/kód banky])')
+_ACCOUNT_PREFIX_ERROR = (False, 'Prefix nesplňuje mod-11')
+_ACCOUNT_DIGITS_ERROR = (False, 'Číslo účtu musí obsahovat alespoň dvě nenulové číslice')
+_ACCOUNT_MOD11_ERROR = (False, 'Číslo účtu nesplňuje mod-11')
+
+
+def _mod11_ok(number):
+    """Ověří mod-11 dle ČNB pro číslo do 10 číslic."""
+    return account_check_digit(number // 10) == number % 10
+
+
+def _validate_accounts(values):
+    """
+    Sloupcově ověří dávku čísel účtů. Mod-11 prefixu i čísla se sečte přímo z tabulek
+    _ACCOUNT_CHUNK_SUMS (číslo doplněné zleva nulami na 10 číslic: pozice 1–3, 4–6, 7–9
+    + kontrolní číslice s vahou 1) — bez volání funkce po hodnotě.
+    """
+    hi_sums, mid_sums, lo_sums = _ACCOUNT_CHUNK_SUMS
+    fullmatch = _ACCOUNT_RE.fullmatch
+    results = []
+    append = results.append
+    for value in values:
+        m = fullmatch(value.strip().replace(' ', ''))
+        if m is None:
+            append(_ACCOUNT_FORMAT_ERROR)
+            continue
+        prefix, number = m.group(1, 2)
+        if prefix:
+            p = int(prefix)
+            if (hi_sums[p // 10_000_000] + mid_sums[p // 10_000 % 1000] + lo_sums[p // 10 % 1000] + p % 10) % 11:
+                append(_ACCOUNT_PREFIX_ERROR)
+                continue
+        if len(number) - number.count('0') < 2:
+            append(_ACCOUNT_DIGITS_ERROR)
+            continue
+        n = int(number)
+        if (hi_sums[n // 10_000_000] + mid_sums[n // 10_000 % 1000] + lo_sums[n // 10 % 1000] + n % 10) % 11:
+            append(_ACCOUNT_MOD11_ERROR)
+        else:
+            append(_VALID)
+    return results
+
+
+def validate_account(text):
+    """Ověří číslo účtu ve tvaru [prefix-]číslo[/kód banky]. Vrátí (platné, důvod)."""
+    return _validate_accounts([text])[0]
+
+
+def validate_iban(text):
+    """Ověří IBAN (MOD-97); u CZ navíc mod-11 prefixu a čísla účtu. Vrátí (platné, důvod)."""
+    iban = text.replace(' ', '').upper()
+    if not _IBAN_RE.fullmatch(iban):
+        return False, 'Neplatný formát IBAN'
+    expected = _IBAN_LENGTHS.get(iban[:2])
+    if expected and len(iban) != expected:
+        return False, f'IBAN pro {iban[:2]} musí mít {expected} znaků'
+    if iban[:2] != 'CZ':
+        if iban_mod97(iban[4:] + iban[:4]) != 1:
+            return False, 'Nesouhlasí kontrolní součet MOD-97'
+        return True, None
+
+    if not iban[2:].isdigit():
+        return False, 'CZ IBAN smí za kódem země obsahovat jen číslice'
+    prefix, account = int(iban[8:14]), int(iban[14:24])
+    if int(iban[2:4]) != cz_iban_check_digits(int(iban[4:8]), prefix, account):
+        return False, 'Nesouhlasí kontrolní součet MOD-97'
+    if not _mod11_ok(prefix):
+        return False, 'Prefix účtu nesplňuje mod-11'
+    if not _mod11_ok(account):
+        return False, 'Číslo účtu nesplňuje mod-11'
+    return True, None
+
+
+def validate_birth_number(text):
+    """Ověří rodné číslo: formát, datum, pohlaví (kódování měsíce) a mod-11. Vrátí (platné, důvod)."""
+    m = _BIRTH_NUMBER_RE.fullmatch(text.strip())
+    if not m:
+        return False, 'Neplatný formát (očekáváno YYMMDD/SSS nebo YYMMDD/SSSC)'
+    yy, mm, dd, suffix = int(m.group(1)), int(m.group(2)), int(m.group(3)), m.group(4)
+
+    if len(suffix) == 3:
+        if yy >= 54:
+            return False, 'Devítimístné rodné číslo je platné jen pro narozené před rokem 1954'
+        year = 1900 + yy
+    else:
+        year = 1900 + yy if yy >= 54 else 2000 + yy
+        number = int(m.group(1) + m.group(2) + m.group(3) + suffix)
+        if number % 11:
+            # Výjimka pro čísla vydaná do roku 1985: zbytek 10 → kontrolní číslice 0
+            if not (number // 10 % 11 == 10 and number % 10 == 0 and year < 1986):
+                return False, 'Nesouhlasí kontrolní součet mod-11'
+
+    if mm not in _BIRTH_MONTHS:
+        return False, 'Neplatný měsíc (povoleno 01–12, 21–32, 51–62, 71–82)'
+    month, _, extended = _BIRTH_MONTHS[mm]
+    if extended and year < _BIRTH_EXTENDED_FROM:
+        return False, f'Měsíc +20/+70 je platný jen pro narozené od roku {_BIRTH_EXTENDED_FROM}'
+    try:
+        born = date(year, month, dd)
+    except ValueError:
+        return False, 'Neplatné datum narození'
+    if born > date.today():
+        return False, 'Datum narození je v budoucnosti'
+    return True, None
+
+
+_VALIDATORS = {
+    'account':      validate_account,
+    'iban':         validate_iban,
+    'birth_number': validate_birth_number,
+}
+
+
+def validate_many(values, kind):
+    """Ověří dávku hodnot; vrátí list (platné, důvod) ve stejném pořadí."""
+    if kind == 'account':
+        return _validate_accounts(values)
+    validate = _VALIDATORS[kind]
+    return [validate(v) for v in values]
+
+
+def validate_text(text, kind):
+    """
+    Ověří hodnoty zadané po řádcích (prázdné řádky se přeskočí).
+    Vrátí (list dictů {'value', 'valid', 'reason'}, error).
+    """
+    if len(text) > MAX_INPUT:
+        return None, 'Vstup je příliš velký (max 1 MB)'
+    if kind not in _VALIDATORS:
+        return None, f'Neznámý typ: {kind}'
+    values = [line.strip() for line in text.splitlines() if line.strip()]
+    if not values:
+        return None, 'Zadej alespoň jednu hodnotu.'
+    if len(values) > MAX_LINES:
+        return None, f'Příliš mnoho řádků (max {MAX_LINES}) — pro větší objem použij CSV soubor.'
+    return [{'value': v, 'valid': ok, 'reason': reason}
+            for v, (ok, reason) in zip(values, validate_many(values, kind))], None
+
+
+def _find_column(header, column):
+    """Najde index sloupce podle názvu, nebo podle pořadí (od 1)."""
+    column = column.strip()
+    if column in header:
+        return header.index(column)
+    if column.isdigit() and 1 <= int(column) <= len(header):
+        return int(column) - 1
+    return None
+
+
+def _output_fields(header):
+    """
+    Jedinečné názvy výstupních sloupců: hlavička + 'valid' a 'reason'. Opakovaný název
+    dostane příponu _2, _3… — jinak by dict řádku sloupce se stejným názvem sloučil.
+    """
+    fields, seen = [], set()
+    for name in header + ['valid', 'reason']:
+        unique, n = name, 1
+        while unique in seen:
+            n += 1
+            unique = f'{name}_{n}'
+        seen.add(unique)
+        fields.append(unique)
+    return fields
+
+
+def validate_csv(binary_stream, kind, column, delimiter=','):
+    """
+    Ověří jeden sloupec CSV souboru (UTF-8, první řádek = hlavička).
+
+    Soubor se čte proudově po dávkách BATCH_SIZE řádků a po dočtení se zavře.
+    Vrátí (rows, error) kde rows je iterátor dictů: původní sloupce + 'valid' a 'reason'
+    (při shodě názvu s příponou, viz _output_fields). Řádek s více sloupci než hlavička
+    je neplatný.
+    """
+    if kind not in _VALIDATORS:
+        return None, f'Neznámý typ: {kind}'
+    text = io.TextIOWrapper(binary_stream, encoding='utf-8-sig', errors='replace', newline='')
+    reader = csv.reader(text, delimiter=delimiter)
+    header = next(reader, None)
+    if not header:
+        return None, 'CSV neobsahuje žádná data'
+    idx = _find_column(header, column)
+    if idx is None:
+        return None, f'Sloupec „{column}“ nebyl v hlavičce nalezen.'
+
+    def rows():
+        width = len(header)
+        *columns, valid_field, reason_field = _output_fields(header)
+        try:
+            while True:
+                batch = list(islice(reader, BATCH_SIZE))
+                if not batch:
+                    return
+                values = [row[idx] if idx < len(row) else '' for row in batch]
+                for row, (ok, reason) in zip(batch, validate_many(values, kind)):
+                    if len(row) > width:
+                        ok, reason = False, f'Řádek má víc sloupců ({len(row)}) než hlavička ({width})'
+                    elif len(row) < width:
+                        row += [''] * (width - len(row))
+                    record = dict(zip(columns, row))
+                    record[valid_field] = ok
+                    record[reason_field] = reason or ''
+                    yield record
+        finally:
+            text.close()
+
+    return rows(), None
@@ -12,7 +12,7 @@ def yaml_to_json(text):
         return json.dumps(data, indent=2, ensure_ascii=False), None
     except yaml.YAMLError as e:
         return None, f'Chyba v YAML: {e}'
-    except Exception as e:
+    except (TypeError, ValueError, RecursionError) as e:
         return None, str(e)
 
 
@@ -24,5 +24,5 @@ def json_to_yaml(text):
         return yaml.dump(data, allow_unicode=True, default_flow_style=False, sort_keys=False), None
     except json.JSONDecodeError as e:
         return None, f'Chyba v JSON: {e}'
-    except Exception as e:
+    except (yaml.YAMLError, ValueError, RecursionError) as e:
         return None, str(e)
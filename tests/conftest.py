@@ -0,0 +1,5 @@
+import os
+import sys
+
+# Testy importují libs.* z kořene repozitáře
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
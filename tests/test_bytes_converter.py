@@ -0,0 +1,96 @@
+"""Převod \\uXXXX sekvencí na čísla a zpět: přesné dělení, hranice šířky a přetečení."""
+
+import time
+
+import pytest
+
+from libs import bytes_converter
+
+
+@pytest.mark.parametrize('value, divisor, expected', [
+    (5, '1', '5'),
+    (5, '1e7', '0.0000005'),
+    (1200, '100', '12.00'),
+    (-5, '1000', '-0.005'),
+    (8, '0.01', '800'),
+    (4, '1E-2', '400'),
+    (1, '3', '0.333333333333333333333'),
+    (2 ** 512 - 1, '1e64', '1340780792994259709957402499820584612747936582059239337772356144372176403007354697680187429.'
+                           '8166903427690031858186486050853753882811946569946433649006084095'),
+])
+def test_scale_is_exact_without_exponent(value, divisor, expected):
+    assert bytes_converter._scale(value, bytes_converter._parse_divisor(divisor)) == expected
+
+
+@pytest.mark.parametrize('divisor', ['0', '-1', 'abc', 'inf', 'nan', '1e65', '1e-65'])
+def test_invalid_divisor_rejected(divisor):
+    rows, error = bytes_converter.batch_numbers_to_escapes('1', divisor=divisor)
+    assert rows is None and error
+
+
+def _batch(fn, text, **kwargs):
+    rows, error = fn(text, **kwargs)
+    assert error is None
+    return rows
+
+
+def test_escapes_to_numbers_fields_and_width():
+    rows = _batch(bytes_converter.batch_escapes_to_numbers, '\\u0001\\u0000\\u0002\\u0000\\u0003',
+                  width='2', byteorder='little')
+    assert [(r['field'], r['value'], r['error']) for r in rows] == [
+        (1, '1', ''), (2, '2', ''), (3, '', 'Neúplné pole: 1 z 2 B')]
+
+    rows = _batch(bytes_converter.batch_escapes_to_numbers, '\\u0001\\u0000\n\\u00ff\n' + '\\u0001' * 65, signed=True)
+    assert [(r['value'], r['error']) for r in rows] == [
+        ('256', ''), ('-1', ''), ('', 'Číslo je delší než 64 B — zvol pevnou šířku')]
+
+
+@pytest.mark.parametrize('line, kwargs, escapes, error', [
+    ('12.34', {'divisor': '100'}, '\\u0004\\u00d2', ''),
+    ('12,34', {'divisor': '100'}, '\\u0004\\u00d2', ''),
+    ('12.345', {'divisor': '100'}, '', 'Po vynásobení dělitelem nevychází celé číslo'),
+    ('1e-100000', {}, '', 'Po vynásobení dělitelem nevychází celé číslo'),
+    ('nan', {}, '', 'Po vynásobení dělitelem nevychází celé číslo'),
+    ('abc', {}, '', 'Neplatné číslo'),
+    ('-1', {}, '', 'Záporné číslo vyžaduje znaménkový režim'),
+    ('-1', {'signed': True, 'width': '1'}, '\\u00ff', ''),
+    ('-129', {'signed': True, 'width': '1'}, '', 'Hodnota se nevejde do 1 B'),
+    ('256', {'width': '1'}, '', 'Hodnota se nevejde do 1 B'),
+    (str(2 ** 512 - 1), {}, '\\u00ff' * 64, ''),
+    (str(2 ** 512), {}, '', 'Hodnota se nevejde do 64 B'),
+    ('1e100000', {}, '', 'Hodnota se nevejde do 64 B'),
+    ('1e999999999', {'divisor': '1e64'}, '', 'Hodnota se nevejde do 64 B'),
+])
+def test_numbers_to_escapes(line, kwargs, escapes, error):
+    (row,) = _batch(bytes_converter.batch_numbers_to_escapes, line, **kwargs)
+    assert (row['escapes'], row['error']) == (escapes, error)
+
+
+def test_huge_exponents_are_rejected_quickly():
+    """Exponent se posoudí dřív, než by se z čísla stavěl obří int."""
+    start = time.perf_counter()
+    rows = _batch(bytes_converter.batch_numbers_to_escapes, '\n'.join(['9e999999999'] * 1000), divisor='1e64')
+    assert all(r['error'] == 'Hodnota se nevejde do 64 B' for r in rows)
+    assert time.perf_counter() - start < 1
+
+
+@pytest.mark.parametrize('width, signed, byteorder', [
+    ('auto', False, 'big'), ('auto', True, 'little'), ('4', True, 'big'), ('16', False, 'little'),
+])
+def test_round_trip(width, signed, byteorder):
+    # Hodnoty ×100 (dělitel) se vejdou i do 4 B se znaménkem
+    values = ['0', '1', '127', '128', '255', '65535', '21474836'] + (['-1', '-128', '-21474836'] if signed else [])
+    kwargs = {'width': width, 'signed': signed, 'byteorder': byteorder, 'divisor': '100'}
+    numbers = [f'{v}.00' for v in values]
+    escapes = _batch(bytes_converter.batch_numbers_to_escapes, '\n'.join(numbers), **kwargs)
+    assert not any(r['error'] for r in escapes)
+    back = _batch(bytes_converter.batch_escapes_to_numbers, '\n'.join(r['escapes'] for r in escapes), **kwargs)
+    assert [r['value'] for r in back] == numbers
+
+
+def test_single_value_overflow_returns_error():
+    assert bytes_converter.escapes_to_number('\\u00ff' * 200)[0] is None
+    assert bytes_converter.escapes_to_number('\\u0001\\u0000') == (256.0, None)
+    assert bytes_converter.number_to_escapes('1e308', 100) == (None, 'Hodnota je příliš velká')
+    assert bytes_converter.number_to_escapes('inf') == (None, 'Hodnota je příliš velká')
+    assert bytes_converter.number_to_escapes('2.56', 100) == ('\\u0001\\u0000', None)
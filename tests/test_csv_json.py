@@ -0,0 +1,18 @@
+"""Konverze CSV ↔ JSON: neplatný oddělovač a smíšené pole vrací chybu, ne výjimku."""
+
+import pytest
+
+from libs import csv_json
+
+
+@pytest.mark.parametrize('delimiter', [None, '', ';;', 1])
+@pytest.mark.parametrize('convert, text', [
+    (csv_json.csv_to_json, 'a,b\n1,2'),
+    (csv_json.json_to_csv, '[{"a": 1}]'),
+])
+def test_csv_json_invalid_delimiter(convert, text, delimiter):
+    assert convert(text, delimiter) == (None, 'Oddělovač musí být jeden znak')
+
+
+def test_json_to_csv_mixed_array():
+    assert csv_json.json_to_csv('[{"a": 1}, 2]') == (None, 'JSON musí být pole objektů [ {...}, {...} ]')
@@ -0,0 +1,28 @@
+"""Převod kódování: neplatná kódování a režimy vrací chybu, ne výjimku."""
+
+import pytest
+
+from libs import encoding_converter
+
+
+@pytest.mark.parametrize('source, target, mode, error', [
+    (None, 'utf-8', 'replace', 'Neplatné zdrojové kódování'),
+    ('utf-8', None, 'replace', 'Neplatné cílové kódování'),
+    ('utf-16', 'utf-8', 'replace', 'Neplatné zdrojové kódování'),
+    ('utf-8', 'windows-1250', 'strict', 'Neplatný režim pro nepřevoditelné znaky'),
+    ('utf-8', 'windows-1250', None, 'Neplatný režim pro nepřevoditelné znaky'),
+])
+def test_invalid_parameters(source, target, mode, error):
+    assert encoding_converter.convert_text('příliš', source, target, mode) == (None, error)
+    assert encoding_converter.convert_content('příliš'.encode(), source, target, mode) == (None, error)
+
+
+def test_convert_content_round_trip():
+    converted, error = encoding_converter.convert_content('žluťoučký kůň'.encode(), 'utf-8', 'windows-1250')
+    assert error is None
+    assert converted.decode('windows-1250') == 'žluťoučký kůň'
+
+
+def test_convert_content_replaces_unencodable():
+    converted, error = encoding_converter.convert_content('a€ž'.encode(), 'utf-8', 'iso-8859-1')
+    assert (converted, error) == (b'a??', None)
@@ -0,0 +1,177 @@
+"""Generátor čísel účtů, IBAN a rodných čísel: kontrolní číslice proti publikovaným příkladům."""
+
+import random
+from datetime import date, timedelta
+
+import pytest
+
+from libs import generator, validator
+
+_WEIGHTS = [6, 3, 7, 9, 10, 5, 8, 4, 2, 1]
+
+
+def _mod11_sum(number):
+    """Přímý váhový součet dle ČNB přes číslo doplněné na 10 číslic."""
+    return sum(int(d) * w for d, w in zip(f'{number:010d}', _WEIGHTS)) % 11
+
+
+# ── Čísla účtů (mod-11) ──────────────────────────────────────────────────────
+
+@pytest.mark.parametrize('account', [
+    '19-2000145399',   # vzorový účet z příkladů CZ IBAN (0800)
+    '178124-4159',     # účet vedený u ČNB (0710)
+    '2000145399',
+    '19',
+])
+def test_published_accounts_pass_mod11(account):
+    for part in account.split('-'):
+        number = int(part)
+        assert generator.account_check_digit(number // 10) == number % 10
+        assert _mod11_sum(number) == 0
+
+
+def test_check_digit_matches_weighted_sum():
+    rng = random.Random(1)
+    for body in [0, 1, 999, 999_999, 999_999_999] + [rng.randrange(10 ** 9) for _ in range(2000)]:
+        digit = generator.account_check_digit(body)
+        assert 0 <= digit <= 10
+        if digit <= 9:
+            assert _mod11_sum(body * 10 + digit) == 0
+        else:
+            assert all(_mod11_sum(body * 10 + d) for d in range(10))
+
+
+def test_generated_accounts_are_valid():
+    result, error = generator.generate_account_numbers(100, True, True, seed=7)
+    assert error is None
+    for account in result['without_prefix'] + result['with_prefix']:
+        prefix, _, number = account.rpartition('-')
+        assert not number.startswith('0') and 6 <= len(number) <= 10
+        assert not prefix or (not prefix.startswith('0') and 2 <= len(prefix) <= 6)
+        assert validator.validate_account(account) == (True, None)
+
+
+def test_bulk_accounts_are_valid_and_reproducible():
+    rows, error = generator.bulk_account_numbers(25_000, True, True, seed=3)
+    assert error is None
+    rows = list(rows)
+    assert len(rows) == 50_000
+    assert all(validator.validate_account(row['account'])[0] for row in rows)
+    again, _ = generator.bulk_account_numbers(25_000, True, True, seed=3)
+    assert list(again) == rows
+
+
+# ── IBAN (MOD-97) ────────────────────────────────────────────────────────────
+
+@pytest.mark.parametrize('account_number, prefix, bank_code, iban', [
+    ('2000145399', '19', '0800', 'CZ6508000000192000145399'),
+    ('4159', '178124', '0710', 'CZ6907101781240000004159'),
+])
+def test_cz_iban_matches_published_examples(account_number, prefix, bank_code, iban):
+    assert generator.generate_iban(account_number, prefix, bank_code) == iban
+    assert generator.generate_iban(account_number, prefix, bank_code, grouped=True) == ' '.join(
+        iban[i:i + 4] for i in range(0, 24, 4))
+
+
+@pytest.mark.parametrize('iban', [
+    'CZ6508000000192000145399',
+    'SK3112000000198742637541',
+    'DE89370400440532013000',
+    'GB82WEST12345698765432',
+])
+def test_iban_mod97_of_published_examples_is_one(iban):
+    assert generator.iban_mod97(iban[4:] + iban[:4]) == 1
+
+
+def test_chunked_mod97_matches_big_integer():
+    rng = random.Random(5)
+    alphabet = '0123456789ABCDEFGHIJKLMNOPQRSTUVWXYZ'
+    for length in range(1, 40):
+        for _ in range(50):
+            text = ''.join(rng.choice(alphabet) for _ in range(length))
+            assert generator.iban_mod97(text) == int(text.translate(generator._IBAN_LETTERS)) % 97
+
+
+def test_format_iban():
+    assert generator.format_iban('GB82WEST12345698765432', grouped=True) == 'GB82 WEST 1234 5698 7654 32'
+    assert generator.format_iban('GB82WEST12345698765432') == 'GB82WEST12345698765432'
+
+
+def test_cz_check_digits_match_string_mod97():
+    rng = random.Random(2)
+    for _ in range(2000):
+        bank, prefix, account = rng.randrange(10 ** 4), rng.randrange(10 ** 6), rng.randrange(10 ** 10)
+        bban = f'{bank:04d}{prefix:06d}{account:010d}'
+        assert generator.cz_iban_check_digits(bank, prefix, account) == 98 - generator.iban_mod97(bban + 'CZ00')
+
+
+def test_generated_ibans_are_valid():
+    result, error = generator.generate_account_numbers(100, True, True, bank_code='0100', iban_format='grouped')
+    assert error is None
+    for item in result['without_prefix'] + result['with_prefix']:
+        assert validator.validate_iban(item['iban']) == (True, None)
+        prefix, _, number = item['account'].rpartition('-')
+        assert item['iban'].replace(' ', '')[8:] == f'{int(prefix or 0):06d}{int(number):010d}'
+
+
+# ── Rodná čísla ──────────────────────────────────────────────────────────────
+
+@pytest.mark.parametrize('date_part', ['800101', '540101', '045231', '257130', '991231'])
+def test_new_suffixes_are_exactly_the_valid_ones(date_part):
+    """Předpočítané koncovky = všechna SSSC s SSS 001–999, kde YYMMDDSSSC je dělitelné 11."""
+    expected = {f'{s:04d}' for s in range(10, 10_000) if int(date_part + f'{s:04d}') % 11 == 0}
+    suffixes = generator._rc_suffixes(date_part, 'new_normal')
+    assert len(suffixes) == len(set(suffixes))
+    assert set(suffixes) == expected
+
+
+@pytest.mark.parametrize('variant, gender, months', [
+    ('new_normal', 'M', range(1, 13)),
+    ('new_normal', 'F', range(51, 63)),
+    ('new_extended', 'M', range(21, 33)),
+    ('new_extended', 'F', range(71, 83)),
+    ('old', 'M', range(1, 13)),
+    ('old', 'F', range(51, 63)),
+])
+def test_generated_birth_numbers_are_valid(variant, gender, months):
+    # Široký rozsah — každá varianta si ho ořízne na roky, kdy platí
+    result, error = generator.generate_birth_numbers(200, gender, [variant], 'range', age_min=0, age_max=90, seed=5)
+    assert error is None
+    for rc in result[variant]:
+        assert int(rc[2:4]) in months
+        assert len(rc) == (10 if variant == 'old' else 11)
+        assert validator.validate_birth_number(rc) == (True, None)
+        if variant != 'old':
+            assert int(rc.replace('/', '')) % 11 == 0
+
+
+
+@pytest.mark.parametrize('variant, start', [('new_normal', date(1954, 1, 1)), ('new_extended', date(2004, 1, 1))])
+def test_new_standard_dates_start_with_the_standard(variant, start):
+    result, error = generator.generate_birth_numbers(200, 'both', [variant], 'range', age_min=0, age_max=100, seed=2)
+    assert error is None
+    # Desetimístné YY < 54 znamená 20YY — dřívější data by vyšla v budoucnosti
+    years = {1900 + int(rc[:2]) if int(rc[:2]) >= 54 else 2000 + int(rc[:2]) for rc in result[variant]}
+    assert start.year <= min(years) and max(years) <= date.today().year
+
+    _, error = generator.generate_birth_numbers(1, 'M', [variant], 'specific', specific_date=start - timedelta(days=1))
+    assert error.startswith(f'{generator.VARIANT_LABELS[variant]} je pouze pro osoby narozené od 1. 1. {start.year}')
+    _, error = generator.generate_birth_numbers(1, 'M', [variant], 'specific', specific_date=start)
+    assert error is None
+
+def test_specific_date_suffixes_are_unique_up_to_capacity():
+    day = date(1985, 6, 15)
+    capacity = len(generator._rc_suffixes(generator._rc_date_part(day, 'F', 'new_normal'), 'new_normal'))
+    rows, error = generator.bulk_birth_numbers(capacity, 'F', ['new_normal'], 'specific', specific_date=day, seed=1)
+    assert error is None
+    numbers = [row['birth_number'] for row in rows]
+    assert len(set(numbers)) == capacity
+    assert all(n.startswith('855615/') for n in numbers)
+
+    _, error = generator.bulk_birth_numbers(capacity + 1, 'F', ['new_normal'], 'specific', specific_date=day)
+    assert error.startswith(f'Pro zadané datum lze vygenerovat nejvýše {capacity}')
+
+
+def test_old_standard_requires_birth_before_1954():
+    _, error = generator.generate_birth_numbers(1, 'M', ['old'], 'specific', specific_date=date(1954, 1, 1))
+    assert error.startswith('Starý standard je pouze pro osoby narozené před 1. 1. 1954')
@@ -0,0 +1,138 @@
+"""Ověření podpisu JWT proti příkladům z RFC 7515 (příloha A) a známým útokům."""
+
+import base64
+import hashlib
+import hmac
+import json
+
+import pytest
+
+from libs import jwt_decoder
+
+# RFC 7515 A.1–A.3: společný payload {"iss":"joe", "exp":1300819380, ...}
+PAYLOAD = 'eyJpc3MiOiJqb2UiLA0KICJleHAiOjEzMDA4MTkzODAsDQogImh0dHA6Ly9leGFtcGxlLmNvbS9pc19yb290Ijp0cnVlfQ'
+
+HS256_JWK = {
+    'kty': 'oct',
+    'k': 'AyM1SysPpbyDfgZld3umj1qzKObwVMkoqQ-EstJQLr_T-1qS0gZH75aKtMN3Yj0iPS4hcgUuTwjAzZr1Z9CAow',
+}
+HS256_TOKEN = ('eyJ0eXAiOiJKV1QiLA0KICJhbGciOiJIUzI1NiJ9.' + PAYLOAD
+               + '.dBjftJeZ4CVP-mB92K27uhbUJU1p1r_wW1gFWFOEjXk')
+
+RS256_JWK = {
+    'kty': 'RSA',
+    'n': 'ofgWCuLjybRlzo0tZWJjNiuSfb4p4fAkd_wWJcyQoTbji9k0l8W26mPddxHmfHQp-Vaw-4qPCJrcS2mJPMEzP1Pt0Bm4d4QlL-yRT-SFd'
+         '2lZS-pCgNMsD1W_YpRPEwOWvG6b32690r2jZ47soMZo9wGzjb_7OMg0LOL-bSf63kpaSHSXndS5z5rexMdbBYUsLA9e-KXBdQOS-UTo7WTBE'
+         'Ma2R2CapHg665xsmtdVMTBQY4uDZlxvb3qCo5ZwKh9kG4LT6_I5IhlJH7aGhyxXFvUK-DWNmoudF8NAco9_h9iaGNj8q2ethFkMLs91kzk2PA'
+         'cDTW9gb54h4FRWyuXpoQ',
+    'e': 'AQAB',
+}
+RS256_TOKEN = (
+    'eyJhbGciOiJSUzI1NiJ9.' + PAYLOAD + '.'
+    'cC4hiUPoj9Eetdgtv3hF80EGrhuB__dzERat0XF9g2VtQgr9PJbu3XOiZj5RZmh7AAuHIm4Bh-0Qc_lF5YKt_O8W2Fp5jujGbds9uJdbF9CUAr7t'
+    '1dnZcAcQjbKBYNX4BAynRFdiuB--f_nZLgrnbyTyWzO75vRK5h6xBArLIARNPvkSjtQBMHlb1L07Qe7K0GarZRmB_eSN9383LcOLn6_dO--xi12'
+    'jzDwusC-eOkHWEsqtFZESc6BfI7noOPqvhJ1phCnvWh6IeYI2w9QOYEUipUTI8np6LbgGY9Fs98rqVt5AXLIhWkWywlVmtVrBp0igcN_IoypGlU'
+    'PQGe77Rw'
+)
+
+ES256_JWK = {
+    'kty': 'EC',
+    'crv': 'P-256',
+    'x': 'f83OJ3D2xF1Bg8vub9tLe1gHMzV76e8Tus9uPHvRVEU',
+    'y': 'x_FEzRu9m36HLN_tue659LNpXW6pCyStikYjKIWI5a0',
+}
+ES256_TOKEN = ('eyJhbGciOiJFUzI1NiJ9.' + PAYLOAD
+               + '.DtEhU3ljbEg8L38VWAfUAqOyKAM6-Xx-F4GawxaepmXFCgfTjDxw5djxLa8ISlSApmWQxfKTUJqPP3-Kg6NU1Q')
+
+
+def _b64url(data):
+    return base64.urlsafe_b64encode(data).rstrip(b'=').decode('ascii')
+
+
+def _token(header, payload=PAYLOAD, signature=b''):
+    return f'{_b64url(json.dumps(header).encode())}.{payload}.{_b64url(signature)}'
+
+
+def _verify(token, secret='', jwk=None):
+    keys, error = jwt_decoder.load_keys(secret, json.dumps(jwk) if jwk else '')
+    assert error is None
+    rows, error = jwt_decoder.decode_bulk_text(token, keys)
+    assert error is None
+    (row,) = list(rows)
+    return row
+
+
+def _tamper_signature(token):
+    """Změní znak uprostřed podpisu (koncový znak base64url může nést jen výplňové bity)."""
+    head, signature = token.rsplit('.', 1)
+    i = len(signature) // 2
+    return f'{head}.{signature[:i]}{"A" if signature[i] != "A" else "B"}{signature[i + 1:]}'
+
+
+@pytest.mark.parametrize('token, jwk, alg', [
+    (HS256_TOKEN, HS256_JWK, 'HS256'),
+    (RS256_TOKEN, RS256_JWK, 'RS256'),
+    (ES256_TOKEN, ES256_JWK, 'ES256'),
+])
+def test_rfc7515_examples_verify(token, jwk, alg):
+    row = _verify(token, jwk=jwk)
+    assert row['signature'] == 'platný'
+    assert row['alg'] == alg
+    assert row['iss'] == 'joe'
+    assert row['exp'] == '2011-03-22T18:43:00+00:00'
+
+
+@pytest.mark.parametrize('token, jwk', [
+    (HS256_TOKEN, HS256_JWK),
+    (RS256_TOKEN, RS256_JWK),
+    (ES256_TOKEN, ES256_JWK),
+])
+def test_tampered_signature_rejected(token, jwk):
+    assert _verify(_tamper_signature(token), jwk=jwk)['signature'] == 'neplatný'
+
+
+@pytest.mark.parametrize('token, jwk', [
+    (HS256_TOKEN, HS256_JWK),
+    (RS256_TOKEN, RS256_JWK),
+    (ES256_TOKEN, ES256_JWK),
+])
+def test_tampered_payload_rejected(token, jwk):
+    header, _, signature = token.split('.')
+    payload = _b64url(json.dumps({'iss': 'admin', 'exp': 1300819380}).encode())
+    forged = f'{header}.{payload}.{signature}'
+    assert _verify(forged, jwk=jwk)['signature'] == 'neplatný'
+
+
+def test_es256_zero_signature_rejected():
+    token = _token({'alg': 'ES256'}, signature=bytes(64))
+    assert _verify(token, jwk=ES256_JWK)['signature'] == 'neplatný'
+
+
+@pytest.mark.parametrize('alg', ['none', 'None', 'NONE', ''])
+def test_alg_none_rejected(alg):
+    token = _token({'alg': alg})
+    for secret, jwk in (('secret', None), ('', RS256_JWK), ('', HS256_JWK)):
+        status = _verify(token, secret, jwk)['signature']
+        assert status != 'platný'
+        assert status.startswith('nepodporovaný algoritmus')
+
+
+def test_hs256_with_rsa_jwk_rejected():
+    """Záměna algoritmu: HS256 podepsaný veřejným RSA klíčem jako HMAC secretem."""
+    header = _b64url(json.dumps({'alg': 'HS256'}).encode())
+    signing_input = f'{header}.{PAYLOAD}'.encode('ascii')
+    for secret in (json.dumps(RS256_JWK).encode(), base64.urlsafe_b64decode(RS256_JWK['n'] + '==')):
+        signature = hmac.new(secret, signing_input, hashlib.sha256).digest()
+        token = f'{header}.{PAYLOAD}.{_b64url(signature)}'
+        assert _verify(token, jwk=RS256_JWK)['signature'] == 'klíč pro HS256 musí být typu oct'
+
+
+def test_rs256_with_ec_jwk_rejected():
+    assert _verify(RS256_TOKEN, jwk=ES256_JWK)['signature'] == 'klíč typu EC nelze použít pro RS256'
+
+
+def test_malformed_token_reports_error():
+    token = f'eyJhbGciOiJIUzI1NiJ9.{_b64url(b"not json")}.x'
+    row = _verify(token, secret='secret')
+    assert row['error'].startswith('Chyba při dekódování')
+    assert row['signature'] != 'platný'
@@ -0,0 +1,47 @@
+"""Metriky: čítače cache výsledků podle nástroje a vykreslení labelů sledovaných zdrojů."""
+
+from libs import metrics, result_cache, shared_store
+
+
+def _metrics(tmp_path):
+    return metrics.Metrics(shared_store.SharedStore(str(tmp_path / 'shared.db')))
+
+
+def _upper(text):
+    return text.upper()
+
+
+def test_result_cache_counts_per_tool():
+    cache = result_cache.ResultCache(disk_max_bytes=0)
+    for tool, text in [('hash', 'a'), ('hash', 'a'), ('cron', 'a'), ('hash', 'b')]:
+        cache.call(tool, _upper, text)
+    assert cache.tool_stats() == {('hash', 'miss'): 2, ('hash', 'memory_hit'): 1, ('cron', 'miss'): 1}
+    assert (cache.stats()['hits'], cache.stats()['misses']) == (1, 3)
+
+
+def test_tracked_sources_render_their_labels(tmp_path):
+    tool_metrics = _metrics(tmp_path)
+    cache = {('hash', 'miss'): 2, ('hash', 'memory_hit'): 1}
+    kills = {'timeout': 1}
+    tool_metrics.track('dd_result_cache_requests_total', lambda: cache, labels=('tool', 'result'))
+    tool_metrics.track('dd_sandbox_kills_total', lambda: kills)
+    tool_metrics.observe('hash', 'post', 0.002)
+    text = tool_metrics.render()
+    assert 'dd_result_cache_requests_total{tool="hash",result="miss"} 2' in text
+    assert 'dd_result_cache_requests_total{tool="hash",result="memory_hit"} 1' in text
+    assert 'dd_sandbox_kills_total{result="timeout"} 1' in text
+    assert 'dd_tool_requests_total{tool="hash",action="post"} 1' in text
+
+    # Další flush zapíše jen přírůstek
+    cache[('hash', 'miss')] = 5
+    assert 'dd_result_cache_requests_total{tool="hash",result="miss"} 5' in tool_metrics.render()
+
+
+def test_rows_with_other_labels_are_skipped(tmp_path):
+    """Starší záznam cache bez labelu 'tool' se nevykreslí s posunutými labely."""
+    tool_metrics = _metrics(tmp_path)
+    tool_metrics.store.incr_many({'metrics:dd_result_cache_requests_total\x1fmiss': 3}, metrics.RETENTION)
+    tool_metrics.track('dd_result_cache_requests_total', lambda: {('cron', 'miss'): 1}, labels=('tool', 'result'))
+    text = tool_metrics.render()
+    assert 'dd_result_cache_requests_total{tool="cron",result="miss"} 1' in text
+    assert 'tool="miss"' not in text
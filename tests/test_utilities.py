@@ -0,0 +1,186 @@
+"""Hromadný převod timestampů (přechody letního času, hranice rozsahu) a proudové escapování."""
+
+import io
+from datetime import datetime, timezone
+from zoneinfo import ZoneInfo
+
+import pytest
+
+from libs import utilities
+
+PRAGUE = ZoneInfo('Europe/Prague')
+SPRING_2024 = 1711846800   # 2024-03-31T01:00:00Z — Praha 02:00 CET → 03:00 CEST
+AUTUMN_2024 = 1729990800   # 2024-10-27T01:00:00Z — Praha 03:00 CEST → 02:00 CET
+
+
+def _convert(values, unit='auto', timezone_name='Europe/Prague'):
+    rows, error = utilities.convert_timestamps([str(v) for v in values], unit, timezone_name)
+    assert error is None
+    return list(rows)
+
+
+def _reference(seconds, tz):
+    return datetime.fromtimestamp(seconds, tz).isoformat().replace('+00:00', 'Z')
+
+
+@pytest.mark.parametrize('seconds, local', [
+    (SPRING_2024 - 1, '2024-03-31T01:59:59+01:00'),
+    (SPRING_2024, '2024-03-31T03:00:00+02:00'),
+    (AUTUMN_2024 - 1, '2024-10-27T02:59:59+02:00'),
+    (AUTUMN_2024, '2024-10-27T02:00:00+01:00'),
+])
+def test_dst_transitions_prague(seconds, local):
+    (row,) = _convert([seconds])
+    assert row['local'] == local
+    assert row['error'] == ''
+
+
+@pytest.mark.parametrize('extra', [[], ['1.5'], ['-62135596800']], ids=['uniform', 'decimal', 'wide-span'])
+def test_dst_transitions_match_zoneinfo(extra):
+    """Rychlá cesta, obecná cesta i sloupec přes > 400 let dávají stejný výsledek jako zoneinfo."""
+    values = [t + d for t in (SPRING_2024, AUTUMN_2024) for d in range(-3, 4)]
+    values += [t + d * 3600 for t in (SPRING_2024, AUTUMN_2024) for d in (-2, -1, 1, 2)]
+    rows = _convert(values + extra)
+    for value, row in zip(values, rows):
+        assert row['unit'] == 's'
+        assert row['utc'] == _reference(value, timezone.utc)
+        assert row['local'] == _reference(value, PRAGUE)
+
+
+def test_dst_transition_in_milliseconds():
+    rows = _convert([SPRING_2024 * 1000 - 1, SPRING_2024 * 1000], unit='ms')
+    assert [row['local'] for row in rows] == ['2024-03-31T01:59:59.999+01:00', '2024-03-31T03:00:00.000+02:00']
+
+
+def test_local_mean_time_offset_keeps_seconds():
+    (row,) = _convert([-5_000_000_000])   # rok 1811, před zavedením středoevropského času
+    assert row['local'] == _reference(-5_000_000_000, PRAGUE)
+    assert row['local'].endswith('+00:57:44')
+
+
+@pytest.mark.parametrize('values, timezone_name', [
+    ([utilities._TS_MAX], 'Europe/Prague'),
+    ([utilities._TS_MIN], 'America/New_York'),
+    ([utilities._TS_MAX, 0], 'Asia/Tokyo'),
+    ([utilities._TS_MAX, '0.5'], 'Asia/Tokyo'),
+    ([utilities._TS_MIN, 0], 'America/New_York'),
+], ids=['max-east', 'min-west', 'uniform-batch', 'decimal-batch', 'wide-span-west'])
+def test_local_time_overflow_is_row_error(values, timezone_name):
+    rows = _convert(values, 's', timezone_name)
+    assert rows[0]['error'] == utilities._LOCAL_RANGE_ERROR
+    assert rows[0]['utc'] == _reference(values[0], timezone.utc)
+    assert rows[0]['local'] == ''
+    assert all(row['error'] == '' for row in rows[1:])
+
+
+@pytest.mark.parametrize('value', [utilities._TS_MAX + 1, utilities._TS_MIN - 1, '1e400', 'nan', 'abc'])
+def test_out_of_range_and_invalid_values(value):
+    rows = _convert([value, 0], unit='s')
+    assert rows[0]['error']
+    assert rows[0]['utc'] == ''
+    assert rows[1] == {'value': '0', 'unit': 's', 'utc': '1970-01-01T00:00:00Z',
+                       'local': '1970-01-01T01:00:00+01:00', 'error': ''}
+
+
+@pytest.mark.parametrize('unit', ['auto', 's', 'ns'])
+@pytest.mark.parametrize('value', ['1e10000000', '1e1000000', '1e100000', '-1e22', '1e21'])
+def test_huge_exponents_are_rejected_without_expanding(value, unit):
+    """Exponent mimo rozsah se odmítne bez stavění obřího celého čísla (dřív zaseknutí nebo 500)."""
+    rows = _convert([value, 0], unit=unit)
+    assert rows[0]['error'] == 'Mimo rozsah let 1–9999'
+    assert rows[1]['error'] == ''
+
+
+@pytest.mark.parametrize('value, utc', [
+    ('1e-1000000000', '1970-01-01T00:00:00Z'),
+    ('0e100000', '1970-01-01T00:00:00Z'),
+    ('2.5e11', '9892-03-08T12:26:40Z'),
+])
+def test_extreme_exponents_within_range(value, utc):
+    (row,) = _convert([value], unit='s')
+    assert row['utc'] == utc
+
+
+def test_parse_datetimes_rejects_utc_outside_range():
+    rows, error = utilities.parse_datetimes(['9999-12-31T23:59:59-01:00', '2024-03-31T03:00:00+02:00'])
+    assert error is None
+    rows = list(rows)
+    assert rows[0]['error'] == 'Čas v UTC je mimo rozsah let 1–9999'
+    assert rows[1]['timestamp'] == SPRING_2024
+
+
+@pytest.mark.parametrize('value, utc', [
+    ('2024-03-31 03:00:00.123456', '2024-03-31T03:00:00.123456Z'),
+    ('2024-03-31 03:00:00.5', '2024-03-31T03:00:00.5Z'),
+])
+def test_parse_datetimes_seconds_with_separate_fraction(value, utc):
+    """%S následované %f: zlomek zachytí jen %f (dřív re.error a 500)."""
+    rows, error = utilities.parse_datetimes([value], '%Y-%m-%d %H:%M:%S.%f')
+    assert error is None
+    (row,) = rows
+    assert row['error'] == ''
+    assert row['utc'] == utc
+
+
+@pytest.mark.parametrize('fmt', ['%Y %Y', '%d.%m.%Y %H:%M:%S %S', '%S.%f.%f'])
+def test_parse_datetimes_rejects_repeated_directive(fmt):
+    rows, error = utilities.parse_datetimes(['2024 2024'], fmt)
+    assert rows is None
+    assert 'vícekrát' in error
+
+
+# ── Proudové escapování ──────────────────────────────────────────────────────
+
+ESCAPE_CASES = [
+    ('json_unescape', 'a\\uD83D\\uDE00b\\n\\\\u0041\\"', 'a😀b\n\\u0041"'),
+    ('unicode_unescape', 'x\\u00e9\\uD83D\\uDE00\\\\u0041', 'xé😀\\A'),
+    ('html_decode', '&amp;&#x1F600;&eacute;&lt', '&😀é<'),
+    ('json_escape', 'a"\\\n😀', 'a\\"\\\\\\n😀'),
+    ('unicode_escape', 'é😀', '\\u00e9\\ud83d\\ude00'),
+    ('html_encode', '<a href="x">&</a>', '&lt;a href=&quot;x&quot;&gt;&amp;&lt;/a&gt;'),
+]
+
+
+def _escape(data, op, chunk_size, monkeypatch):
+    monkeypatch.setattr(utilities, 'ESCAPE_CHUNK_SIZE', chunk_size)
+    chunks, error = utilities.escape_stream(io.BytesIO(data.encode('utf-8')), op)
+    assert error is None
+    return ''.join(chunks)
+
+
+@pytest.mark.parametrize('op, data, expected', ESCAPE_CASES, ids=[case[0] for case in ESCAPE_CASES])
+def test_escape_stream_block_boundaries(op, data, expected, monkeypatch):
+    """Výsledek nezávisí na tom, kde hranice bloku přetne escape sekvenci, surrogate pár nebo entitu."""
+    for pad in range(8):
+        text = 'x' * pad + data * 3
+        for chunk_size in (1, 2, 3, 5, 6, 7, 11, 12, 13, 1 << 20):
+            assert _escape(text, op, chunk_size, monkeypatch) == 'x' * pad + expected * 3
+
+
+@pytest.mark.parametrize('op', ['json_unescape', 'unicode_unescape'])
+def test_escape_stream_backslash_runs(op, monkeypatch):
+    for run in range(1, 30):
+        text = '\\' * run + 'u0041' + '\\' * run + '\\uD83D\\uDE00'
+        expected = _escape(text, op, 1 << 20, monkeypatch)
+        for chunk_size in (1, 2, 3, 5, 7, 13):
+            assert _escape(text, op, chunk_size, monkeypatch) == expected
+
+
+@pytest.mark.parametrize('chunk', [
+    '\\' * 10_000,
+    'a' + '\\' * 9_999,
+    '\\' * 5_000 + '\\uD83D',
+    '\\' * 5_001 + '\\uD83D\\uDE0',
+    'x' * 100 + '\\uD83D\\uDE0',
+])
+def test_escape_cut_carry_is_bounded(chunk):
+    cut = utilities._escape_cut(chunk)
+    assert len(chunk) - cut <= 19
+    # Hlava bloku nekončí lichým počtem lomítek — jinak by se přetrhl pár \\
+    head = chunk[:cut]
+    assert (len(head) - len(head.rstrip('\\'))) % 2 == 0
+
+
+def test_entity_cut_carry_is_bounded():
+    assert len('&' * 10_000) - utilities._entity_cut('&' * 10_000) <= 40
+    assert utilities._entity_cut('a' * 100 + '&amp') == 100
@@ -0,0 +1,115 @@
+"""Rozbor UUID/ULID proti příkladům z RFC 9562 a specifikace ULID."""
+
+import io
+import time
+import uuid
+
+import pytest
+
+from libs import uuid_generator
+
+RFC9562_TIME = '2022-02-22T19:22:22+00:00'
+
+
+@pytest.mark.parametrize('value, version, extra', [
+    ('C232AB00-9414-11EC-B3C8-9F6BDECED846', 1, {'node': '9f:6b:de:ce:d8:46', 'clock_seq': 0x33C8}),
+    ('1EC9414C-232A-6B00-B3C8-9F6BDECED846', 6, {'node': '9f:6b:de:ce:d8:46', 'clock_seq': 0x33C8}),
+    ('017F22E2-79B0-7CC3-98C4-DC0C0C07398F', 7, {'counter': 0xCC3}),
+])
+def test_rfc9562_examples(value, version, extra):
+    info = uuid_generator.inspect_id(value)
+    assert info['error'] == ''
+    assert (info['type'], info['version'], info['variant']) == ('UUID', version, 'RFC 9562')
+    assert (info['timestamp'], info['unix_ms']) == (RFC9562_TIME, 1645557742000)
+    assert {key: info[key] for key in extra} == extra
+
+
+@pytest.mark.parametrize('value', [
+    'urn:uuid:919108f7-52d1-4320-9bac-f847db4148a8',
+    '{919108F7-52D1-4320-9BAC-F847DB4148A8}',
+    '919108f752d143209bacf847db4148a8',
+])
+def test_uuid_notations(value):
+    info = uuid_generator.inspect_id(value)
+    assert (info['version'], info['timestamp'], info['error']) == (4, '', '')
+
+
+@pytest.mark.parametrize('value', [
+    '01ARZ3NDEKTSV4RRFFQ69G5FAV',   # příklad ze specifikace ULID
+    '01arz3ndektsv4rrffq69g5fav',
+    'O1ARZ3NDEKTSV4RRFFQ69G5FAV',   # O → 0
+])
+def test_ulid_spec_example(value):
+    info = uuid_generator.inspect_id(value)
+    assert info['error'] == ''
+    assert info['type'] == 'ULID'
+    assert info['unix_ms'] == 1469922850259
+    assert info['timestamp'] == '2016-07-30T23:54:10.259000+00:00'
+
+
+@pytest.mark.parametrize('value', [
+    '01ARZ3NDEKTSV4RRFFQ69G5FAU',   # U není v Crockford Base32
+    '81ARZ3NDEKTSV4RRFFQ69G5FAV',   # první znak > 7 → víc než 128 bitů
+    'ZZZZZZZZZZZZZZZZZZZZZZZZZZ',
+    '01ARZ3NDEK_SV4RRFFQ69G5FAV',
+    '01ARZ3NDEKTSV4RRFFQ69G5F+V',
+])
+def test_ulid_invalid_characters(value):
+    info = uuid_generator.inspect_id(value)
+    assert info['type'] == ''
+    assert info['error'].startswith('Neplatný ULID')
+
+
+
+@pytest.mark.parametrize('value', [
+    '01234567  abcdef0123456789abcdef',   # bytes.fromhex by mezery přeskočil → struct.error
+    '01234567\tabcdef0123456789abcdefx',
+    '0123456789abcdef0123456789abcdeg',
+    '0123456789abcdef0123456789abcde\u0660',
+])
+def test_uuid_invalid_characters(value):
+    info = uuid_generator.inspect_id(value)
+    assert info['type'] == ''
+    assert info['error'] == 'Neplatné znaky v UUID/ULID'
+
+
+def test_inspect_file_continues_after_invalid_uuid():
+    data = b'01234567  abcdef0123456789abcdef\n919108f752d143209bacf847db4148a8\n'
+    rows, error = uuid_generator.inspect_file(io.BytesIO(data))
+    assert error is None
+    assert [row['version'] for row in rows] == ['', 4]
+
+def test_ulid_time_beyond_year_9999():
+    info = uuid_generator.inspect_id('7ZZZZZZZZZZZZZZZZZZZZZZZZZ')
+    assert (info['type'], info['unix_ms']) == ('ULID', 2 ** 48 - 1)
+    assert info['error'] == 'Časová složka je mimo podporovaný rozsah'
+
+
+def test_generated_v7_timestamp_is_current():
+    before = int(time.time() * 1000)
+    uuids, error = uuid_generator.generate('7', 5)
+    assert error is None
+    for value in uuids:
+        info = uuid_generator.inspect_id(value)
+        assert info['version'] == 7 and info['variant'] == 'RFC 9562'
+        assert before - 1000 <= info['unix_ms'] <= time.time() * 1000 + 1000
+        assert uuid.UUID(value).version == 7
+
+
+@pytest.mark.parametrize('version', ['2', '6', '9', 'x', '', None])
+def test_unsupported_version_is_rejected(version):
+    """Dřív nepodporovaná verze tiše vracela v4 (nebo anglickou chybu z int())."""
+    error = f'Nepodporovaná verze UUID: {version} (podporováno: 1, 3, 4, 5, 7)'
+    assert uuid_generator.generate(version, 2) == (None, error)
+    assert uuid_generator.bulk_generate(version, 2) == (None, error)
+
+
+@pytest.mark.parametrize('version', ['1', '4', '7', 4])
+def test_supported_versions(version):
+    uuids, error = uuid_generator.generate(version, 3, seed='1')
+    assert error is None
+    assert [uuid.UUID(u).version for u in uuids] == [int(version)] * 3
+
+
+def test_invalid_count():
+    assert uuid_generator.generate('4', 'abc') == (None, 'Neplatná verze nebo počet.')
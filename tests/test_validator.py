@@ -0,0 +1,140 @@
+"""Validátor čísel účtů, IBAN a rodných čísel — okrajové případy a dávkové ověření."""
+
+import io
+from datetime import date, timedelta
+
+import pytest
+
+from libs import validator
+
+
+# ── Rodná čísla ──────────────────────────────────────────────────────────────
+
+@pytest.mark.parametrize('value', [
+    '855615/0010',   # 1985: YYMMDDSSS mod 11 = 10 → kontrolní číslice 0
+    '785101/0080',
+    '900101/0018',   # muž
+    '905101/0012',   # žena (+50)
+    '042131/0010',   # muž, rozšíření +20
+    '047131/0015',   # žena, rozšíření +70
+    '045229/0014',   # 29. 2. 2004
+    '000229/0013',   # 29. 2. 2000
+    '530101/123',    # devítimístné před rokem 1954
+    '8556150010',    # bez lomítka
+])
+def test_valid_birth_numbers(value):
+    assert validator.validate_birth_number(value) == (True, None)
+
+
+@pytest.mark.parametrize('value, reason', [
+    ('860101/0100', 'Nesouhlasí kontrolní součet mod-11'),   # zbytek 10 až od roku 1986 neplatí
+    ('855615/0011', 'Nesouhlasí kontrolní součet mod-11'),
+    ('540101/123', 'Devítimístné rodné číslo je platné jen pro narozené před rokem 1954'),
+    ('010229/0012', 'Neplatné datum narození'),
+    ('045231/0001', 'Neplatné datum narození'),
+    ('901301/0017', 'Neplatný měsíc'),
+    ('903301/0019', 'Neplatný měsíc'),
+    ('906301/0011', 'Neplatný měsíc'),
+    ('908301/0013', 'Neplatný měsíc'),
+    ('85561/0010', 'Neplatný formát'),
+])
+def test_invalid_birth_numbers(value, reason):
+    ok, message = validator.validate_birth_number(value)
+    assert not ok
+    assert message.startswith(reason)
+
+
+
+def _birth_number(born, month_offset=0):
+    """Desetimístné rodné číslo dělitelné 11 pro datum narození (první koncovka s číslicí 0–9)."""
+    date_part = f'{born.year % 100:02d}{born.month + month_offset:02d}{born.day:02d}'
+    for sss in range(10, 1000):
+        check = -int(f'{date_part}{sss:03d}') * 10 % 11
+        if check < 10:
+            return f'{date_part}/{sss:03d}{check}'
+
+
+@pytest.mark.parametrize('value', ['602201/0104', '607201/0109', '033231/0110'])
+def test_extended_months_before_2004(value):
+    assert validator.validate_birth_number(value) == (
+        False, 'Měsíc +20/+70 je platný jen pro narozené od roku 2004')
+
+
+@pytest.mark.parametrize('offset', [20, 70])
+def test_extended_months_from_2004(offset):
+    assert validator.validate_birth_number(_birth_number(date(2004, 1, 1), offset)) == (True, None)
+
+
+def test_birth_date_in_future():
+    tomorrow = date.today() + timedelta(days=1)
+    assert validator.validate_birth_number(_birth_number(tomorrow)) == (False, 'Datum narození je v budoucnosti')
+    assert validator.validate_birth_number(_birth_number(date.today())) == (True, None)
+
+# ── Čísla účtů a IBAN ────────────────────────────────────────────────────────
+
+@pytest.mark.parametrize('value, expected', [
+    ('19-2000145399/0800', (True, None)),
+    (' 19 - 2000145399 ', (True, None)),
+    ('000000-0000000019', (True, None)),
+    ('18-2000145399', (False, 'Prefix nesplňuje mod-11')),
+    ('19-2000145398', (False, 'Číslo účtu nesplňuje mod-11')),
+    ('0000000010', (False, 'Číslo účtu musí obsahovat alespoň dvě nenulové číslice')),
+    ('1234567-19', (False, 'Neplatný formát (očekáváno [prefix-]číslo[/kód banky])')),
+    ('', (False, 'Neplatný formát (očekáváno [prefix-]číslo[/kód banky])')),
+])
+def test_validate_account(value, expected):
+    assert validator.validate_account(value) == expected
+    assert validator.validate_many([value], 'account') == [expected]
+
+
+@pytest.mark.parametrize('value, reason', [
+    ('CZ6508000000192000145399', None),
+    ('cz65 0800 0000 1920 0014 5399', None),
+    ('CZ6608000000192000145399', 'Nesouhlasí kontrolní součet MOD-97'),
+    ('CZ650800000019200014539', 'IBAN pro CZ musí mít 24 znaků'),
+    ('GB82WEST12345698765432', None),
+    ('GB83WEST12345698765432', 'Nesouhlasí kontrolní součet MOD-97'),
+])
+def test_validate_iban(value, reason):
+    assert validator.validate_iban(value) == (reason is None, reason)
+
+
+def test_validate_many_matches_single_values():
+    values = ['19-2000145399/0800', '18-2000145399', 'abc', '2000145399', '10', '0-19', ''] * 50
+    for kind, validate in validator._VALIDATORS.items():
+        assert validator.validate_many(values, kind) == [validate(v) for v in values]
+
+
+def test_validate_csv_across_batches(monkeypatch):
+    monkeypatch.setattr(validator, 'BATCH_SIZE', 3)
+    lines = ['name;account', 'a;19-2000145399', 'b;18-2000145399', 'c', 'd;2000145399', 'e;x']
+    rows, error = validator.validate_csv(io.BytesIO('\n'.join(lines).encode('utf-8')), 'account', 'account', ';')
+    assert error is None
+    rows = list(rows)
+    assert [row['name'] for row in rows] == ['a', 'b', 'c', 'd', 'e']
+    assert [row['valid'] for row in rows] == [True, False, False, True, False]
+    assert rows[2]['account'] == ''
+    assert rows[1]['reason'] == 'Prefix nesplňuje mod-11'
+
+
+def test_validate_csv_unknown_column():
+    _, error = validator.validate_csv(io.BytesIO(b'a,b\n1,2\n'), 'account', 'c')
+    assert error == 'Sloupec „c“ nebyl v hlavičce nalezen.'
+
+
+def test_validate_csv_extra_columns_are_row_errors():
+    data = 'name,account\na,19-2000145399\nb,19-2000145399,navíc\n'.encode('utf-8')
+    rows, error = validator.validate_csv(io.BytesIO(data), 'account', 'account')
+    assert error is None
+    rows = list(rows)
+    assert rows[0]['valid'] is True
+    assert rows[1] == {'name': 'b', 'account': '19-2000145399', 'valid': False,
+                       'reason': 'Řádek má víc sloupců (3) než hlavička (2)'}
+
+
+def test_validate_csv_keeps_duplicate_and_reserved_columns():
+    data = b'valid,account,account,reason\nano,19-2000145399,x,pozn\n'
+    rows, error = validator.validate_csv(io.BytesIO(data), 'account', '2')
+    assert error is None
+    assert list(rows) == [{'valid': 'ano', 'account': '19-2000145399', 'account_2': 'x', 'reason': 'pozn',
+                           'valid_2': True, 'reason_2': ''}]